@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarky horkých cest integrace:
+
+- construct/*       ControlMySpa.constructCurrentState pro každou fixture z testData
+                    (opakované čtení, se sdílením s předchozím stavem)
+- construct_cold/*  totéž bez předchozího stavu (první čtení po startu)
+- decode_bytes/*    dekódování celého těla odpovědi (SpaState.from_dashboard_bytes)
+- update_cycle/*    SpaData.update -> _notify_subscribers s entitami všech platforem
+                    vytvořenými jejich async_setup_entry (střídají se dva stavy)
+- tzl/*             paleta TZL a výběr barvy (light.py, select/tzl.py)
+- energy/*          krok integrace energie a aktualizace energy senzorů
+- scale/*           setup entit, dekódování a update cyklus pro syntetické vany
+                    velikostí z payload_generator.SIZES (časová řada timeline)
+
+Výsledky (medián, minimum a rozptyl času jednoho volání) se ukládají jako JSON,
+aby šly porovnat mezi verzemi:
+
+    python benchmarks/bench_hot_paths.py -o benchmarks/results/1.29.0.json
+    python benchmarks/bench_hot_paths.py --compare benchmarks/results/1.29.0.json
+
+S --compare skript vypíše poměr proti uloženým výsledkům a skončí kódem 1,
+pokud je některý benchmark pomalejší o více než --threshold.
+
+Měří se vlastní kalibrovanou smyčkou nad time.perf_counter, ne přes
+pytest-benchmark nebo pyperf: repozitář nemá vývojové závislosti (testy
+v tests/ běží na holém pytestu bez pluginů) a skript má jít spustit všude,
+kde je nainstalovaný Home Assistant. Formát JSON i --compare jsou proto
+vlastní.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from harness import (
+    FIXTURES,
+    REPO_ROOT,
+    build_harness,
+    load_fixture,
+    load_fixture_bytes,
+    vary_fixture,
+)
+from payload_generator import SIZES, generate_dashboard, timeline
+from custom_components.control_my_spa.ControlMySpa import ControlMySpa
+from custom_components.control_my_spa.models import SpaState
+from custom_components.control_my_spa.palette import TzlPalette
+from custom_components.control_my_spa.sensor.energy import SpaEnergySensor
+
+MANIFEST = REPO_ROOT / "custom_components" / "control_my_spa" / "manifest.json"
+
+
+class Benchmark:
+    """Měřená funkce: func(loops) provede loops volání (async i sync)."""
+
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+
+
+def _sync(call):
+    def run(loops):
+        for _ in range(loops):
+            call()
+    return run
+
+
+def _async(call):
+    async def run(loops):
+        for _ in range(loops):
+            await call()
+    return run
+
+
+async def collect_benchmarks():
+    """Připraví data a vrátí seznam Benchmark (příprava se neměří)."""
+    benchmarks = []
+    for fixture in FIXTURES:
+        raw = load_fixture(fixture)
+        body = load_fixture_bytes(fixture)
+        client = ControlMySpa("bench@example.com", "bench")
+        client.constructCurrentState(raw)
+        benchmarks.append(Benchmark(f"construct/{fixture}", _sync(lambda c=client, r=raw: c.constructCurrentState(r))))
+        benchmarks.append(Benchmark(f"construct_cold/{fixture}", _sync(lambda r=raw: SpaState.from_dashboard(r))))
+        benchmarks.append(Benchmark(f"decode_bytes/{fixture}", _sync(lambda b=body: SpaState.from_dashboard_bytes(b))))
+
+        harness = await build_harness([raw, vary_fixture(raw, 1)])
+        benchmarks.append(Benchmark(f"update_cycle/{fixture}", _async(harness.shared_data.update)))
+
+        # Energie: integrátor se všemi kanály a energy senzory z platformy sensor
+        energy = harness.shared_data.energy
+        energy_sensors = [e for e in harness.entities if isinstance(e, SpaEnergySensor)]
+        states = harness.client.states
+        tick = [0]
+
+        def energy_step(states=states, energy=energy, tick=tick):
+            tick[0] += 1
+            energy.observe(states[tick[0] % len(states)], now=tick[0] * 60.0)
+
+        def energy_sensors_step(states=states, sensors=energy_sensors):
+            for entity in sensors:
+                entity.handle_spa_state(states[0])
+
+        benchmarks.append(Benchmark(f"energy/observe/{fixture}", _sync(energy_step)))
+        if energy_sensors:
+            benchmarks.append(Benchmark(f"energy/sensors/{fixture}", _sync(energy_sensors_step)))
+
+        colors = states[0].get("tzlColors") or []
+        if not colors:
+            continue
+        palette = TzlPalette(colors)
+        rng = random.Random(1)
+        probes = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(256)]
+        for rgb in probes:
+            palette.nearest_color_id(rgb)  # Zahřátá cache jako v provozu
+
+        def nearest(palette=palette, probes=probes):
+            for rgb in probes:
+                palette.nearest_color_id(rgb)
+
+        def tzl_entities_step(entities=harness.entities_of("light", "select.tzl"), state=states[0]):
+            for entity in entities:
+                entity.handle_spa_state(state)
+
+        benchmarks.append(Benchmark(f"tzl/palette_build/{fixture}", _sync(lambda c=colors: TzlPalette(c))))
+        benchmarks.append(Benchmark(f"tzl/nearest_color_x256/{fixture}", _sync(nearest)))
+        benchmarks.append(Benchmark(f"tzl/options_cold/{fixture}", _sync(lambda c=colors: TzlPalette(c).options("en"))))
+        benchmarks.append(Benchmark(f"tzl/entities/{fixture}", _sync(tzl_entities_step)))
+
+    # Škálování nad rámec fixtures
+    for size, layout in SIZES.items():
+        series = list(timeline(generate_dashboard(**layout), steps=8, seed=1))
+        client = ControlMySpa("bench@example.com", "bench")
+        client.constructCurrentState(series[0])
+        position = [0]
+
+        def construct_next(client=client, series=series, position=position):
+            position[0] += 1
+            client.constructCurrentState(series[position[0] % len(series)])
+
+        async def setup(series=series):
+            await build_harness(series[:1])
+
+        harness = await build_harness(series)
+        benchmarks.append(Benchmark(f"scale/setup/{size}", _async(setup)))
+        benchmarks.append(Benchmark(f"scale/construct/{size}", _sync(construct_next)))
+        benchmarks.append(Benchmark(f"scale/update_cycle/{size}", _async(harness.shared_data.update)))
+    return benchmarks
+
+
+async def _timed(func, loops):
+    started = time.perf_counter()
+    result = func(loops)
+    if asyncio.iscoroutine(result):
+        await result
+    return time.perf_counter() - started
+
+
+async def measure(benchmark, repeat, min_time):
+    """Kalibruje počet volání na min_time a repeat-krát změří; vrací statistiku v µs."""
+    loops = 1
+    while True:
+        elapsed = await _timed(benchmark.func, loops)
+        if elapsed >= min_time or loops >= 1 << 24:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    samples = [(await _timed(benchmark.func, loops)) / loops * 1e6 for _ in range(repeat)]
+    return {
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(min(samples), 3),
+        "stdev_us": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def _metadata():
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    with open(MANIFEST, encoding="utf-8") as f:
+        version = json.load(f).get("version")
+    return {
+        "version": version,
+        "revision": revision,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Vypíše poměr proti baseline; vrací názvy benchmarků pomalejších než threshold."""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        old = baseline.get("benchmarks", {}).get(name)
+        if not old:
+            print(f"{name:45s} {result['median_us']:12.2f} us   (new)")
+            continue
+        ratio = result["median_us"] / old["median_us"] if old["median_us"] else float("inf")
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:45s} {result['median_us']:12.2f} us  x{ratio:5.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+async def run(args):
+    benchmarks = await collect_benchmarks()
+    if args.filter:
+        benchmarks = [b for b in benchmarks if any(pattern in b.name for pattern in args.filter)]
+    results = {"metadata": _metadata(), "benchmarks": {}}
+    for benchmark in benchmarks:
+        result = await measure(benchmark, args.repeat, args.min_time)
+        results["benchmarks"][benchmark.name] = result
+        if not args.compare:
+            print(f"{benchmark.name:45s} {result['median_us']:12.2f} us  (min {result['min_us']:.2f}, loops {result['loops']})")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ControlMySpa hot path micro-benchmarks")
+    parser.add_argument("-o", "--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Compare against a previous results JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown for --compare (0.10 = 10 %%)")
+    parser.add_argument("--repeat", type=int, default=7, help="Number of measured runs per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum duration of one run (s)")
+    parser.add_argument("-k", "--filter", action="append", help="Run only benchmarks containing this text (repeatable)")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
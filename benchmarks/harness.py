@@ -0,0 +1,137 @@
+"""
+Společné pomůcky benchmarků: fixtures, klient bez sítě a sestavení SpaData
+s entitami vytvořenými skutečnými async_setup_entry jednotlivých platforem.
+
+Home Assistant musí být nainstalován (importují se platformy integrace), běžící
+instance ale potřeba není - hass je jen jmenný prostor s hass.data a hass.config.
+Zápis stavu entity (async_write_ha_state) se jen počítá.
+"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from custom_components.control_my_spa import (  # noqa: E402
+    binary_sensor,
+    button,
+    climate,
+    light,
+    number,
+    select,
+    sensor,
+    switch,
+)
+from custom_components.control_my_spa.const import DOMAIN  # noqa: E402
+from custom_components.control_my_spa.ControlMySpa import ControlMySpa  # noqa: E402
+from custom_components.control_my_spa.SpaData import SpaData  # noqa: E402
+
+FIXTURES_DIR = REPO_ROOT / "custom_components" / "control_my_spa" / "testData"
+FIXTURES = tuple(sorted(path.stem for path in FIXTURES_DIR.glob("Data[0-9]*.json")))
+# Platformy v pořadí jako PLATFORMS v __init__ (fan není registrován)
+PLATFORM_MODULES = (select, sensor, number, binary_sensor, switch, climate, button, light)
+
+
+def load_fixture(name):
+    """Část data odpovědi dashboardu z testData/<name>.json."""
+    with open(FIXTURES_DIR / f"{name}.json", encoding="utf-8") as f:
+        return json.load(f)["data"]
+
+
+def load_fixture_bytes(name):
+    """Celé tělo odpovědi dashboardu (bytes), jak přichází z cloudu."""
+    return (FIXTURES_DIR / f"{name}.json").read_bytes()
+
+
+def vary_fixture(data, step):
+    """Kopie dashboardu s typickou změnou mezi dvěma čteními (teplota, čas, jedna pumpa)."""
+    varied = json.loads(json.dumps(data))
+    varied["currentTemp"] = f"{float(varied.get('currentTemp') or 90) + (step % 3) * 0.5:.2f}"
+    varied["time"] = f"{(step // 60) % 24:02d}:{step % 60:02d}"
+    pumps = [c for c in varied.get("components", []) if c.get("componentType") == "PUMP"]
+    if pumps:
+        pump = pumps[step % len(pumps)]
+        pump["value"] = "OFF" if pump.get("value") != "OFF" else "HIGH"
+    return varied
+
+
+class BenchClient(ControlMySpa):
+    """Skutečný ControlMySpa bez sítě: getSpa vrací předem nachystané stavy dokola."""
+
+    def __init__(self, states=()):
+        super().__init__("bench@example.com", "bench")
+        self.spaId = "bench"
+        self.userInfo = {"_id": "bench"}
+        self.states = list(states)
+        self.reads = 0
+
+    async def getSpa(self, max_age=None):
+        state = self.states[self.reads % len(self.states)] if self.states else None
+        self.reads += 1
+        return state
+
+
+def make_hass(language="en"):
+    return SimpleNamespace(
+        data={},
+        config=SimpleNamespace(language=language, components=set()),
+    )
+
+
+class SpaHarness:
+    """SpaData a entity všech platforem nad BenchClient (bez běžícího Home Assistant)."""
+
+    def __init__(self, client, shared_data, hass, entities):
+        self.client = client
+        self.shared_data = shared_data
+        self.hass = hass
+        self.entities = entities
+        self.writes = 0
+
+    def _count_write(self):
+        self.writes += 1
+
+    def entities_of(self, *modules):
+        """Entity, jejichž třída pochází z daného modulu (např. "light", "select.tzl")."""
+        prefixes = tuple(f"custom_components.control_my_spa.{module}" for module in modules)
+        return [entity for entity in self.entities if type(entity).__module__.startswith(prefixes)]
+
+
+async def build_harness(raw_states=(), options=None, language="en", client=None, clock=None):
+    """Sestaví SpaData a entity pro dashboardy raw_states (první se použije při setupu).
+
+    Stavy se dekódují stejně jako v provozu (constructCurrentState, sdílení s předchozím).
+    Místo BenchClient lze předat vlastního klienta (raw_states se pak nepoužijí)
+    a SpaData i klientovi virtuální hodiny clock (viz simulate.py).
+    """
+    if client is None:
+        client = BenchClient()
+        client.states = [client.constructCurrentState(raw) for raw in raw_states]
+    if clock is not None:
+        client.clock = clock
+    hass = make_hass(language)
+    shared_data = SpaData(client, hass, clock=clock)
+    await shared_data.update()
+    config_entry = SimpleNamespace(entry_id="bench", options=options or {}, data={"spa_id": "bench"})
+    hass.data[DOMAIN] = {
+        config_entry.entry_id: {
+            "client": client,
+            "data": shared_data,
+            "device_info": {"identifiers": {(DOMAIN, "bench")}, "name": "Spa"},
+            "serial_number": "bench",
+            "unique_id_suffix": "_bench",
+            "config_entry": config_entry,
+        }
+    }
+    entities = []
+    for module in PLATFORM_MODULES:
+        await module.async_setup_entry(hass, config_entry, lambda new, update=False: entities.extend(new))
+    harness = SpaHarness(client, shared_data, hass, entities)
+    for entity in entities:
+        entity.hass = hass
+        entity.async_write_ha_state = harness._count_write
+    return harness
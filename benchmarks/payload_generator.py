@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Generátor syntetických odpovědí dashboardu pro testy škálování.
+
+Fixtures v testData popisují malé vany (několik pump, tři TZL zóny). Generátor
+vytvoří platnou část data odpovědi /spas/{id}/dashboard (vstup
+constructCurrentState) s libovolným počtem pump, blowerů, světel, filtrů,
+heaterů, TZL zón, velikostí palety a s/bez Clim8Zone. timeline() z ní dělá
+časovou řadu čtení: přepínání pump, drift teploty, změny barev a poruchy
+(jeden krok je advance(), používá ho i benchmarks/simulate.py).
+
+Použití z Pythonu:
+    from payload_generator import SIZES, generate_dashboard, timeline
+    data = generate_dashboard(**SIZES["large"])
+    for payload in timeline(data, steps=100, seed=1): ...
+
+Z příkazové řádky se zapíše fixture pro scripts/mock_cloud.py (--spa DataLarge):
+    python benchmarks/payload_generator.py --size large -o /tmp/fixtures/DataLarge.json
+    python benchmarks/payload_generator.py --pumps 12 --tzl-zones 16 --steps 50 -o /tmp/series.jsonl
+"""
+
+import argparse
+import colorsys
+import copy
+import json
+import random
+import sys
+from pathlib import Path
+
+# Předdefinované velikosti: "small" odpovídá zhruba testData/Data02
+SIZES = {
+    "small": dict(pumps=3, blowers=1, lights=1, filters=2, heaters=1, circulation_pumps=1, tzl_zones=3, palette_size=8),
+    "medium": dict(pumps=6, blowers=2, lights=2, filters=2, heaters=1, circulation_pumps=1, tzl_zones=6, palette_size=16, c8z=True),
+    "large": dict(pumps=12, blowers=4, lights=4, filters=2, heaters=2, circulation_pumps=2, tzl_zones=12, palette_size=32, c8z=True),
+    "xlarge": dict(pumps=24, blowers=8, lights=8, filters=2, heaters=4, circulation_pumps=4, tzl_zones=24, palette_size=64, c8z=True),
+}
+
+PUMP_VALUES = ["OFF", "LOW", "HIGH"]
+ON_OFF_VALUES = ["OFF", "HIGH"]
+FILTER_VALUES = ["OFF", "ON", "DISABLED"]
+TZL_STATES = ("NORMAL", "PARTY", "RELAX", "WHEEL")
+FAULT_MESSAGES = ("Sensor A fault", "Flow switch open", "Heater dry", "Water too hot")
+_TIMESTAMP = "2025-10-02T23:11:52.991Z"
+
+
+def _component(component_type, port, value, available_values, serial_number, **extra):
+    """Komponenta ve stejném tvaru jako v odpovědi cloudu."""
+    component = {
+        "componentId": None,
+        "serialNumber": serial_number,
+        "alertState": None,
+        "materialType": None,
+        "targetValue": None,
+        "name": component_type,
+        "componentType": component_type,
+        "value": value,
+        "availableValues": list(available_values),
+        "registeredTimestamp": _TIMESTAMP,
+        "port": port,
+        "hour": None,
+        "minute": None,
+        "durationMinutes": None,
+    }
+    component.update(extra)
+    return component
+
+
+def _ports(count):
+    """Porty komponent jako v cloudu: "0", "1", ..."""
+    return [str(port) for port in range(count)]
+
+
+def generate_palette(size):
+    """tzlColors s rovnoměrně rozloženými odstíny; první barva je bílá."""
+    colors = [{"colorId": 1, "red": 255, "green": 255, "blue": 255, "isSecondary": False}]
+    for index in range(1, size):
+        red, green, blue = colorsys.hsv_to_rgb((index - 1) / max(1, size - 1), 1.0, 1.0)
+        colors.append({
+            "colorId": index + 1,
+            "red": round(red * 255),
+            "green": round(green * 255),
+            "blue": round(blue * 255),
+            "isSecondary": index >= 8,
+        })
+    return colors
+
+
+def generate_dashboard(pumps=3, blowers=1, lights=1, filters=2, heaters=1, circulation_pumps=1,
+                       ozone=True, tzl_zones=3, palette_size=8, c8z=False, celsius=True,
+                       serial_number="SYNTH-0001", seed=0):
+    """Část data odpovědi dashboardu pro vanu daného složení."""
+    rng = random.Random(seed)
+    components = [_component("HEATER", port, "OFF", [], serial_number) for port in _ports(heaters)]
+    components.append(_component("GATEWAY", None, None, [], serial_number))
+    components.append(_component("CONTROLLER", None, None, [], serial_number))
+    for port in _ports(filters):
+        components.append(_component("FILTER", port, "OFF", FILTER_VALUES, serial_number,
+                                     hour=(11 + 11 * int(port)) % 24, minute=0, durationMinutes=60))
+    if ozone:
+        components.append(_component("OZONE", None, "OFF", ["OFF", "ON"], serial_number))
+    components += [_component("PUMP", port, "OFF", PUMP_VALUES, serial_number) for port in _ports(pumps)]
+    components += [_component("BLOWER", port, "OFF", ON_OFF_VALUES, serial_number) for port in _ports(blowers)]
+    circulation_ports = [None] if circulation_pumps == 1 else _ports(circulation_pumps)
+    components += [_component("CIRCULATION_PUMP", port, "OFF", ON_OFF_VALUES, serial_number) for port in circulation_ports]
+    components += [_component("LIGHT", port, "OFF", ON_OFF_VALUES, serial_number) for port in _ports(lights)]
+
+    palette = generate_palette(palette_size) if tzl_zones else []
+    zones = []
+    for index in range(tzl_zones):
+        color = palette[rng.randrange(len(palette))]
+        zones.append({
+            "zoneId": str(index + 1),
+            "zoneName": chr(ord("A") + index % 26) + ("" if index < 26 else str(index // 26)),
+            "state": rng.choice(TZL_STATES),
+            "intensity": rng.randrange(9),
+            "speed": rng.randrange(6),
+            "red": color["red"],
+            "green": color["green"],
+            "blue": color["blue"],
+        })
+
+    data = {
+        "serialNumber": serial_number,
+        "hasCurrentState": True,
+        "currentTemp": "98.00",
+        "desiredTemp": "100.00",
+        "c8zCurrentState": {"c8zHeaterState": "OFF", "c8zStatus": "C8Z_STATUS_NOT_PRESENT"},
+        "time": "12:00",
+        "isMilitaryTime": True,
+        "isPanelLocked": False,
+        "heaterMode": "READY",
+        "tempRange": "HIGH",
+        "isCelsius": celsius,
+        "isOnHold": False,
+        "currentFaultMessage": None,
+        "components": components,
+        "primaryTZLStatus": "TZL_CONNECTED" if tzl_zones else "TZL_NOT_PRESENT",
+        "secondaryTZLStatus": "TZL_NOT_PRESENT",
+        "hasChromazone": bool(tzl_zones),
+        "rangeLimits": {"highRangeHigh": 104, "highRangeLow": 80, "lowRangeHigh": 99, "lowRangeLow": 50},
+        "systemInfo": {
+            "registrationServerDate": _TIMESTAMP,
+            "assignedDate": _TIMESTAMP,
+            "rs485Address": 18,
+            "isRs485ConnectionActive": True,
+            "isDrainMode": False,
+            "pingTime": _TIMESTAMP,
+            "controllerSoftwareVersion": "M100_225 V65.0",
+            "currentSetup": 17,
+            "dipSwitches": [],
+            "buildNumber": "1129/129",
+        },
+        "dealer": {"_id": "synthetic"},
+        "isOnline": True,
+        "isPrimingMode": False,
+        "totalAlerts": 0,
+    }
+    if c8z:
+        data["c8zCurrentState"] = {
+            "c8zHeaterState": "OFF",
+            "c8zStatus": "C8Z_STATUS_RUNNING",
+            "c8zHeater": "C8Z_HEATER_AUTO",
+            "c8zMode": "C8Z_MODE_HEAT",
+            "c8zSpeed": "C8Z_SPEED_SMART",
+        }
+    if tzl_zones:
+        data["tzlState"] = {
+            "updateTimestamp": _TIMESTAMP,
+            "tzlLightStatus": {"tzlZones": zones},
+            "tzlConfiguration": {
+                "tzlZoneFunctions": [
+                    {"zoneId": str(index), "zoneName": zone["zoneName"], "zoneFunction": "NORMAL"}
+                    for index, zone in enumerate(zones)
+                ],
+                "tzlGroupStates": [],
+            },
+            "tzlColorSettings": {"tzlColors": palette},
+        }
+    return data
+
+
+def generate_response(data):
+    """Celé tělo odpovědi dashboardu (formát souborů v testData)."""
+    return {"statusCode": 200, "data": data, "message": "Spa's dashboard retrieved successfully."}
+
+
+def advance(state, rng, palette=None, toggle_rate=0.1, drift=0.2, color_rate=0.05, fault_rate=0.01,
+            offline_rate=0.0):
+    """Jeden krok vývoje stavu dashboardu state (mění ho na místě, čas nenastavuje).
+
+    Pumpy, blowery a světla se přepnou s pravděpodobností toggle_rate, teplota se
+    posune o drift k požadované (heater s hysterezí: zapíná pod desiredTemp - 0.5,
+    vypíná na desiredTemp), barva TZL zóny z palette se změní s color_rate, porucha
+    (currentFaultMessage, totalAlerts) vznikne s fault_rate a isOnline vypadne
+    s offline_rate.
+    """
+    for component in state["components"]:
+        if component["componentType"] in ("PUMP", "BLOWER", "LIGHT") and rng.random() < toggle_rate:
+            choices = [value for value in component["availableValues"] if value != component["value"]]
+            if choices:
+                component["value"] = rng.choice(choices)
+
+    current = float(state["currentTemp"])
+    desired = float(state["desiredTemp"])
+    heaters = [component for component in state["components"] if component["componentType"] == "HEATER"]
+    was_heating = any(heater["value"] == "ON" for heater in heaters)
+    heating = current < desired - 0.5 or (was_heating and current < desired)
+    for heater in heaters:
+        heater["value"] = "ON" if heating else "OFF"
+    current += (drift if heating else -drift / 4) + rng.uniform(-drift / 4, drift / 4)
+    state["currentTemp"] = f"{current:.2f}"
+    state["heaterMode"] = "READY"
+
+    zones = (state.get("tzlState") or {}).get("tzlLightStatus", {}).get("tzlZones", [])
+    for zone in zones:
+        if palette and rng.random() < color_rate:
+            color = rng.choice(palette)
+            zone["red"], zone["green"], zone["blue"] = color["red"], color["green"], color["blue"]
+
+    if state["currentFaultMessage"] is None and rng.random() < fault_rate:
+        state["currentFaultMessage"] = rng.choice(FAULT_MESSAGES)
+        state["totalAlerts"] += 1
+    elif state["currentFaultMessage"] is not None and rng.random() < 0.2:
+        state["currentFaultMessage"] = None
+    state["isOnline"] = not (offline_rate and rng.random() < offline_rate)
+
+
+def palette_of(state):
+    """Barvy TZL palety dashboardu (prázdný seznam bez TZL)."""
+    return (state.get("tzlState") or {}).get("tzlColorSettings", {}).get("tzlColors", [])
+
+
+def timeline(data, steps, seed=0, interval_minutes=1, toggle_rate=0.1, drift=0.2,
+             color_rate=0.05, fault_rate=0.01, offline_rate=0.0):
+    """Časová řada steps čtení vycházející z data (data se nemění).
+
+    Mezi čteními se posune čas o interval_minutes a stav o jeden krok advance().
+    Každý prvek je samostatná kopie.
+    """
+    rng = random.Random(seed)
+    state = copy.deepcopy(data)
+    minutes = 12 * 60
+    palette = palette_of(state)
+    for _ in range(steps):
+        minutes += interval_minutes
+        state["time"] = f"{(minutes // 60) % 24:02d}:{minutes % 60:02d}"
+        advance(state, rng, palette, toggle_rate, drift, color_rate, fault_rate, offline_rate)
+        yield copy.deepcopy(state)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic ControlMySpa dashboard payloads")
+    parser.add_argument("--size", choices=sorted(SIZES), help="Preset size (individual options override it)")
+    for name in ("pumps", "blowers", "lights", "filters", "heaters", "circulation-pumps", "tzl-zones", "palette-size"):
+        parser.add_argument(f"--{name}", type=int)
+    parser.add_argument("--c8z", action=argparse.BooleanOptionalAction, default=None, help="Include a Clim8Zone heat pump")
+    parser.add_argument("--fahrenheit", action="store_true", help="Report isCelsius false")
+    parser.add_argument("--steps", type=int, default=0, help="Write a time series of this many reads (JSON lines)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Output file (default stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    options = dict(SIZES[args.size]) if args.size else {}
+    for name in ("pumps", "blowers", "lights", "filters", "heaters", "circulation_pumps", "tzl_zones", "palette_size", "c8z"):
+        value = getattr(args, name)
+        if value is not None:
+            options[name] = value
+    data = generate_dashboard(celsius=not args.fahrenheit, seed=args.seed, **options)
+    if args.steps:
+        lines = [json.dumps(generate_response(payload)) for payload in timeline(data, args.steps, seed=args.seed)]
+        text = "\n".join(lines) + "\n"
+    else:
+        text = json.dumps(generate_response(data), indent=2) + "\n"
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Zrychlená simulace provozu nad virtuálními hodinami.
+
+SpaData, integrátor energie, cache dashboardu i potvrzování příkazů v ControlMySpa
+berou čas z hodin (custom_components/control_my_spa/clock.py). Simulace jim předá
+VirtualClock, který neběží sám: run_until() přeskočí vždy na nejbližší naplánovaný
+časovač, takže týden pollingu a cyklů ohřevu proběhne za několik sekund.
+
+"Pravda" je stav dashboardu (fixture z testData nebo payload_generator), který se
+každých truth_step sekund posune o krok payload_generator.advance() a integruje
+skutečnou spotřebu komponent. Integrace ho vidí jen přes čtení dashboardu
+v intervalech adaptivního pollingu; na konci se porovná odhad energy senzorů
+se skutečností.
+
+Scénář (JSON) - všechny klíče jsou volitelné:
+    {
+      "fixture": "Data02",            # nebo "size": "large" (payload_generator.SIZES)
+      "hours": 168,
+      "truth_step": 60,               # krok pravdy (s)
+      "seed": 1,
+      "poll": [60, 30, 900],          # základní, minimální a maximální interval čtení (s)
+      "settle": 1.5,                  # za kolik sekund cloud promítne příkaz do stavu
+      "rates": {"toggle_rate": 0.001, "fault_rate": 0.0},   # na minutu, viz advance()
+      "options": {"pump_1_power_watts": 1500},              # options integrace
+      "events": [
+        {"at": 3600, "command": "setJetState", "args": [0, "HIGH"]},
+        {"at": 18000, "every": 86400, "command": "setTemp", "args": [38]},
+        {"at": 7200, "fixture": "Data03"}                   # přehrání jiné fixture
+      ]
+    }
+
+Použití:
+    python benchmarks/simulate.py --fixture Data02 --hours 168
+    python benchmarks/simulate.py --scenario week.json -o /tmp/simulation.json
+"""
+
+import argparse
+import asyncio
+import heapq
+import inspect
+import json
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from harness import FIXTURES, REPO_ROOT, build_harness, load_fixture
+from payload_generator import SIZES, advance, generate_dashboard, palette_of
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+from mock_cloud import MockSpa  # noqa: E402
+
+from custom_components.control_my_spa.ControlMySpa import ControlMySpa  # noqa: E402
+from custom_components.control_my_spa.energy_integrator import build_power_table  # noqa: E402
+from custom_components.control_my_spa.sensor.energy import SpaEnergySensor  # noqa: E402
+
+DEFAULT_START = datetime(2026, 1, 5, tzinfo=timezone.utc)
+DEFAULT_RATES = {"toggle_rate": 0.001, "drift": 0.05, "color_rate": 0.0, "fault_rate": 0.0, "offline_rate": 0.0}
+# Výchozí scénář: večerní koupel s tryskami a občasná změna požadované teploty
+DEFAULT_EVENTS = [
+    {"at": 19 * 3600, "every": 86400, "command": "setJetState", "args": [0, "HIGH"]},
+    {"at": 19 * 3600 + 1800, "every": 86400, "command": "setJetState", "args": [0, "OFF"]},
+    {"at": 6 * 3600, "every": 2 * 86400, "command": "setTemp", "args": [38]},
+    {"at": 30 * 3600, "every": 2 * 86400, "command": "setTemp", "args": [36]},
+]
+# Kolikrát nejvýš předat řízení čekajícím úlohám, než se posune čas
+_MAX_SETTLE_ROUNDS = 200
+
+
+class VirtualClock:
+    """Hodiny se stejným rozhraním jako SpaClock, čas se posouvá jen v run_until()."""
+
+    def __init__(self, start=DEFAULT_START):
+        self._start = start
+        self._now = 0.0
+        self._timers = []  # halda (kdy, pořadí, akce, zrušeno)
+        self._sequence = 0
+        self._tasks = set()
+        self._sleepers = 0
+        self.fired = 0
+
+    def monotonic(self):
+        return self._now
+
+    def utcnow(self):
+        return self._start + timedelta(seconds=self._now)
+
+    async def sleep(self, seconds):
+        future = asyncio.get_running_loop().create_future()
+        self._schedule(max(seconds, 0.0), lambda _: future.done() or future.set_result(None))
+        self._sleepers += 1
+        try:
+            await future
+        finally:
+            self._sleepers -= 1
+
+    def call_later(self, hass, delay, action):
+        return self._schedule(delay, action)
+
+    def track_time_interval(self, hass, action, interval):
+        seconds = interval.total_seconds()
+        handle = {"cancel": None}
+
+        def repeat(now):
+            handle["cancel"] = self._schedule(seconds, repeat)
+            return action(now)
+
+        handle["cancel"] = self._schedule(seconds, repeat)
+        return lambda: handle["cancel"]()
+
+    def _schedule(self, delay, action):
+        self._sequence += 1
+        timer = [self._now + delay, self._sequence, action, False]
+        heapq.heappush(self._timers, timer)
+
+        def cancel():
+            timer[3] = True
+
+        return cancel
+
+    def _fire(self, action):
+        result = action(self.utcnow())
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        self.fired += 1
+
+    async def _settle(self):
+        """Nechá doběhnout vše, co nečeká na virtuální čas."""
+        for _ in range(_MAX_SETTLE_ROUNDS):
+            await asyncio.sleep(0)
+            if len(self._tasks) <= self._sleepers:
+                return
+
+    async def run_until(self, end):
+        """Postupně spouští časovače až do času end (s od startu)."""
+        await self._settle()
+        while self._timers and self._timers[0][0] <= end:
+            when, _, action, cancelled = heapq.heappop(self._timers)
+            if cancelled:
+                continue
+            self._now = max(self._now, when)
+            self._fire(action)
+            await self._settle()
+        self._now = max(self._now, end)
+
+    async def drain(self):
+        """Počká na dokončení běžících úloh (po konci simulace).
+
+        Úlohy mohou čekat na virtuální čas (potvrzení příkazu), proto se časovače
+        spouští dál, dokud nějaká úloha běží.
+        """
+        await self._settle()
+        while self._tasks and self._timers:
+            when, _, action, cancelled = heapq.heappop(self._timers)
+            if cancelled:
+                continue
+            self._now = max(self._now, when)
+            self._fire(action)
+            await self._settle()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class SimulatedSpa:
+    """Skutečný stav vany (pravda) a jeho skutečná spotřeba."""
+
+    def __init__(self, data, clock, rng, rates, options):
+        self.spa = MockSpa("simulated", data)
+        self.clock = clock
+        self.rng = rng
+        self.rates = rates
+        self.options = options
+        self.energy_wh = {}  # (componentType, port) -> Wh
+        self.steps = 0
+        self._snapshot = None  # Kopie stavu pro čtení dashboardu (do další změny)
+
+    @property
+    def state(self):
+        return self.spa.state
+
+    def snapshot(self):
+        """Stav, jak by ho vrátil dashboard; kopie se sdílí mezi čteními do další změny."""
+        if self._snapshot is None:
+            self._snapshot = json.loads(json.dumps(self.state))
+        return self._snapshot
+
+    def replace(self, data):
+        """Přehraje jinou fixture (komponenty i nastavení)."""
+        self.spa = MockSpa("simulated", data)
+        self._snapshot = None
+
+    def apply(self, command, payload):
+        self.spa.apply(command, payload)
+        self._snapshot = None
+
+    def step(self, seconds):
+        """Započítá spotřebu za uplynulý krok a posune stav o jeden krok."""
+        state = self.state
+        counts = {}
+        for component in state.get("components", []):
+            counts[component["componentType"]] = counts.get(component["componentType"], 0) + 1
+        for component in state.get("components", []):
+            component_type = component["componentType"]
+            if component_type not in ("HEATER", "PUMP", "BLOWER", "CIRCULATION_PUMP"):
+                continue
+            table = build_power_table(component_type, component.get("port"), counts[component_type], self.options)
+            power = table.get(component.get("value"), table["*"])
+            key = (component_type, component.get("port"))
+            self.energy_wh[key] = self.energy_wh.get(key, 0.0) + power * seconds / 3600.0
+
+        minutes = seconds / 60.0
+        rates = self.rates
+        advance(
+            state, self.rng, palette_of(state),
+            toggle_rate=min(1.0, rates["toggle_rate"] * minutes),
+            drift=rates["drift"] * minutes,
+            color_rate=min(1.0, rates["color_rate"] * minutes),
+            fault_rate=min(1.0, rates["fault_rate"] * minutes),
+            offline_rate=min(1.0, rates["offline_rate"] * minutes),
+        )
+        state["time"] = self.clock.utcnow().strftime("%H:%M")
+        self.steps += 1
+        self._snapshot = None
+
+
+class SimulatedClient(ControlMySpa):
+    """ControlMySpa, jehož dashboard i příkazy obsluhuje SimulatedSpa (bez sítě).
+
+    Cache, single-flight, potvrzování příkazů i prodlevy jsou skutečné, čas je virtuální.
+    """
+
+    def __init__(self, truth, clock, settle):
+        super().__init__("simulate@example.com", "simulate")
+        self.spaId = "simulated"
+        self.userInfo = {"_id": "simulated"}
+        self.clock = clock
+        self.truth = truth
+        self.settle = settle
+        self.reads = 0
+        self.commands = 0
+
+    async def _fetchSpa(self):
+        self.reads += 1
+        return self.constructCurrentState(self.truth.snapshot())
+
+    async def _postCommand(self, endpoint, payload):
+        command = endpoint.removeprefix("/spa-commands/")
+        try:
+            self.truth.spa.validate(command, payload)
+        except ValueError as e:
+            logging.getLogger(__name__).warning("Command %s rejected: %s", command, e)
+            return False
+        self.commands += 1
+        self.clock.call_later(None, self.settle, lambda _: self.truth.apply(command, payload))
+        self.invalidateSpaCache()
+        return True
+
+
+def _expand_events(events, duration):
+    """Rozvine opakované události (every) do seznamu (čas, událost)."""
+    expanded = []
+    for event in events:
+        at = float(event.get("at", 0))
+        every = event.get("every")
+        while at <= duration:
+            expanded.append((at, event))
+            if not every:
+                break
+            at += float(every)
+    return sorted(expanded, key=lambda item: item[0])
+
+
+def _initial_data(scenario):
+    if scenario.get("size"):
+        return generate_dashboard(seed=scenario.get("seed", 0), **SIZES[scenario["size"]])
+    return load_fixture(scenario.get("fixture", "Data02"))
+
+
+async def simulate(scenario):
+    """Spustí scénář a vrátí výsledek (dict) s porovnáním odhadu a skutečnosti."""
+    duration = float(scenario.get("hours", 168)) * 3600
+    truth_step = float(scenario.get("truth_step", 60))
+    base, minimum, maximum = scenario.get("poll", (60, 30, 900))  # Výchozí meze jako v options
+    rates = {**DEFAULT_RATES, **scenario.get("rates", {})}
+    options = scenario.get("options", {})
+
+    clock = VirtualClock()
+    truth = SimulatedSpa(_initial_data(scenario), clock, random.Random(scenario.get("seed", 0)), rates, options)
+    client = SimulatedClient(truth, clock, float(scenario.get("settle", 1.5)))
+    harness = await build_harness(options=options, client=client, clock=clock)
+    shared_data = harness.shared_data
+    sensors = [entity for entity in harness.entities if isinstance(entity, SpaEnergySensor)]
+
+    stop_truth = clock.track_time_interval(None, lambda _: truth.step(truth_step), timedelta(seconds=truth_step))
+    failed_events = []
+
+    async def run_event(event):
+        if "fixture" in event:
+            truth.replace(load_fixture(event["fixture"]))
+            return
+        async with shared_data.command_lease(refresh=True):
+            result = await getattr(client, event["command"])(*event.get("args", ()))
+        if result is None:
+            failed_events.append(event)
+
+    for at, event in _expand_events(scenario.get("events", DEFAULT_EVENTS), duration):
+        clock.call_later(None, at, lambda _, event=event: run_event(event))
+
+    started = time.perf_counter()
+    shared_data.start_periodic_update(
+        timedelta(seconds=base), timedelta(seconds=minimum), timedelta(seconds=maximum)
+    )
+    await clock.run_until(duration)
+    shared_data.pause_updates()
+    stop_truth()
+    await clock.drain()
+    wall = time.perf_counter() - started
+
+    channels = []
+    for sensor in sensors:
+        key = (sensor._component_type, sensor._port)
+        truth_kwh = truth.energy_wh.get(key, 0.0) / 1000.0
+        estimate_kwh = shared_data.energy.energy_kwh(*key)
+        channels.append({
+            "component_type": key[0],
+            "port": key[1],
+            "truth_kwh": round(truth_kwh, 4),
+            "estimate_kwh": round(estimate_kwh, 4),
+            "sensor_kwh": sensor.native_value,
+            "error_percent": round((estimate_kwh - truth_kwh) / truth_kwh * 100, 3) if truth_kwh else None,
+        })
+    total_truth = sum(channel["truth_kwh"] for channel in channels)
+    total_estimate = sum(channel["estimate_kwh"] for channel in channels)
+    return {
+        "scenario": {key: value for key, value in scenario.items() if key != "events"},
+        "simulated_hours": duration / 3600,
+        "wall_seconds": round(wall, 3),
+        "speedup": round(duration / wall) if wall else None,
+        "truth_steps": truth.steps,
+        "polls": client.reads,
+        "commands": client.commands,
+        "failed_events": len(failed_events),
+        "entity_writes": harness.writes,
+        "timers_fired": clock.fired,
+        "total_truth_kwh": round(total_truth, 4),
+        "total_estimate_kwh": round(total_estimate, 4),
+        "total_error_percent": round((total_estimate - total_truth) / total_truth * 100, 3) if total_truth else None,
+        "channels": channels,
+    }
+
+
+def print_report(result):
+    print(f"Simulated {result['simulated_hours']:.0f} h in {result['wall_seconds']:.2f} s (x{result['speedup']})")
+    print(f"polls {result['polls']}, commands {result['commands']} ({result['failed_events']} failed), "
+          f"entity writes {result['entity_writes']}, truth steps {result['truth_steps']}")
+    print(f"{'channel':22s} {'truth kWh':>10s} {'estimate':>10s} {'error':>9s}")
+    for channel in result["channels"]:
+        name = channel["component_type"] + ("" if channel["port"] is None else f" {channel['port']}")
+        error = "-" if channel["error_percent"] is None else f"{channel['error_percent']:+.2f} %"
+        print(f"{name:22s} {channel['truth_kwh']:10.3f} {channel['estimate_kwh']:10.3f} {error:>9s}")
+    total_error = "-" if result["total_error_percent"] is None else f"{result['total_error_percent']:+.2f} %"
+    print(f"{'total':22s} {result['total_truth_kwh']:10.3f} {result['total_estimate_kwh']:10.3f} {total_error:>9s}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accelerated ControlMySpa simulation on a virtual clock")
+    parser.add_argument("--scenario", help="Scenario JSON file (command line options override it)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--fixture", choices=FIXTURES, help="Initial state from testData")
+    source.add_argument("--size", choices=sorted(SIZES), help="Initial state from payload_generator")
+    parser.add_argument("--hours", type=float, help="Simulated duration (default 168)")
+    parser.add_argument("--truth-step", type=float, help="Ground truth step in seconds (default 60)")
+    parser.add_argument("--poll", type=float, nargs=3, metavar=("BASE", "MIN", "MAX"), help="Poll intervals in seconds")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("-o", "--output", help="Write the result to this JSON file")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show integration debug logging")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR)
+    scenario = {}
+    if args.scenario:
+        with open(args.scenario, encoding="utf-8") as f:
+            scenario = json.load(f)
+    for key, value in (("fixture", args.fixture), ("size", args.size), ("hours", args.hours),
+                       ("truth_step", args.truth_step), ("poll", args.poll), ("seed", args.seed)):
+        if value is not None:
+            scenario[key] = value
+    if args.fixture:
+        scenario.pop("size", None)
+
+    result = asyncio.run(simulate(scenario))
+    print_report(result)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,52 +1,279 @@
 import aiohttp
 import aiofiles
+import base64
 import time
 import asyncio
 import logging
 import json
 import os
+import random
 from . import const
+from .circuit_breaker import CircuitBreakerRegistry, is_failure_status
+from .clock import SYSTEM_CLOCK
+from .metrics import MetricsRegistry
+from .models import SpaState, json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _parse_float(value):
-    """Převod hodnoty z API na float; prázdný řetězec nebo None -> None."""
-    if value is None or value == "":
-        return None
+# Životnost tokenu (s), pokud z něj nejde přečíst exp
+DEFAULT_TOKEN_LIFETIME = 3600
+
+
+def _token_lifetime(token):
+    """Zbývající životnost JWT tokenu v sekundách podle claimu exp."""
     try:
-        return float(value)
-    except (TypeError, ValueError):
-        return None
+        claims_part = token.split('.')[1]
+        claims_part += '=' * (-len(claims_part) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(claims_part))
+        return max(0, int(claims['exp'] - time.time()))
+    except Exception:
+        return DEFAULT_TOKEN_LIFETIME
 
 
-class ControlMySpa:
-    # BASE_URL = 'https://production.controlmyspa.net'
-    BASE_URL = 'https://iot.controlmyspa.com'
+# Mapování componentType z příkazu na componentType v dashboardu
+_COMMAND_COMPONENT_TYPES = {'light': 'LIGHT', 'jet': 'PUMP', 'blower': 'BLOWER'}
+
+
+def _state_component(state, component_type, port):
+    """Komponenta z výsledku constructCurrentState podle typu a portu."""
+    index = state.get('componentIndex')
+    if index is not None:
+        return index.get((component_type, port))
+    return next((c for c in state.get('components', [])
+                 if c.get('componentType') == component_type and c.get('port') == port), None)
+
+
+def _state_zone(state, zone):
+    """TZL zóna z výsledku constructCurrentState (zoneId porovnáváme jako řetězec)."""
+    zone_id = str(zone)
+    return next((z for z in state.get('tzlZones', []) if str(z.get('zoneId')) == zone_id), None)
+
+
+def _same_value(actual, value):
+    """Hodnota ze stavu odpovídá hodnotě příkazu.
+
+    Cloud vrací hodnoty příkazů i jako řetězce nebo v jiné velikosti písmen
+    ("4" místo 4, "high" místo HIGH); takové rozdíly nejsou nepotvrzením.
+    """
+    if actual == value:
+        return True
+    if actual is None or value is None or isinstance(actual, bool) or isinstance(value, bool):
+        return False
+    return str(actual).strip().upper() == str(value).strip().upper()
+
+
+def _component_value_is(component_type, port, value):
+    def expected(state):
+        comp = _state_component(state, component_type, str(port))
+        return comp is not None and _same_value(comp.get('value'), value)
+    return expected
+
+
+def _zone_field_is(zone, field, value):
+    def expected(state):
+        zone_data = _state_zone(state, zone)
+        return zone_data is not None and _same_value(zone_data.get(field), value)
+    return expected
+
+
+def _state_field_is(field, value):
+    return lambda state: _same_value(state.get(field), value)
+
+
+def _minutes_of_day(value):
+    hours, minutes = str(value).strip().split(':')[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def _time_is(value, tolerance_minutes=1):
+    """Čas spa ("HH:MM") odpovídá nastavenému s tolerancí.
+
+    Hodiny spa mezitím běží dál, takže během potvrzování může přeskočit minuta;
+    porovnává se proto s tolerancí přes půlnoc. Neparsovatelné hodnoty se
+    porovnají přesně.
+    """
+    def expected(state):
+        actual = state.get('time')
+        try:
+            diff = abs(_minutes_of_day(actual) - _minutes_of_day(value)) % (24 * 60)
+        except (TypeError, ValueError):
+            return _same_value(actual, value)
+        return min(diff, 24 * 60 - diff) <= tolerance_minutes
+    return expected
+
+
+def _c8z_short(value):
+    """Hodnota C8Z bez prefixu výčtu (C8Z_SPEED_SMART -> SMART)."""
+    return str(value).strip().upper().rsplit('_', 1)[-1]
+
+
+def _c8z_field_is(field, value):
+    """Pole c8zCurrentState odpovídá hodnotě příkazu, i když ho cloud hlásí bez prefixu výčtu."""
+    def expected(state):
+        actual = (state.get('c8zCurrentState') or {}).get(field)
+        return actual is not None and (_same_value(actual, value) or _c8z_short(actual) == _c8z_short(value))
+    return expected
+
+
+class SpaAccount:
+    """Přihlášení a HTTP spojení jednoho účtu, sdílené všemi klienty (spa) tohoto účtu."""
+
+    # Pool spojení: keep-alive, cache DNS a omezení souběžných spojení na cloud
+    CONNECTION_LIMIT_PER_HOST = 4
+    DNS_CACHE_SECONDS = 300
+    KEEPALIVE_SECONDS = 60
+    REQUEST_TIMEOUT_SECONDS = 20
 
     def __init__(self, email, password):
         self.email = email
         self.password = password
-        self.tokenData = None
-        self.userInfo = None
-        self.currentSpa = None
-        self.waitForResult = True
-        self.scheduleFilterIntervalEnum = None
-        self.spaId = None
+        self._token_data = None
+        self._user_info = None
         self.session = None
+        self.refresh_task = None  # Probíhající přihlášení sdílené všemi klienty účtu
+        self.listener = None  # Volá se po změně tokenu nebo profilu (persistování)
+        self.breakers = CircuitBreakerRegistry()  # Circuit breakery endpointů cloudu (sdílené klienty účtu)
+
+    @property
+    def tokenData(self):
+        return self._token_data
+
+    @tokenData.setter
+    def tokenData(self, value):
+        self._token_data = value
+        self._changed()
+
+    @property
+    def userInfo(self):
+        return self._user_info
+
+    @userInfo.setter
+    def userInfo(self, value):
+        self._user_info = value
+        self._changed()
+
+    def restore(self, token_data, user_info):
+        """Obnoví uložený token a profil (bez volání listeneru)."""
+        self._token_data = token_data
+        self._user_info = user_info
+
+    def token_valid_seconds(self):
+        """Kolik sekund ještě platí aktuální token (0 = neplatný)."""
+        if not self._token_data:
+            return 0
+        expires_at = self._token_data['timestamp'] + self._token_data['expires_in'] * 1000
+        return max(0, (expires_at - int(time.time() * 1000)) / 1000)
+
+    def _changed(self):
+        if self.listener is not None:
+            try:
+                self.listener(self)
+            except Exception as e:
+                _LOGGER.error(f"Account listener error: {e}")
 
     async def init_session(self):
-        if self.session is None:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.CONNECTION_LIMIT_PER_HOST,
+                ttl_dns_cache=self.DNS_CACHE_SECONDS,
+                keepalive_timeout=self.KEEPALIVE_SECONDS,
+            )
             # 20s total timeout per request keeps a stalled cloud call from
             # blocking the 60s periodic update tick (aiohttp's 5-min default
             # left last_reported frozen long enough to trip the stale alert).
-            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=20))
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT_SECONDS),
+            )
 
     async def close(self):
         if self.session:
             await self.session.close()
             self.session = None
 
+
+class ControlMySpa:
+    # BASE_URL = 'https://production.controlmyspa.net'
+    BASE_URL = 'https://iot.controlmyspa.com'
+    # Výsledek getSpa mladší než tato doba (s) se použije znovu místo nového dotazu
+    SPA_FRESHNESS_SECONDS = 2.0
+    # Token se obnovuje na pozadí, když mu zbývá méně než tato doba (s)
+    TOKEN_REFRESH_AHEAD_SECONDS = 300
+    # Potvrzení příkazu: odstupy mezi čteními dashboardu (poslední se opakuje) a celkový limit (s)
+    COMMAND_CONFIRM_DELAYS = (0.5, 1.0, 2.0)
+    COMMAND_CONFIRM_TIMEOUT = 10.0
+    # Pevná prodleva pro příkazy bez očekávaného stavu
+    COMMAND_SETTLE_SECONDS = 5
+    # Opakování GET dotazů (idempotentní) po chybě spojení nebo 5xx/429: počet a základ prodlevy (s)
+    GET_RETRIES = 2
+    GET_RETRY_BACKOFF_SECONDS = 0.5
+
+    def __init__(self, email, password, account=None):
+        self.email = email
+        self.password = password
+        # Bez sdíleného účtu si klient drží vlastní spojení i token
+        self._owns_account = account is None
+        self._account = account if account is not None else SpaAccount(email, password)
+        self.currentSpa = None
+        self.waitForResult = True
+        self.scheduleFilterIntervalEnum = None
+        self.spaId = None
+        # Single-flight getSpa: sdílený probíhající dotaz a krátkodobá cache výsledku
+        self._spa_fetch_task = None
+        self._spa_fetch_generation = 0
+        self._spa_generation = 0  # Zvyšuje se po každém příkazu (invalidace cache)
+        self._spa_cache = None  # (generation, monotonic čas, výsledek)
+        self._last_state = None  # Poslední SpaState - nezměněné části sdílí další čtení
+        self._awaiting_confirmation = 0  # Počet příkazů, jejichž potvrzení právě probíhá
+        self.clock = SYSTEM_CLOCK  # Zdroj času pro cache, potvrzování a prodlevy příkazů
+        self.metrics = MetricsRegistry()  # Latence, statusy a velikosti odpovědí podle endpointu
+
+    @property
+    def account(self):
+        return self._account
+
+    @property
+    def session(self):
+        return self._account.session
+
+    @property
+    def tokenData(self):
+        return self._account.tokenData
+
+    @tokenData.setter
+    def tokenData(self, value):
+        self._account.tokenData = value
+
+    @property
+    def userInfo(self):
+        return self._account.userInfo
+
+    @userInfo.setter
+    def userInfo(self, value):
+        self._account.userInfo = value
+
+    async def init_session(self):
+        await self._account.init_session()
+
+    async def close(self):
+        # Sdílené spojení zavírá až registr účtů po uvolnění posledního klienta
+        if self._owns_account:
+            await self._account.close()
+
+    def _breaker(self, name):
+        """Circuit breaker endpointu (login, profile, owned, dashboard, commands)."""
+        return self._account.breakers.get(name)
+
+    def cloudStatus(self):
+        """Souhrnný stav breakerů a stav jednotlivých endpointů (diagnostika)."""
+        breakers = self._account.breakers
+        return {"state": breakers.state(), "endpoints": breakers.as_dict()}
+
+    def cloudMetrics(self):
+        """Metriky volání jednotlivých endpointů (diagnostika)."""
+        return self.metrics.as_dict()
+
     def getAuthHeaders(self):
         return {
             'Authorization': f"Bearer {self.tokenData['access_token']}",
@@ -63,18 +290,58 @@ class ControlMySpa:
 
     async def init(self):
         await self.init_session()
-        return await self.login() and await self.getWhoAmI() 
+        if self.isLoggedIn() and self.userInfo:
+            # Účet už přihlásil jiný klient
+            return self.userInfo
+        return await self.login() and await self.getWhoAmI()
 
     def isLoggedIn(self):
-        if not self.tokenData:
-            return False
-        return self.tokenData['timestamp'] + self.tokenData['expires_in'] * 1000 > int(time.time() * 1000)
+        return self._account.token_valid_seconds() > 0
 
     async def login(self):
+        """Přihlásí účet; souběžná volání (i z jiných klientů účtu) sdílí jeden dotaz."""
+        return await asyncio.shield(self._startTokenRefresh())
+
+    async def ensureToken(self):
+        """Zajistí platný token před voláním API.
+
+        Platný token, kterému zbývá méně než TOKEN_REFRESH_AHEAD_SECONDS, se
+        použije a nový se mezitím získá na pozadí. Neplatný token se obnoví hned.
+        """
+        remaining = self._account.token_valid_seconds()
+        if remaining > 0:
+            if remaining < self.TOKEN_REFRESH_AHEAD_SECONDS:
+                self._startTokenRefresh()
+            return True
+        return await self.login()
+
+    def _dropRejectedToken(self, status):
+        # Server token odmítl (např. uložený token byl zneplatněn) - další volání se přihlásí znovu
+        if status == 401 and self.tokenData is not None:
+            _LOGGER.warning("Access token rejected, logging in again on next request")
+            self.tokenData = None
+
+    def _startTokenRefresh(self):
+        task = self._account.refresh_task
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._login())
+            self._account.refresh_task = task
+        return task
+
+    async def _login(self):
+        breaker = self._breaker("login")
+        if not breaker.allow():
+            _LOGGER.debug("Login skipped, circuit open for %.0f s", breaker.retry_in())
+            return False
+        metrics = self.metrics.get("login")
+        started = time.monotonic()
         try:
             headers = {**self.getCommonHeaders(), 'Content-Type': 'application/json'}
             payload = {'email': self.email, 'password': self.password}
             async with self.session.post(f'{self.BASE_URL}/auth/login', json=payload, headers=headers, ssl=const.VERIFY_SSL) as resp:
+                breaker.record_status(resp.status)
+                # Tělo se načte jednou; json() a text() pak použijí načtená data
+                metrics.record((time.monotonic() - started) * 1000, resp.status, len(await resp.read()))
                 if resp.status == 200:
                     res_json = await resp.json()
                     token = res_json.get('data', {}).get('accessToken')
@@ -82,32 +349,91 @@ class ControlMySpa:
                         self.tokenData = {
                             'access_token': token,
                             'timestamp': int(time.time() * 1000),
-                            'expires_in': 3600
+                            'expires_in': _token_lifetime(token)
                         }
                         return True
                     else:
                         _LOGGER.error(f"Login Error, no login token: {res_json}")
                 else:
                     _LOGGER.error(f"Login Error, HTTP status {resp.status}: {await resp.text()}")
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            breaker.record_failure()
+            metrics.record_failure((time.monotonic() - started) * 1000, isinstance(e, asyncio.TimeoutError))
+            _LOGGER.error(f"Login Error: {e!r}")
         except Exception as e:
             _LOGGER.error(f"Login Error: {e}")
         return False
 
+    def _authHeadersOrNone(self):
+        """Hlavičky s tokenem, nebo None, pokud účet token nemá (nepřihlášen)."""
+        if not self.tokenData:
+            return None
+        return self.getAuthHeaders()
+
+    async def _get(self, name, path, headers):
+        """GET endpointu s breakerem name, metrikami a omezeným opakováním.
+
+        Vrací (HTTP status, tělo), nebo None, pokud je breaker otevřený nebo se dotaz
+        nepodařil. Chyba spojení a odpověď 5xx/429 se zopakuje nejvýše GET_RETRIES-krát
+        s rostoucí, náhodně zkrácenou prodlevou; timeout se neopakuje (už trval
+        REQUEST_TIMEOUT_SECONDS). Breaker započítá jen výsledek posledního pokusu.
+        """
+        breaker = self._breaker(name)
+        if not breaker.allow():
+            _LOGGER.debug("GET %s skipped, circuit open for %.0f s", name, breaker.retry_in())
+            return None
+        metrics = self.metrics.get(name)
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                async with self.session.get(f'{self.BASE_URL}{path}', headers=headers, ssl=const.VERIFY_SSL) as resp:
+                    body = await resp.read()
+                    metrics.record((time.monotonic() - started) * 1000, resp.status, len(body))
+                    if not is_failure_status(resp.status) or attempt >= self.GET_RETRIES:
+                        breaker.record_status(resp.status)
+                        return resp.status, body
+                    _LOGGER.debug("GET %s returned HTTP %s, retrying", name, resp.status)
+            except asyncio.TimeoutError as e:
+                metrics.record_failure((time.monotonic() - started) * 1000, True)
+                breaker.record_failure()
+                _LOGGER.error(f"GET {name} Error: {e!r}")
+                return None
+            except aiohttp.ClientError as e:
+                metrics.record_failure((time.monotonic() - started) * 1000, False)
+                if attempt >= self.GET_RETRIES:
+                    breaker.record_failure()
+                    _LOGGER.error(f"GET {name} Error: {e!r}")
+                    return None
+                _LOGGER.debug("GET %s failed (%r), retrying", name, e)
+            except BaseException:
+                # Neočekávaná chyba nesmí nechat zkušební dotaz breakeru nevyřešený
+                breaker.record_failure()
+                raise
+            attempt += 1
+            await self.clock.sleep(self.GET_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1) * (0.5 + random.random() / 2))
+
     async def getWhoAmI(self):
+        headers = self._authHeadersOrNone()
+        if headers is None:
+            _LOGGER.error("GetWhoAmI Error: not logged in")
+            return None
         try:
-            headers = self.getAuthHeaders()
-            async with self.session.get(f'{self.BASE_URL}/user-management/profile', headers=headers, ssl=const.VERIFY_SSL) as resp:
-                if resp.status == 200:
-                    res_json = await resp.json()
-                    user = res_json.get('data', {}).get('user')
-                    if user:
-                        self.userInfo = user
-                        _LOGGER.info(f"GetWhoAmI User exists: {user}")
-                        return user
-                    else:
-                        _LOGGER.error(f"GetWhoAmI Unknow data: {res_json}")
+            response = await self._get("profile", '/user-management/profile', headers)
+            if response is None:
+                return None
+            status, body = response
+            if status == 200:
+                res_json = json_loads(body)
+                user = res_json.get('data', {}).get('user')
+                if user:
+                    self.userInfo = user
+                    _LOGGER.info(f"GetWhoAmI User exists: {user}")
+                    return user
                 else:
-                    _LOGGER.error(f"GetWhoAmI Error, HTTP status {resp.status}: {await resp.text()}")
+                    _LOGGER.error(f"GetWhoAmI Unknow data: {res_json}")
+            else:
+                _LOGGER.error(f"GetWhoAmI Error, HTTP status {status}: {body.decode(errors='replace')}")
         except Exception as e:
             _LOGGER.error(f"GetWhoAmI Error: {e}")
         return None
@@ -134,20 +460,58 @@ class ControlMySpa:
                     return None
             
             # Normální režim - načtení dat z API
-            if not self.isLoggedIn():
-                await self.login()
-            headers = self.getAuthHeaders()
-            async with self.session.get(f'{self.BASE_URL}/spas/owned', headers=headers, ssl=const.VERIFY_SSL) as resp:
-                if resp.status == 200:
-                    res_json = await resp.json()
-                    return res_json.get('data', {}).get('spas', [])
-                else:
-                    _LOGGER.error(f"getSpaOwner Error, HTTP status {resp.status}: {await resp.text()}")
+            await self.ensureToken()
+            headers = self._authHeadersOrNone()
+            if headers is None:
+                return None
+            response = await self._get("owned", '/spas/owned', headers)
+            if response is None:
+                return None
+            status, body = response
+            if status == 200:
+                return json_loads(body).get('data', {}).get('spas', [])
+            _LOGGER.error(f"getSpaOwner Error, HTTP status {status}: {body.decode(errors='replace')}")
         except Exception as e:
             _LOGGER.error(f"getSpaOwner Error: {e}")
         return None
 
-    async def getSpa(self):
+    async def getSpa(self, max_age=None):
+        """Načte aktuální stav spa.
+
+        Souběžná volání sdílí jeden probíhající dotaz na dashboard (single-flight)
+        a výsledek mladší než max_age sekund (výchozí SPA_FRESHNESS_SECONDS)
+        se vrátí bez nového dotazu. Po odeslání příkazu se cache invaliduje.
+        """
+        if max_age is None:
+            max_age = self.SPA_FRESHNESS_SECONDS
+        cached = self._spa_cache
+        if (
+            cached is not None
+            and cached[0] == self._spa_generation
+            and self.clock.monotonic() - cached[1] < max_age
+        ):
+            return cached[2]
+
+        task = self._spa_fetch_task
+        if task is None or task.done() or self._spa_fetch_generation != self._spa_generation:
+            self._spa_fetch_generation = self._spa_generation
+            task = asyncio.ensure_future(self._fetchSpaShared(self._spa_generation))
+            self._spa_fetch_task = task
+        # shield - zrušení jednoho čekajícího nezruší dotaz ostatním
+        return await asyncio.shield(task)
+
+    def invalidateSpaCache(self):
+        """Zneplatní cache i probíhající dotaz - další getSpa načte nová data."""
+        self._spa_generation += 1
+        self._spa_cache = None
+
+    async def _fetchSpaShared(self, generation):
+        result = await self._fetchSpa()
+        if result is not None and generation == self._spa_generation:
+            self._spa_cache = (generation, self.clock.monotonic(), result)
+        return result
+
+    async def _fetchSpa(self):
         try:
             # Test mode - načtení dat ze souboru
             if const.TEST_MODE and const.TEST_MODE.startswith("Data"):
@@ -169,18 +533,24 @@ class ControlMySpa:
                     return None
             
             # Normální režim - načtení dat z API
-            if not self.isLoggedIn():
-                await self.login()
             if not self.spaId:
                 return None
-
-            headers = self.getAuthHeaders()
-            async with self.session.get(f'{self.BASE_URL}/spas/{self.spaId}/dashboard', headers=headers, ssl=const.VERIFY_SSL) as resp:
-                if resp.status == 200:
-                    res_json = await resp.json()
-                    return self.constructCurrentState(res_json.get('data'))
-                else:
-                    _LOGGER.error(f"GetSpa Error, HTTP status {resp.status}: {await resp.text()}")
+            await self.init_session()  # Po rychlém startu může čtení předejít init()
+            await self.ensureToken()
+            # Bez tokenu se dotaz neprovede a nespotřebuje ani zkušební dotaz breakeru
+            headers = self._authHeadersOrNone()
+            if headers is None:
+                return None
+            # Při výpadku cloudu se dashboard nečte, dokud breaker nepropustí zkušební dotaz
+            response = await self._get("dashboard", f'/spas/{self.spaId}/dashboard', headers)
+            if response is None:
+                return None
+            status, body = response
+            if status == 200:
+                # Stav se dekóduje přímo z těla odpovědi (rychlý JSON dekodér)
+                return self.constructCurrentState(json_loads(body).get('data'))
+            self._dropRejectedToken(status)
+            _LOGGER.error(f"GetSpa Error, HTTP status {status}: {body.decode(errors='replace')}")
         except Exception as e:
             _LOGGER.error(f"GetSpa Error: {e}")
         return None
@@ -195,87 +565,151 @@ class ControlMySpa:
             # except (OSError, TypeError) as dump_err:
             #     _LOGGER.warning("Nepodařilo se uložit last_spa_dashboard.json: %s", dump_err)
 
-            desired_temp = _parse_float(spaData.get("desiredTemp"))
-            current_temp = _parse_float(spaData.get("currentTemp"))
-
-            result = {
-                'desiredTemp': desired_temp,
-                'targetDesiredTemp': desired_temp,
-                'currentTemp': current_temp,
-                'celsius': bool(spaData['isCelsius']),
-                'panelLock': spaData['isPanelLocked'],
-                'heaterMode': spaData['heaterMode'],
-                'components': spaData.get('components', []),
-                'runMode': spaData['heaterMode'],
-                'tempRange': spaData['tempRange'],
-                'setupParams': {
-                    'highRangeLow': spaData['rangeLimits']['highRangeLow'],
-                    'highRangeHigh': spaData['rangeLimits']['highRangeHigh'],
-                    'lowRangeLow': spaData['rangeLimits']['lowRangeLow'],
-                    'lowRangeHigh': spaData['rangeLimits']['lowRangeHigh']
-                },
-                'time': spaData['time'],
-                # 'hour': int(spaData['time'].split(':')[0]) if spaData.get('time') else None,
-                # 'minute': int(spaData['time'].split(':')[1]) if spaData.get('time') else None,
-                # 'timeNotSet': not bool(spaData.get('time')),
-                # 'military': spaData['isMilitaryTime'],
-                'serialNumber': spaData['serialNumber'],
-                'controllerSoftwareVersion': spaData['systemInfo']['controllerSoftwareVersion'],
-                'isOnline': bool(spaData.get('isOnline')),
-                'currentFaultMessage': spaData.get('currentFaultMessage'),
-                'totalAlerts': spaData.get('totalAlerts'),
-                'c8zCurrentState': spaData.get('c8zCurrentState'),
-            }
-            
-            # Načtení TZL zones pokud je TZL připojen
-            if spaData.get('primaryTZLStatus') == 'TZL_CONNECTED':
-                tzl_state = spaData.get('tzlState', {})
-                tzl_light_status = tzl_state.get('tzlLightStatus', {})
-                tzl_configuration = tzl_state.get('tzlConfiguration', {})
-                tzl_color_settings = tzl_state.get('tzlColorSettings', {})
-                
-                result['tzlZones'] = tzl_light_status.get('tzlZones', [])
-                result['tzlZoneFunctions'] = tzl_configuration.get('tzlZoneFunctions', [])
-                result['tzlColors'] = tzl_color_settings.get('tzlColors', [])
-            else:
-                result['tzlZones'] = []
-                result['tzlZoneFunctions'] = []
-                result['tzlColors'] = []
-                
-            return result
+            # Nezměněné komponenty, zóny a seznamy se převezmou z předchozího stavu
+            state = SpaState.from_dashboard(spaData, self._last_state)
+            self._last_state = state
+            return state
         except Exception as e:
             _LOGGER.error(f"constructCurrentState Error: {e}")
             return None
 
-    async def _postAndRefresh(self, endpoint, payload):
+    async def _postCommand(self, endpoint, payload):
+        """Odešle jeden příkaz bez obnovení stavu; vrací True při HTTP 200.
+
+        Příkaz se neodešle (hned vrací False), pokud je otevřený breaker příkazů
+        nebo dashboardu - bez dashboardu by příkaz nešel ani potvrdit.
+        """
+        # Token se zajistí před breakerem - bez něj se příkaz neodešle a zkušební dotaz nespotřebuje
+        await self.init_session()
+        await self.ensureToken()
+        auth_headers = self._authHeadersOrNone()
+        if auth_headers is None:
+            _LOGGER.error(f"Error in {endpoint}: not logged in")
+            return False
+        breaker = self._breaker("commands")
+        dashboard = self._breaker("dashboard")
+        if dashboard.is_open() or not breaker.allow():
+            _LOGGER.warning("ControlMySpa cloud unavailable, %s not sent (retry in %.0f s)",
+                            endpoint, max(breaker.retry_in(), dashboard.retry_in()))
+            return False
+        # Metriky podle cesty příkazu (endpoint je konstanta, klíč se nealokuje)
+        metrics = self.metrics.get(endpoint)
+        started = time.monotonic()
         try:
-            if not self.isLoggedIn():
-                await self.login()
-            headers = {**self.getAuthHeaders(), 'Content-Type': 'application/json'}
+            headers = {**auth_headers, 'Content-Type': 'application/json'}
             async with self.session.post(f'{self.BASE_URL}{endpoint}', json=payload, headers=headers, ssl=const.VERIFY_SSL) as resp:
+                breaker.record_status(resp.status)
+                metrics.record((time.monotonic() - started) * 1000, resp.status, len(await resp.read()))
                 if resp.status == 200:
-                    await asyncio.sleep(5)
-                    return await self.getSpa()
-                else:
-                    textResponse = await resp.text()
-                    _LOGGER.error(f"Error in {endpoint}: {textResponse} Data: {payload}")
+                    self.invalidateSpaCache()
+                    return True
+                self._dropRejectedToken(resp.status)
+                textResponse = await resp.text()
+                _LOGGER.error(f"Error in {endpoint}: {textResponse} Data: {payload}")
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            breaker.record_failure()
+            metrics.record_failure((time.monotonic() - started) * 1000, isinstance(e, asyncio.TimeoutError))
+            _LOGGER.error(f"Error in {endpoint}: {e!r}")
         except Exception as e:
             _LOGGER.error(f"Error in {endpoint}: {e}")
+        return False
+
+    async def _postAndRefresh(self, endpoint, payload, expected=None):
+        """Odešle příkaz a vrátí nový stav.
+
+        expected je predikát nad výsledkem constructCurrentState; pokud je zadán,
+        dashboard se čte s rostoucím odstupem, dokud predikát neplatí nebo nevyprší
+        COMMAND_CONFIRM_TIMEOUT. Bez něj se čeká pevně COMMAND_SETTLE_SECONDS.
+        """
+        if not await self._postCommand(endpoint, payload):
+            return None
+        try:
+            if expected is None:
+                await self.clock.sleep(self.COMMAND_SETTLE_SECONDS)
+                return await self.getSpa()
+            return await self._waitForState(endpoint, expected)
+        except Exception as e:
+            _LOGGER.error(f"Error in {endpoint}: {e}")
+        return None
+
+    async def sendCommands(self, commands):
+        """Odešle příkazy (endpoint, payload, expected) za sebou a stav obnoví jen jednou na konci.
+
+        Při prvním odmítnutém příkazu se zbytek neodesílá. Vrací obnovený stav,
+        pokud spa přijala alespoň jeden příkaz, jinak None.
+        """
+        accepted = []
+        for endpoint, payload, expected in commands:
+            if not await self._postCommand(endpoint, payload):
+                break
+            accepted.append((endpoint, expected))
+        if not accepted:
+            return None
+
+        endpoints = ", ".join(endpoint for endpoint, _ in accepted)
+        predicates = [expected for _, expected in accepted if expected is not None]
+        try:
+            if not predicates:
+                await self.clock.sleep(self.COMMAND_SETTLE_SECONDS)
+                return await self.getSpa()
+            return await self._waitForState(endpoints, lambda state: all(p(state) for p in predicates))
+        except Exception as e:
+            _LOGGER.error(f"Error in {endpoints}: {e}")
         return None
 
+    async def _waitForState(self, endpoint, expected):
+        """Čte dashboard, dokud stav neodpovídá expected; vrací poslední přečtený stav.
+
+        Po dobu čekání je příkaz nepotvrzený (viz hasPendingCommands); po vypršení
+        COMMAND_CONFIRM_TIMEOUT se dál nesleduje.
+        """
+        self._awaiting_confirmation += 1
+        try:
+            return await self._confirmState(endpoint, expected)
+        finally:
+            self._awaiting_confirmation -= 1
+
+    async def _confirmState(self, endpoint, expected):
+        deadline = self.clock.monotonic() + self.COMMAND_CONFIRM_TIMEOUT
+        delays = self.COMMAND_CONFIRM_DELAYS
+        state = None
+        attempt = 0
+        while True:
+            remaining = deadline - self.clock.monotonic()
+            if remaining <= 0:
+                break
+            await self.clock.sleep(min(delays[min(attempt, len(delays) - 1)], remaining))
+            attempt += 1
+            current = await self.getSpa(max_age=0)
+            if current is None:
+                continue
+            state = current
+            try:
+                if expected(state):
+                    _LOGGER.debug(f"{endpoint} confirmed after {attempt} reads")
+                    return state
+            except Exception as e:
+                _LOGGER.debug(f"{endpoint} expected-state check failed: {e}")
+        _LOGGER.debug(f"{endpoint} not confirmed within {self.COMMAND_CONFIRM_TIMEOUT}s")
+        return state
+
+    def hasPendingCommands(self):
+        """True, pokud se právě čeká na potvrzení některého příkazu."""
+        return self._awaiting_confirmation > 0
+
     async def setTemp(self, temp):
         return await self._postAndRefresh("/spa-commands/temperature/value", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "value": temp
-        })
+        }, lambda state: state.get('desiredTemp') is not None and abs(state['desiredTemp'] - float(temp)) <= 0.5)
 
     async def setTempRange(self, high):
         return await self._postAndRefresh("/spa-commands/temperature/range", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "range": "HIGH" if high else "LOW"
-        })
+        }, _state_field_is('tempRange', "HIGH" if high else "LOW"))
 
     async def setTime(self, date, time, military_format=True):
         return await self._postAndRefresh("/spa-commands/time", {
@@ -284,14 +718,14 @@ class ControlMySpa:
             "date": date,
             "time": time,
             "isMilitaryFormat": military_format
-    })
+        }, _time_is(time))
 
     async def setPanelLock(self, locked):
         return await self._postAndRefresh("/spa-commands/panel/state", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "state": "LOCK_PANEL" if locked else "UNLOCK_PANEL"
-        })
+        }, _state_field_is('panelLock', bool(locked)))
 
     async def setLightState(self, deviceNumber, desiredState):
         return await self.setComponentState(deviceNumber, desiredState, 'light')
@@ -309,104 +743,158 @@ class ControlMySpa:
             "spaId": self.spaId,
             "via": "MOBILE",
             "componentType": componentType
-        })
+        }, _component_value_is(_COMMAND_COMPONENT_TYPES.get(componentType, componentType.upper()), deviceNumber, desiredState))
 
     async def setHeaterMode(self, mode):
         return await self._postAndRefresh("/spa-commands/temperature/heater-mode", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "mode": mode
-        })
+        }, _state_field_is('heaterMode', mode))
 
     #time format "14:30", numOfIntervals 2 hours
     async def setFilterCycle(self, deviceNumber, numOfIntervals, time_str):
+        def expected(state):
+            comp = _state_component(state, "FILTER", str(deviceNumber))
+            if comp is None:
+                return False
+            return (f"{int(comp.get('hour', -1)):02d}:{int(comp.get('minute', -1)):02d}" == time_str
+                    and int(comp.get('durationMinutes', -1)) == numOfIntervals * 15)
+
         return await self._postAndRefresh("/spa-commands/filter-cycles/schedule", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "deviceNumber": deviceNumber,
             "numOfIntervals": numOfIntervals,
             "time": time_str
-        })
+        }, expected)
     
     #only ON/OFF
     async def setFilter2Toggle(self, state):
+        def expected(spa_state):
+            comp = _state_component(spa_state, "FILTER", "1")
+            return comp is not None and (comp.get('value') != "DISABLED") == (state == "ON")
+
         return await self._postAndRefresh("/spa-commands/filter-cycles/toggle-filter2-state", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "state": state,
-        })
+        }, expected)
     
-    async def setChromazonePower(self, power_state):
+    # Stavební funkce příkazů: vrací (endpoint, payload, expected) pro _postAndRefresh / sendCommands
+
+    def chromazonePowerCommand(self, power_state):
         # Zapne/vypne chromazone (ON/OFF)
-        return await self._postAndRefresh("/spa-commands/chromozone/power", {
+        def expected(state):
+            zones = state.get('tzlZones') or []
+            return any(z.get('state') != "OFF" for z in zones) == (power_state == "ON")
+
+        return "/spa-commands/chromozone/power", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "state": power_state,
-        })
+        }, expected
 
-    async def setChromazoneFunction(self, zone_state, zone):
+    def chromazoneFunctionCommand(self, zone_state, zone):
         # Nastaví funkci zóny (OFF, PARTY, RELAX, WHEEL, NORMAL)
-        return await self._postAndRefresh("/spa-commands/chromozone/state", {
+        return "/spa-commands/chromozone/state", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "state": zone_state,
             "location": int(zone),
             "locationType": "ZONE",
-        })
-    
-    async def setChromazoneColor(self, color_id, zone):
+        }, _zone_field_is(zone, 'state', zone_state)
+
+    def chromazoneColorCommand(self, color_id, zone):
         # Nastaví barvu pro konkrétní zónu
-        return await self._postAndRefresh("/spa-commands/chromozone/color", {
+        def expected(state):
+            zone_data = _state_zone(state, zone)
+            if zone_data is None or zone_data.get('state') in ("OFF", "DISABLED"):
+                return False
+            # colorId v paletě (i v zóně, pokud ho cloud hlásí) je číslován od 1, příkaz od 0
+            if _same_value(zone_data.get('colorId'), color_id + 1):
+                return True
+            color = next((c for c in state.get('tzlColors', []) if _same_value(c.get('colorId'), color_id + 1)), None)
+            if color is None:
+                return zone_data.get('colorId') is None
+            return (zone_data.get('red'), zone_data.get('green'), zone_data.get('blue')) == \
+                (color.get('red'), color.get('green'), color.get('blue'))
+
+        return "/spa-commands/chromozone/color", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "color": color_id,
             "location": int(zone),
             "locationType": "ZONE",
-        })
+        }, expected
 
-    async def setChromazoneBrightness(self, intensity, zone):
+    def chromazoneBrightnessCommand(self, intensity, zone):
         # Nastaví jas pro konkrétní zónu Jas (Stavy 0,1,2 ... 8)
-        return await self._postAndRefresh("/spa-commands/chromozone/intensity", {
+        return "/spa-commands/chromozone/intensity", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "intensity": intensity,
             "location": int(zone),
             "locationType": "ZONE",
-        })
+        }, _zone_field_is(zone, 'intensity', intensity)
 
-    async def setChromazoneSpeed(self, speed, zone):
+    def chromazoneSpeedCommand(self, speed, zone):
         # Nastaví Rychlost prolínání barev (Stavy 0,1,2 ... 5)
-        return await self._postAndRefresh("/spa-commands/chromozone/speed", {
+        return "/spa-commands/chromozone/speed", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "speed": speed,
             "location": int(zone),
             "locationType": "ZONE",
-        })
+        }, _zone_field_is(zone, 'speed', speed)
 
-    async def setC8zSpeedState(self, speed_state: str):
+    def c8zSpeedStateCommand(self, speed_state: str):
         """C8Z tepelné čerpadlo — rychlost (např. C8Z_SPEED_SMART)."""
-        return await self._postAndRefresh("/spa-commands/c8zone/state", {
+        return "/spa-commands/c8zone/state", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "speedState": speed_state,
-        })
+        }, _c8z_field_is('c8zSpeed', speed_state)
 
-    async def setC8zHeaterState(self, heater_state: str):
+    def c8zHeaterStateCommand(self, heater_state: str):
         """C8Z — režim ohřevu (např. C8Z_HEATER_AUTO)."""
-        return await self._postAndRefresh("/spa-commands/c8zone/state", {
+        return "/spa-commands/c8zone/state", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "heaterState": heater_state,
-        })
+        }, _c8z_field_is('c8zHeater', heater_state)
 
-    async def setC8zModeState(self, mode_state: str):
+    def c8zModeStateCommand(self, mode_state: str):
         """C8Z — provozní režim (např. C8Z_MODE_HEAT)."""
-        return await self._postAndRefresh("/spa-commands/c8zone/state", {
+        return "/spa-commands/c8zone/state", {
             "spaId": self.spaId,
             "via": "MOBILE",
             "modeState": mode_state,
-        })
+        }, _c8z_field_is('c8zMode', mode_state)
+
+    async def setChromazonePower(self, power_state):
+        return await self._postAndRefresh(*self.chromazonePowerCommand(power_state))
+
+    async def setChromazoneFunction(self, zone_state, zone):
+        return await self._postAndRefresh(*self.chromazoneFunctionCommand(zone_state, zone))
+
+    async def setChromazoneColor(self, color_id, zone):
+        return await self._postAndRefresh(*self.chromazoneColorCommand(color_id, zone))
+
+    async def setChromazoneBrightness(self, intensity, zone):
+        return await self._postAndRefresh(*self.chromazoneBrightnessCommand(intensity, zone))
+
+    async def setChromazoneSpeed(self, speed, zone):
+        return await self._postAndRefresh(*self.chromazoneSpeedCommand(speed, zone))
+
+    async def setC8zSpeedState(self, speed_state: str):
+        return await self._postAndRefresh(*self.c8zSpeedStateCommand(speed_state))
+
+    async def setC8zHeaterState(self, heater_state: str):
+        return await self._postAndRefresh(*self.c8zHeaterStateCommand(heater_state))
+
+    async def setC8zModeState(self, mode_state: str):
+        return await self._postAndRefresh(*self.c8zModeStateCommand(mode_state))
 
     def createTimeOptions(self):
         """Vytvoří seznam časových možností po 15 minutách."""
@@ -1,40 +1,277 @@
-from homeassistant.helpers.event import async_track_time_interval
+from contextlib import asynccontextmanager
+from .clock import SYSTEM_CLOCK
+from .models import SpaState
+from .palette import TzlPalette, palette_fingerprint
+from .energy_integrator import SpaEnergyIntegrator
+from .long_term_statistics import SpaStatisticsCollector
+from .entity import SpaSubscriberMixin
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+# Klíče, jejichž změna ovlivní dostupnost všech entit (is_remote_control_allowed)
+_GLOBAL_KEYS = ("isOnline", "panelLock")
+# Klíče porovnávané po částech (komponenty, TZL zóny) nebo odvozené indexy
+_SLICED_KEYS = ("components", "tzlZones", "componentIndex", "tzlZoneIndex")
+# Adaptivní polling: typy komponent a hodnoty, které znamenají, že vana "něco dělá"
+_ACTIVE_COMPONENT_TYPES = ("PUMP", "BLOWER", "HEATER")
+_INACTIVE_VALUES = (None, "OFF", "DISABLED", "WAITING")
+_IDLE_POLLS_BEFORE_BACKOFF = 3  # Počet klidových čtení v základním intervalu před prodlužováním
+_IDLE_BACKOFF_FACTOR = 1.5
+_OFFLINE_BACKOFF_FACTOR = 2.0
+_MAX_BACKOFF_STEPS = 16  # Omezení exponentu (interval je stejně omezen maximem)
+
+# Prodleva (s) zápisu snapshotu - více změn stavu se sloučí do jednoho zápisu
+_SNAPSHOT_SAVE_DELAY = 60
+# Změny, kvůli kterým se snapshot neukládá (čas panelu se mění při každém čtení, ostatní nejsou stav spa)
+_SNAPSHOT_VOLATILE = frozenset({"time", "cloudMetrics", "cloudStatus", "pollDecision", "energy", "fromSnapshot"})
+# Checkpoint energie se ukládá nejvýše jednou za tuto dobu (s) a při ukončení HA
+_ENERGY_SAVE_INTERVAL = 300
+# Při importu dlouhodobých statistik se stav energy senzorů zapisuje nejvýše jednou za tuto dobu (s)
+_STATISTICS_ENERGY_STATE_INTERVAL = 900
+
+def _differs(old, new):
+    """Porovnání části stavu; sdílená (nezměněná) část je tentýž objekt."""
+    return old is not new and old != new
+
+
+def _sync_handler(subscriber):
+    """handle_spa_state odběratele, nebo None pro asynchronní cestu přes async_update."""
+    handler = getattr(subscriber, "handle_spa_state", None)
+    if handler is None:
+        return None
+    # Podtřída s vlastním async_update (starší rozšíření) zůstává na asynchronní cestě
+    if getattr(type(subscriber), "async_update", None) is not SpaSubscriberMixin.async_update:
+        return None
+    return handler
+
+
+def _is_spa_active(data):
+    """True, pokud běží čerpadlo, blower, ohřev nebo svítí některá TZL zóna."""
+    for comp in data.get("components", []):
+        if comp.get("componentType") in _ACTIVE_COMPONENT_TYPES and comp.get("value") not in _INACTIVE_VALUES:
+            return True
+    return any(zone.get("state") not in _INACTIVE_VALUES for zone in data.get("tzlZones", []))
+
+
 class SpaData:
     """Sdílený objekt pro uchování dat z webového dotazu."""
-    def __init__(self, client, hass):
+    def __init__(self, client, hass, snapshot_store=None, energy_store=None, clock=None):
         self._client = client
+        self._clock = clock if clock is not None else SYSTEM_CLOCK  # Zdroj času (virtuální v simulaci)
         self._data = None
         self._hass = hass
+        self._snapshot_store = snapshot_store  # Store pro poslední známý stav (rychlý start)
+        self._from_snapshot = False  # Data pochází ze snapshotu, ne z cloudu
+        self._snapshot_state = None  # Stav k uložení při nejbližším zápisu snapshotu
+        self._snapshot_save_pending = False  # Zápis snapshotu je naplánován
         self._subscribers = []  # Seznam odběratelů
+        self._sync_handlers = {}  # id(odběratel) -> handle_spa_state (None = async_update)
         self._update_interval = None  # Handler pro interval
         self._is_updating = False  # Příznak zda běží aktualizace
         self._last_interval = None  # Poslední použitý interval
+        self._min_interval = None  # Meze adaptivního pollingu (timedelta), None = pevný interval
+        self._max_interval = None
+        self._quiet_polls = 0  # Počet po sobě jdoucích čtení bez aktivity (nebo offline)
+        self._poll_decision = None  # Poslední rozhodnutí o intervalu (viz poll_decision)
+        self._cloud_status = None  # Stav circuit breakerů cloudu při poslední notifikaci (viz cloud_status)
+        self._metrics_published = None  # Zobrazované metriky cloudu při poslední notifikaci (viz cloud_metrics)
+        self._palette = None  # TzlPalette aktuálních tzlColors (viz palette)
+        self._palette_source = None  # Seznam tzlColors, ze kterého byla paleta naposledy ověřena
+        self._energy = SpaEnergyIntegrator(clock=self._clock.monotonic)  # Odhad spotřeby komponent (viz energy)
+        self._energy_store = energy_store  # Store pro checkpoint akumulátorů energie
+        self._energy_save_pending = False  # Zápis checkpointu je naplánován
+        self._statistics = None  # SpaStatisticsCollector, pokud je zapnut import statistik
+        self._energy_notified_at = None  # Monotónní čas poslední notifikace "energy"
+        self._leases = 0  # Počet právě držených command_lease
+        self._resume_after_lease = False  # Obnovit polling po uvolnění posledního lease
+        self._refresh_after_lease = False  # Načíst data po uvolnění posledního lease
+        self._notify_dispatched = 0  # Počet odeslaných notifikací (zapsaný stav entity)
+        self._notify_skipped = 0  # Počet přeskočených notifikací (beze změny dat entity)
 
-    async def update(self):
-        """Aktualizace dat z webového dotazu."""
-        self._data = await self._client.getSpa()
+    async def update(self, notify_all=False):
+        """Aktualizace dat z webového dotazu.
+
+        Odběratelé jsou notifikováni jen pokud se změnila část dat, na které závisí
+        (viz SpaSubscriberMixin._spa_dependencies). notify_all vynutí notifikaci všech.
+        """
+        new_data = await self._client.getSpa()
+        if new_data is None and self._energy.reset_clock():
+            # Cloud neodpověděl (i otevřený breaker) - výpadek se nezapočítá jako jeden interval
+            self._schedule_energy_save()
+        cloud_changed = set()
+        if self._check_cloud_status():
+            cloud_changed.add("cloudStatus")
+        if self._check_cloud_metrics():
+            cloud_changed.add("cloudMetrics")
+        if new_data is None and self._from_snapshot:
+            # Cloud zatím nedostupný - ponechat stav ze snapshotu
+            _LOGGER.warning("Spa state refresh failed, keeping state restored from snapshot")
+            if cloud_changed:
+                await self._notify_subscribers(cloud_changed)
+            return
+        changed = None if notify_all else self._diff_state(self._data, new_data)
+        if changed is not None:
+            changed |= cloud_changed
+            if self._from_snapshot:
+                changed.add("fromSnapshot")
+        self._data = new_data
+        self._from_snapshot = False
         _LOGGER.debug("Shared data updated: %s", self._data)
-        await self._notify_subscribers()  # Notifikace odběratelů
+        if self._decide_poll_interval(new_data) and changed is not None:
+            changed.add("pollDecision")
+        if new_data is not None and self._energy.observe(new_data):
+            self._schedule_energy_save()
+            if changed is not None and self._energy_state_due():
+                changed.add("energy")
+        if new_data is not None and self._statistics is not None:
+            self._statistics.observe(new_data, self._clock.utcnow())
+        if new_data is not None and (changed is None or changed - _SNAPSHOT_VOLATILE):
+            self._schedule_snapshot_save(new_data)
+        await self._notify_subscribers(changed)  # Notifikace odběratelů
+
+    async def async_restore_snapshot(self):
+        """Načte poslední uložený stav; vrací True, pokud byl obnoven."""
+        if self._snapshot_store is None:
+            return False
+        try:
+            snapshot = await self._snapshot_store.async_load()
+        except Exception as e:
+            _LOGGER.warning("Failed to load spa snapshot: %s", e)
+            return False
+        if not snapshot or not isinstance(snapshot.get("state"), dict):
+            return False
+        self._data = SpaState.from_dict(snapshot["state"])
+        self._from_snapshot = True
+        _LOGGER.debug("Spa state restored from snapshot saved at %s", snapshot.get("saved_at"))
+        return True
+
+    def _snapshot_data(self):
+        self._snapshot_save_pending = False
+        # Indexy a odvozené hodnoty se při načtení sestaví znovu, neukládají se
+        return {"saved_at": self._clock.utcnow().isoformat(), "state": self._snapshot_state.to_dict()}
 
-    def start_periodic_update(self, interval):
-        """Spustí pravidelnou aktualizaci dat."""
+    def _schedule_snapshot_save(self, state):
+        # Jako u checkpointu energie: ukládá se poslední stav, zápis se neodkládá každou změnou
+        if self._snapshot_store is None:
+            return
+        self._snapshot_state = state
+        if self._snapshot_save_pending:
+            return
+        self._snapshot_save_pending = True
+        self._snapshot_store.async_delay_save(self._snapshot_data, _SNAPSHOT_SAVE_DELAY)
+
+    async def async_restore_energy(self):
+        """Načte uložený checkpoint akumulátorů energie."""
+        if self._energy_store is None:
+            return
+        try:
+            checkpoint = await self._energy_store.async_load()
+        except Exception as e:
+            _LOGGER.warning("Failed to load energy checkpoint: %s", e)
+            return
+        if checkpoint:
+            self._energy.restore_checkpoint(checkpoint.get("channels"))
+            _LOGGER.debug("Energy checkpoint restored from %s", checkpoint.get("saved_at"))
+
+    def enable_statistics(self):
+        """Zapne výpočet hodinových statistik; senzory se registrují přes statistics."""
+        if self._statistics is None:
+            self._statistics = SpaStatisticsCollector(self._hass, self._energy)
+        return self._statistics
+
+    def _energy_state_due(self):
+        # Bez importu statistik se stav zapisuje při každé změně, jinak jen občas -
+        # historii pro Energy Dashboard dodávají hodinové statistiky
+        if self._statistics is None:
+            return True
+        now = self._clock.monotonic()
+        if self._energy_notified_at is not None and now - self._energy_notified_at < _STATISTICS_ENERGY_STATE_INTERVAL:
+            return False
+        self._energy_notified_at = now
+        return True
+
+    def _energy_checkpoint_data(self):
+        self._energy_save_pending = False
+        return {"saved_at": self._clock.utcnow().isoformat(), "channels": self._energy.checkpoint()}
+
+    def _schedule_energy_save(self):
+        # Opakované async_delay_save by zápis stále odkládalo - naplánovat jen pokud žádný nečeká;
+        # data se sestaví až při zápisu. Při ukončení HA Store čekající zápis provede sám.
+        if self._energy_store is None or self._energy_save_pending:
+            return
+        self._energy_save_pending = True
+        self._energy_store.async_delay_save(self._energy_checkpoint_data, _ENERGY_SAVE_INTERVAL)
+
+    async def async_save_energy(self):
+        """Okamžitě uloží checkpoint energie (při odebrání/reloadu integrace)."""
+        if self._energy_store is not None:
+            await self._energy_store.async_save(self._energy_checkpoint_data())
+
+    @staticmethod
+    def _diff_state(old, new):
+        """Vrátí množinu změněných částí stavu, nebo None pokud se má notifikovat vše.
+
+        Části jsou klíče nejvyšší úrovně (např. "currentTemp", "c8zCurrentState"),
+        ("component", componentType, port) pro komponenty a ("tzlZone", zoneId) pro zóny.
+        Při jakékoliv změně komponent/zón se přidá i souhrnný klíč "components"/"tzlZones".
+        """
+        if not old or not new:
+            return None
+        if any(_differs(old.get(key), new.get(key)) for key in _GLOBAL_KEYS):
+            return None
+
+        changed = set()
+        for key in old.keys() | new.keys():
+            if key not in _SLICED_KEYS and _differs(old.get(key), new.get(key)):
+                changed.add(key)
+
+        # Nezměněné komponenty a zóny sdílí nový stav s předchozím (stačí porovnat identitu)
+        old_components = old.get("componentIndex") or {}
+        new_components = new.get("componentIndex") or {}
+        if old_components is not new_components:
+            for comp_key in old_components.keys() | new_components.keys():
+                if _differs(old_components.get(comp_key), new_components.get(comp_key)):
+                    changed.add(("component", *comp_key))
+                    changed.add("components")
+
+        old_zones = old.get("tzlZoneIndex") or {}
+        new_zones = new.get("tzlZoneIndex") or {}
+        if old_zones is not new_zones:
+            for zone_id in old_zones.keys() | new_zones.keys():
+                if _differs(old_zones.get(zone_id), new_zones.get(zone_id)):
+                    changed.add(("tzlZone", zone_id))
+                    changed.add("tzlZones")
+
+        return changed
+
+    def start_periodic_update(self, interval, min_interval=None, max_interval=None):
+        """Spustí pravidelnou aktualizaci dat.
+
+        Se zadanými mezemi min_interval/max_interval je interval adaptivní: zkracuje se
+        při aktivitě vany nebo čekání na potvrzení příkazu a prodlužuje v klidu či offline.
+        """
         self._last_interval = interval
+        if min_interval is not None and max_interval is not None:
+            self._min_interval = min(min_interval, max_interval)
+            self._max_interval = max(min_interval, max_interval)
         self._is_updating = True
-        self._update_interval = async_track_time_interval(self._hass, self._periodic_update, interval)
+        if self._min_interval is None:
+            self._update_interval = self._clock.track_time_interval(self._hass, self._periodic_update, interval)
+        else:
+            self._schedule_adaptive_update()
 
     def pause_updates(self):
-        """Pozastaví pravidelnou aktualizaci dat."""
+        """Pozastaví pravidelnou aktualizaci dat (entity místo toho používají command_lease)."""
+        self._resume_after_lease = False  # Explicitní pozastavení má přednost před lease
+        if not self._is_updating:
+            return False
         if self._update_interval is not None:
             self._update_interval()  # Zrušení intervalu
             self._update_interval = None
-            self._is_updating = False
-            _LOGGER.debug("Periodic updates paused")
-            return True
-        return False
+        self._is_updating = False
+        _LOGGER.debug("Periodic updates paused")
+        return True
 
     def resume_updates(self):
         """Obnoví pravidelnou aktualizaci dat."""
@@ -44,6 +281,36 @@ class SpaData:
             return True
         return False
 
+    @asynccontextmanager
+    async def command_lease(self, refresh=False):
+        """Pozastaví pravidelné čtení po dobu příkazu.
+
+        Lease lze držet souběžně z více entit; polling se obnoví jednou, až po
+        uvolnění posledního. S refresh=True se tehdy data nejdřív načtou znovu.
+        """
+        self._leases += 1
+        if self._leases == 1:
+            self._resume_after_lease = self.pause_updates()
+        self._refresh_after_lease = self._refresh_after_lease or refresh
+        try:
+            yield self
+        finally:
+            self._leases -= 1
+            if self._leases == 0:
+                refresh_now, self._refresh_after_lease = self._refresh_after_lease, False
+                try:
+                    if refresh_now:
+                        await self.async_force_update()
+                finally:
+                    if self._resume_after_lease:
+                        self._resume_after_lease = False
+                        self.resume_updates()
+
+    @property
+    def command_leases(self):
+        """Počet právě probíhajících příkazů (držených lease)."""
+        return self._leases
+
     @property
     def is_updating(self):
         """Vrací informaci, zda probíhá pravidelná aktualizace."""
@@ -53,10 +320,61 @@ class SpaData:
         """Interní metoda pro pravidelnou aktualizaci."""
         await self.update()
 
+    def _schedule_adaptive_update(self):
+        decision = self._poll_decision
+        delay = decision["interval"] if decision else self._clamp_interval(self._last_interval.total_seconds())
+        self._update_interval = self._clock.call_later(self._hass, delay, self._adaptive_update)
+
+    async def _adaptive_update(self, _):
+        self._update_interval = None
+        try:
+            await self.update()
+        finally:
+            # Během čtení mohly být aktualizace pozastaveny (příkaz) - pak neplánovat
+            if self._is_updating and self._update_interval is None:
+                self._schedule_adaptive_update()
+
+    def _clamp_interval(self, seconds):
+        if self._min_interval is None:
+            return seconds
+        return max(self._min_interval.total_seconds(), min(self._max_interval.total_seconds(), seconds))
+
+    def _decide_poll_interval(self, data):
+        """Určí interval dalšího čtení podle stavu vany; vrací True, pokud se rozhodnutí změnilo."""
+        if self._last_interval is None:
+            return False
+        base = self._clamp_interval(self._last_interval.total_seconds())
+        if self._min_interval is None:
+            interval, reason = base, "fixed"
+        elif self._client.hasPendingCommands():
+            # Příkaz bez command_lease (climate, tlačítka, služby) - polling běží dál
+            self._quiet_polls = 0
+            interval, reason = self._min_interval.total_seconds(), "command_pending"
+        elif not data or not data.get("isOnline", False):
+            self._quiet_polls += 1
+            steps = min(self._quiet_polls, _MAX_BACKOFF_STEPS)
+            interval = self._clamp_interval(base * _OFFLINE_BACKOFF_FACTOR ** steps)
+            reason = "offline" if data else "unavailable"
+        elif _is_spa_active(data):
+            self._quiet_polls = 0
+            interval, reason = self._min_interval.total_seconds(), "active"
+        else:
+            self._quiet_polls += 1
+            steps = min(max(0, self._quiet_polls - _IDLE_POLLS_BEFORE_BACKOFF), _MAX_BACKOFF_STEPS)
+            interval, reason = self._clamp_interval(base * _IDLE_BACKOFF_FACTOR ** steps), "idle"
+
+        previous = self._poll_decision
+        self._poll_decision = {"interval": round(interval, 1), "reason": reason, "quiet_polls": self._quiet_polls}
+        if previous is None or previous["interval"] != self._poll_decision["interval"] or previous["reason"] != reason:
+            _LOGGER.debug("Next spa poll in %.0f s (%s)", interval, reason)
+            return True
+        return False
+
     def register_subscriber(self, subscriber):
         """Registrace odběratele."""
         if subscriber not in self._subscribers:
             self._subscribers.append(subscriber)
+            self._sync_handlers[id(subscriber)] = _sync_handler(subscriber)
 
     def unregister_subscriber(self, subscriber):
         """Odregistrace odběratele."""
@@ -64,26 +382,145 @@ class SpaData:
             self._subscribers.remove(subscriber)
         except ValueError:
             pass
+        self._sync_handlers.pop(id(subscriber), None)
 
     def clear_subscribers(self):
         """Odstraní všechny odběratele."""
         self._subscribers.clear()
+        self._sync_handlers.clear()
+
+    async def _notify_subscribers(self, changed=None):
+        """Notifikace odběratelů, jejichž data se změnila (changed=None znamená všech).
 
-    async def _notify_subscribers(self):
-        """Notifikace všech odběratelů."""
+        Synchronní handle_spa_state se volají v jednom průchodu, asynchronní async_update
+        po nich; stav entit s příznakem _spa_dirty se pak zapíše jednou dávkou - nejvýše
+        jednou za aktualizaci. handle_spa_state vracející False stav nemění.
+        """
+        state = self._data
+        updated = []
+        legacy = []
         for subscriber in self._subscribers:
+            if getattr(subscriber, "hass", None) is None:
+                _LOGGER.debug("Skipping subscriber %s - hass not available", subscriber)
+                continue
+            dependencies = getattr(subscriber, "_spa_dependencies", None)
+            if changed is not None and dependencies is not None and changed.isdisjoint(dependencies):
+                self._notify_skipped += 1
+                continue
+            handler = self._sync_handlers.get(id(subscriber))
+            if handler is None:
+                legacy.append(subscriber)
+                continue
             try:
-                if hasattr(subscriber, 'hass') and subscriber.hass is not None:
-                    await subscriber.async_update()
-                    subscriber.async_write_ha_state()  # zajisti ulozeni hodnoty do HA
-                else:
-                    _LOGGER.debug("Skipping subscriber %s - hass not available", subscriber)
+                if handler(state) is False:
+                    self._notify_skipped += 1
+                    continue
             except Exception as e:
                 _LOGGER.error("Error notifying subscriber %s: %s", subscriber, e)
+                continue
+            subscriber._spa_dirty = True
+            updated.append(subscriber)
+
+        for subscriber in legacy:
+            try:
+                await subscriber.async_update()
+            except Exception as e:
+                _LOGGER.error("Error notifying subscriber %s: %s", subscriber, e)
+                continue
+            subscriber._spa_dirty = True
+            updated.append(subscriber)
+
+        for subscriber in updated:
+            if not subscriber._spa_dirty:
+                continue  # Už zapsáno (odběratel je v seznamu jen jednou, pojistka)
+            subscriber._spa_dirty = False
+            try:
+                subscriber.async_write_ha_state()  # zajisti ulozeni hodnoty do HA
+                self._notify_dispatched += 1
+            except Exception as e:
+                _LOGGER.error("Error writing state of subscriber %s: %s", subscriber, e)
 
     async def async_force_update(self):
-        """Vynutí okamžitou aktualizaci dat."""
-        await self.update()
+        """Vynutí okamžitou aktualizaci dat a notifikaci všech odběratelů.
+
+        Volá se po příkazech, kdy entity mohly nastavit optimistický stav,
+        který je potřeba srovnat s daty z cloudu i bez změny dat.
+        """
+        await self.update(notify_all=True)
+
+    @property
+    def notification_stats(self):
+        """Počty odeslaných a přeskočených notifikací odběratelů (diagnostika)."""
+        return {
+            "dispatched": self._notify_dispatched,
+            "skipped": self._notify_skipped,
+        }
+
+    @property
+    def palette(self):
+        """TzlPalette pro aktuální tzlColors; sestaví se znovu jen při změně palety."""
+        colors = (self._data or {}).get("tzlColors") or []
+        if colors is not self._palette_source:
+            self._palette_source = colors
+            if self._palette is None or self._palette.fingerprint != palette_fingerprint(colors):
+                self._palette = TzlPalette(colors)
+        return self._palette
+
+    @property
+    def clock(self):
+        """Zdroj času (SpaClock); entity ho používají místo přímého čtení času."""
+        return self._clock
+
+    @property
+    def energy(self):
+        """Sdílený integrátor spotřeby (SpaEnergyIntegrator)."""
+        return self._energy
+
+    @property
+    def statistics(self):
+        """SpaStatisticsCollector, nebo None pokud import statistik není zapnut."""
+        return self._statistics
+
+    @property
+    def poll_decision(self):
+        """Poslední rozhodnutí plánovače: interval (s), důvod a počet klidových čtení."""
+        return self._poll_decision
+
+    def _check_cloud_status(self):
+        """Převezme stav circuit breakerů klienta; vrací True, pokud se změnil."""
+        status = self._client.cloudStatus()
+        # Porovnávají se jen stavy a počty selhání (ne odpočet do dalšího pokusu)
+        key = {name: (endpoint["state"], endpoint["failures"]) for name, endpoint in status["endpoints"].items()}
+        previous, self._cloud_status = self._cloud_status, (key, status)
+        return previous is None or previous[0] != key
+
+    def _check_cloud_metrics(self):
+        """Vrací True, pokud se od poslední notifikace změnila hodnota zobrazovaná senzory metrik."""
+        published = self._client.metrics.published()
+        previous, self._metrics_published = self._metrics_published, published
+        return previous != published
+
+    @property
+    def cloud_metrics(self):
+        """Registr metrik volání cloudu klienta (latence, statusy, timeouty podle endpointu)."""
+        return self._client.metrics
+
+    @property
+    def cloud_status(self):
+        """Stav circuit breakerů cloudu: souhrnný state a stav jednotlivých endpointů."""
+        return self._cloud_status[1] if self._cloud_status else None
+
+    @property
+    def poll_bounds(self):
+        """Meze adaptivního intervalu v sekundách, nebo None při pevném intervalu."""
+        if self._min_interval is None:
+            return None
+        return (self._min_interval.total_seconds(), self._max_interval.total_seconds())
+
+    @property
+    def is_from_snapshot(self):
+        """True, dokud data pochází z uloženého snapshotu a ne z cloudu."""
+        return self._from_snapshot
 
     @property
     def data(self):
@@ -1,11 +1,20 @@
 import logging
 import voluptuous as vol
 from datetime import timedelta
-from .const import DOMAIN, TEST_SPAOWNER
+from .const import (
+    DOMAIN,
+    TEST_SPAOWNER,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_STORAGE_VERSION,
+    ENERGY_STORAGE_KEY,
+    ENERGY_STORAGE_VERSION,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.service import async_register_admin_service
-from .ControlMySpa import ControlMySpa
+from .account import async_acquire_client, async_release_client
 from .SpaData import SpaData  
 from homeassistant.const import Platform
 from .services import async_setup_services, async_unload_services
@@ -56,47 +65,92 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         _LOGGER.error("spa_id is not set")
         return False
 
-    spa_client = ControlMySpa(username, password)
-    spa_client.spaId = spa_id
-    await spa_client.init()
-
-    # Inicializace SpaData
-    balboa_data = SpaData(spa_client, hass)
-    await balboa_data.update()  # První aktualizace dat
-    balboa_data.start_periodic_update(timedelta(minutes=minUpdate))  # Pravidelná aktualizace
+    # Klient nad sdíleným účtem - více spa stejného účtu používá jedno spojení a token;
+    # uložený platný token a profil přeskočí login i getWhoAmI
+    spa_client = await async_acquire_client(hass, username, password, spa_id)
+
+    balboa_data = None
+    try:
+        # Inicializace SpaData
+        balboa_data = SpaData(spa_client, hass, _snapshot_store(hass, config_entry), _energy_store(hass, config_entry))
+        await balboa_data.async_restore_energy()  # Akumulátory energie před vytvořením senzorů
+        options = config_entry.options or {}
+        if options.get("import_long_term_statistics", False):
+            balboa_data.enable_statistics()  # Hodinové statistiky energie a teploty do recorderu
+
+        # Spojení se otevře hned - entity i polling mohou volat cloud dřív, než doběhne init()
+        await spa_client.init_session()
+
+        # Rychlý start: entity se vytvoří z posledního uloženého stavu a cloud se načte na pozadí.
+        # Vyžaduje i uložený profil uživatele (platformy bez userInfo entity nevytvoří).
+        warm_start = bool(spa_client.userInfo) and await balboa_data.async_restore_snapshot()
+        if not warm_start:
+            await spa_client.init()
+            await balboa_data.update()  # První aktualizace dat
+            if not balboa_data.data:
+                raise ConfigEntryNotReady("ControlMySpa cloud unavailable and no cached spa state")
+
+        # Pravidelná aktualizace - pevný interval z nastavení, nebo (adaptive_polling) interval
+        # přizpůsobený aktivitě vany v mezích z options
+        if options.get("adaptive_polling", False):
+            balboa_data.start_periodic_update(
+                timedelta(minutes=minUpdate),
+                timedelta(seconds=options.get("min_poll_interval_seconds", 30)),
+                timedelta(seconds=options.get("max_poll_interval_seconds", 900)),
+            )
+        else:
+            balboa_data.start_periodic_update(timedelta(minutes=minUpdate))
+
+        _LOGGER.info("ControlMySpa INIT async_setup_entry. Interval:%s, SpaId:%s, WarmStart:%s", minUpdate, spa_id, warm_start)
+
+        serial_number = spa_id if TEST_SPAOWNER else (balboa_data.data.get("serialNumber") if balboa_data and balboa_data.data else "unknown")
+        sw_version = balboa_data.data.get("controllerSoftwareVersion") if balboa_data and balboa_data.data else "unknown"
+        unique_id_suffix = await get_unique_id_suffix(hass, config_entry, serial_number)
+
+        device_info = {
+            "identifiers": {(DOMAIN, serial_number)},  # Unikátní identifikátor zařízení
+            "name": "Spa",
+            "manufacturer": "Balboa",
+            "model": "Spa Model Unknown",
+            "sw_version": sw_version,
+            "serial_number": serial_number,
+        }
+
+        hass.data.setdefault(DOMAIN, {})
+        hass.data[DOMAIN][config_entry.entry_id] = {
+            "client": spa_client,
+            "data": balboa_data,
+            "device_info": device_info,
+            "serial_number": serial_number,
+            "unique_id_suffix": unique_id_suffix,
+            "config_entry": config_entry
+        }
+
+        await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+
+        if warm_start:
+            config_entry.async_create_background_task(
+                hass, _async_initial_refresh(spa_client, balboa_data), f"{DOMAIN} initial refresh {spa_id}"
+            )
+        return True
+    except BaseException:
+        # Klient drží referenci na sdílený účet a spojení - při selhání setupu (i opakovaném) ji uvolnit
+        if balboa_data is not None:
+            balboa_data.pause_updates()
+        hass.data.get(DOMAIN, {}).pop(config_entry.entry_id, None)
+        await async_release_client(hass, spa_client)
+        raise
 
-    _LOGGER.info("ControlMySpa INIT async_setup_entry. Interval:%s, SpaId:%s", minUpdate, spa_id)
+def _snapshot_store(hass: HomeAssistant, config_entry: ConfigEntry) -> Store:
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{SNAPSHOT_STORAGE_KEY}.{config_entry.entry_id}")
 
-    if not balboa_data.data:
-        _LOGGER.error("Failed to initialize ControlMySpa client, no data")
-        balboa_data.pause_updates()
-        return False
+def _energy_store(hass: HomeAssistant, config_entry: ConfigEntry) -> Store:
+    return Store(hass, ENERGY_STORAGE_VERSION, f"{ENERGY_STORAGE_KEY}.{config_entry.entry_id}")
 
-    serial_number = spa_id if TEST_SPAOWNER else (balboa_data.data.get("serialNumber") if balboa_data and balboa_data.data else "unknown")
-    sw_version = balboa_data.data.get("controllerSoftwareVersion") if balboa_data and balboa_data.data else "unknown"
-    unique_id_suffix = await get_unique_id_suffix(hass, config_entry, serial_number)
-
-    device_info = {
-        "identifiers": {(DOMAIN, serial_number)},  # Unikátní identifikátor zařízení
-        "name": "Spa",
-        "manufacturer": "Balboa",
-        "model": "Spa Model Unknown",
-        "sw_version": sw_version,
-        "serial_number": serial_number,
-    }
-
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][config_entry.entry_id] = {
-        "client": spa_client,
-        "data": balboa_data,
-        "device_info": device_info,
-        "serial_number": serial_number,
-        "unique_id_suffix": unique_id_suffix,
-        "config_entry": config_entry
-    }
-
-    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
-    return True
+async def _async_initial_refresh(spa_client, balboa_data):
+    """Po rychlém startu ze snapshotu načte aktuální stav z cloudu."""
+    await spa_client.init()
+    await balboa_data.async_force_update()
 
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     # Odebrání služeb
@@ -108,9 +162,17 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         if balboa_data:
             balboa_data.pause_updates()
             balboa_data.clear_subscribers()
+            await balboa_data.async_save_energy()
 
     # Odregistrovat platformy
     if unload_ok := await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS):
         hass.data[DOMAIN].pop(config_entry.entry_id, None)
+        if entry_data:
+            await async_release_client(hass, entry_data["client"])
+
+    return unload_ok
 
-    return unload_ok
\ No newline at end of file
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry):
+    """Smazání uloženého snapshotu a checkpointu energie při odebrání integrace."""
+    await _snapshot_store(hass, config_entry).async_remove()
+    await _energy_store(hass, config_entry).async_remove()
@@ -0,0 +1,87 @@
+"""Registr účtů ControlMySpa sdílených mezi config entries.
+
+Všechna spa jednoho účtu používají společný SpaAccount - jeden pool spojení
+a jeden token. Registr počítá reference a spojení zavře po uvolnění
+posledního klienta. Token a profil uživatele se ukládají do úložiště HA,
+takže po restartu se dokud token platí nevolá login ani profil.
+"""
+
+import logging
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from .ControlMySpa import ControlMySpa, SpaAccount
+from .const import ACCOUNTS_DATA_KEY, ACCOUNTS_STORAGE_KEY, ACCOUNTS_STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+# Prodleva (s) pro sloučení více změn tokenu/profilu do jednoho zápisu
+_SAVE_DELAY = 10
+
+
+def _account_key(username: str, password: str):
+    return (username.strip().casefold(), password)
+
+
+def _storage_key(username: str) -> str:
+    # Heslo se do úložiště neukládá, záznam je klíčovaný jen e-mailem
+    return username.strip().casefold()
+
+
+async def _async_get_registry(hass: HomeAssistant) -> dict:
+    registry = hass.data.get(ACCOUNTS_DATA_KEY)
+    if registry is None:
+        store = Store(hass, ACCOUNTS_STORAGE_VERSION, ACCOUNTS_STORAGE_KEY, private=True)
+        stored = await store.async_load() or {}
+        registry = hass.data.setdefault(ACCOUNTS_DATA_KEY, {
+            "accounts": {},
+            "store": store,
+            "stored": stored.get("accounts", {}),
+        })
+    return registry
+
+
+def _persist_account(registry: dict, account: SpaAccount) -> None:
+    registry["stored"][_storage_key(account.email)] = {
+        "token_data": account.tokenData,
+        "user_info": account.userInfo,
+    }
+    registry["store"].async_delay_save(lambda: {"accounts": registry["stored"]}, _SAVE_DELAY)
+
+
+async def async_acquire_client(hass: HomeAssistant, username: str, password: str, spa_id) -> ControlMySpa:
+    """Vytvoří klienta pro spa_id nad sdíleným účtem (a účet založí, pokud ještě neexistuje)."""
+    registry = await _async_get_registry(hass)
+    accounts = registry["accounts"]
+    key = _account_key(username, password)
+    entry = accounts.get(key)
+    if entry is None:
+        account = SpaAccount(username, password)
+        stored = registry["stored"].get(_storage_key(username))
+        if stored:
+            account.restore(stored.get("token_data"), stored.get("user_info"))
+            _LOGGER.debug("Account %s restored, token valid for %.0f s", username, account.token_valid_seconds())
+        account.listener = lambda changed: _persist_account(registry, changed)
+        entry = accounts[key] = {"account": account, "refcount": 0}
+    entry["refcount"] += 1
+    _LOGGER.debug("Account %s acquired, %s client(s)", username, entry["refcount"])
+
+    client = ControlMySpa(username, password, account=entry["account"])
+    client.spaId = spa_id
+    return client
+
+
+async def async_release_client(hass: HomeAssistant, client: ControlMySpa) -> None:
+    """Uvolní klienta; po posledním klientovi účtu zavře sdílené spojení."""
+    registry = hass.data.get(ACCOUNTS_DATA_KEY)
+    if registry is None:
+        return
+    accounts = registry["accounts"]
+    for key, entry in list(accounts.items()):
+        if entry["account"] is not client.account:
+            continue
+        entry["refcount"] -= 1
+        if entry["refcount"] <= 0:
+            accounts.pop(key, None)
+            await entry["account"].close()
+            _LOGGER.debug("Account %s released, session closed", entry["account"].email)
+        return
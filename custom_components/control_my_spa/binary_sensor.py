@@ -2,7 +2,7 @@ from datetime import timedelta
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.const import UnitOfTemperature
 from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from .const import DOMAIN
 from .entity import SpaSubscriberMixin
 import logging
@@ -39,6 +39,7 @@ class SpaIsOnlineSensor(SpaBinarySensorBase):
 
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"isOnline"}
         self._attr_should_poll = False
         self._attr_device_info = device_info
         self._attr_unique_id = f'binary_sensor.isonline{unique_id_suffix}'
@@ -53,8 +54,9 @@ class SpaIsOnlineSensor(SpaBinarySensorBase):
         else:
             return "mdi:led-off"
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             self._attr_is_on = data.get("isOnline")
             _LOGGER.debug("Updated isOnline %s", data.get("isOnline"))
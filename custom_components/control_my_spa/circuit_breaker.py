@@ -0,0 +1,136 @@
+"""Circuit breaker volání ControlMySpa cloudu (po jednom pro každý endpoint)."""
+
+import logging
+import random
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+# Pořadí stavů od nejhoršího (souhrnný stav více breakerů)
+STATE_SEVERITY = (STATE_OPEN, STATE_HALF_OPEN, STATE_CLOSED)
+
+
+def is_failure_status(status):
+    """HTTP status, který znamená výpadek cloudu (5xx, 429), ne chybu požadavku."""
+    return status >= 500 or status == 429
+
+
+class CircuitBreaker:
+    """Breaker jednoho endpointu: closed -> open -> half_open -> closed.
+
+    Po failure_threshold po sobě jdoucích selháních se otevře a volání se neprovádí.
+    Doba otevření roste exponenciálně s počtem neúspěšných pokusů (base_backoff * 2^n,
+    nejvýše max_backoff) a je náhodně zkrácena (jitter), aby se klienti nepotkávali.
+    Po jejím uplynutí propustí jediný zkušební dotaz (half_open); jeho úspěch breaker
+    zavře, selhání ho znovu otevře s delší prodlevou.
+    """
+
+    def __init__(self, name, failure_threshold=3, base_backoff=30.0, max_backoff=900.0,
+                 probe_timeout=60.0, clock=time.monotonic, jitter=random.random):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._probe_timeout = probe_timeout  # Zkušební dotaz, který nedoběhl, se po této době nahradí
+        self._clock = clock
+        self._jitter = jitter
+        self._state = STATE_CLOSED
+        self._failures = 0  # Po sobě jdoucí selhání
+        self._trips = 0  # Po sobě jdoucí otevření (exponent prodlevy)
+        self._retry_at = None  # Monotónní čas, od kdy je povolen zkušební dotaz
+        self._probe_started = None
+
+    @property
+    def state(self):
+        return self._state
+
+    def is_open(self):
+        """True, pokud breaker volání odmítá (neověřuje ani nespotřebuje zkušební dotaz)."""
+        if self._state == STATE_OPEN:
+            return self._clock() < self._retry_at
+        if self._state == STATE_HALF_OPEN:
+            return self._clock() - self._probe_started < self._probe_timeout
+        return False
+
+    def allow(self):
+        """Smí se volání provést? V half_open propustí jen jeden zkušební dotaz."""
+        if self._state == STATE_CLOSED:
+            return True
+        if self.is_open():
+            return False
+        self._state = STATE_HALF_OPEN
+        self._probe_started = self._clock()
+        return True
+
+    def retry_in(self):
+        """Sekundy do dalšího povoleného pokusu (0, pokud breaker volání propouští)."""
+        if self._state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._retry_at - self._clock())
+
+    def record_success(self):
+        if self._state != STATE_CLOSED:
+            _LOGGER.info("ControlMySpa %s reachable again, circuit closed", self.name)
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._trips = 0
+        self._retry_at = None
+        self._probe_started = None
+
+    def record_failure(self):
+        self._failures += 1
+        if self._state == STATE_HALF_OPEN or self._failures >= self._failure_threshold:
+            self._open()
+
+    def record_status(self, status):
+        """Započítá HTTP odpověď (výpadek cloudu jako selhání, ostatní jako úspěch)."""
+        if is_failure_status(status):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def _open(self):
+        backoff = min(self._max_backoff, self._base_backoff * 2 ** self._trips)
+        backoff *= 0.5 + self._jitter() / 2  # Jitter: 50-100 % prodlevy
+        if self._state == STATE_CLOSED:
+            _LOGGER.warning("ControlMySpa %s failing (%s errors), pausing requests for %.0f s",
+                            self.name, self._failures, backoff)
+        else:
+            _LOGGER.debug("ControlMySpa %s probe failed, next attempt in %.0f s", self.name, backoff)
+        self._state = STATE_OPEN
+        self._trips += 1
+        self._retry_at = self._clock() + backoff
+        self._probe_started = None
+
+    def as_dict(self):
+        """Stav pro diagnostiku."""
+        return {
+            "state": self._state,
+            "failures": self._failures,
+            "retry_in": round(self.retry_in(), 1),
+        }
+
+
+class CircuitBreakerRegistry:
+    """Breakery podle názvu endpointu (vytváří se při prvním použití)."""
+
+    def __init__(self, **options):
+        self._options = options
+        self._breakers = {}
+
+    def get(self, name):
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name, **self._options)
+        return breaker
+
+    def state(self):
+        """Souhrnný (nejhorší) stav všech breakerů."""
+        states = {breaker.state for breaker in self._breakers.values()}
+        return next((state for state in STATE_SEVERITY if state in states), STATE_CLOSED)
+
+    def as_dict(self):
+        return {name: breaker.as_dict() for name, breaker in self._breakers.items()}
@@ -4,6 +4,7 @@ from homeassistant.components.climate.const import (
     HVACMode
 )
 from homeassistant.const import UnitOfTemperature
+from homeassistant.core import callback
 from .const import DOMAIN
 from .entity import SpaSubscriberMixin
 import logging
@@ -35,6 +36,7 @@ class SpaClimate(SpaSubscriberMixin, ClimateEntity):
 
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"currentTemp", "desiredTemp", "targetDesiredTemp", "celsius"}
         self._attr_device_info = device_info
         self._attr_icon = "mdi:hot-tub"
         self._attr_unique_id = f"climate.spa_thermostat{unique_id_suffix}"
@@ -51,8 +53,9 @@ class SpaClimate(SpaSubscriberMixin, ClimateEntity):
         self._target_temperature = None
         self._desired_temperature = None
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Nastavit jednotku podle data.get("celsius")
             if data.get("celsius"):
@@ -70,7 +73,7 @@ class SpaClimate(SpaSubscriberMixin, ClimateEntity):
             current_f = data.get("currentTemp")
             if current_f is not None and current_f != 0:
                 if data.get("celsius"):
-                    self._current_temperature = round((current_f - 32) * 5.0 / 9.0, 1)
+                    self._current_temperature = data.current_temp_c
                 else:
                     self._current_temperature = current_f
                     
@@ -78,7 +81,7 @@ class SpaClimate(SpaSubscriberMixin, ClimateEntity):
             desired_f = data.get("desiredTemp")
             if desired_f is not None and desired_f != 0:
                 if data.get("celsius"):
-                    self._desired_temperature = round((desired_f - 32) * 5.0 / 9.0, 1)
+                    self._desired_temperature = data.desired_temp_c
                 else:
                     self._desired_temperature = desired_f
                     
@@ -86,14 +89,11 @@ class SpaClimate(SpaSubscriberMixin, ClimateEntity):
             target_f = data.get("targetDesiredTemp")
             if target_f is not None and target_f != 0:
                 if data.get("celsius"):
-                    self._target_temperature = round((target_f - 32) * 5.0 / 9.0, 1)
+                    self._target_temperature = data.target_desired_temp_c
                 else:
                     self._target_temperature = target_f
                     
             _LOGGER.debug("Climate update (%s): current=%s, desired=%s, target=%s", unit_symbol, self._current_temperature, self._desired_temperature, self._target_temperature)
-            
-            # Informovat Home Assistant o změně stavu entity
-            self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
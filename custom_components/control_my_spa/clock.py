@@ -0,0 +1,37 @@
+"""Zdroj času integrace (SpaData, integrace energie, potvrzování příkazů).
+
+Výchozí SYSTEM_CLOCK používá skutečný čas a plánovač Home Assistant. Simulace
+(benchmarks/simulate.py) předá SpaData a ControlMySpa virtuální hodiny se stejnými
+metodami, takže týden provozu proběhne za několik sekund.
+"""
+
+import asyncio
+import time
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+
+class SpaClock:
+    """Skutečný čas Home Assistant."""
+
+    def monotonic(self):
+        """Monotónní čas v sekundách (intervaly, prodlevy)."""
+        return time.monotonic()
+
+    def utcnow(self):
+        """Aktuální čas (UTC datetime) pro časové značky a statistiky."""
+        return dt_util.utcnow()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+    def call_later(self, hass, delay, action):
+        """Jednorázové volání action(now) za delay sekund; vrací funkci pro zrušení."""
+        return async_call_later(hass, delay, action)
+
+    def track_time_interval(self, hass, action, interval):
+        """Opakované volání action(now) s intervalem (timedelta); vrací funkci pro zrušení."""
+        return async_track_time_interval(hass, action, interval)
+
+
+SYSTEM_CLOCK = SpaClock()
@@ -22,6 +22,7 @@ class ControlMySpaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._password = user_input["password"]
             self._update_interval = user_input.get("updateintervalminutes", 1)
 
+            await self._async_close_client()
             self._spa_client = ControlMySpa(self._username, self._password)
 
             await self._spa_client.init_session()
@@ -58,6 +59,7 @@ class ControlMySpaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             # Uložíme vybrané spa ID a vytvoříme konfigurační záznam
+            await self._async_close_client()
             return self.async_create_entry(
                 title="ControlMySpa",
                 data={
@@ -81,6 +83,19 @@ class ControlMySpaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             })
         )
 
+    async def _async_close_client(self):
+        """Zavře spojení klienta použitého při konfiguraci."""
+        if self._spa_client is not None:
+            await self._spa_client.close()
+            self._spa_client = None
+
+    @callback
+    def async_remove(self):
+        """Flow byl zrušen - nenechat otevřené spojení."""
+        if self._spa_client is not None:
+            self.hass.async_create_task(self._spa_client.close())
+            self._spa_client = None
+
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -4,3 +4,13 @@ TEST_MODE = None
 #TEST_MODE = "Data02"
 #TEST_MODE = "Data03"
 TEST_SPAOWNER = False
+# hass.data klíč registru sdílených účtů (mimo hass.data[DOMAIN], které je klíčované entry_id)
+ACCOUNTS_DATA_KEY = f"{DOMAIN}_accounts"
+# Úložiště tokenů a profilů účtů (.storage)
+ACCOUNTS_STORAGE_KEY = f"{DOMAIN}.accounts"
+ACCOUNTS_STORAGE_VERSION = 1
+# Poslední známý stav spa pro rychlý start (.storage, klíč doplněn o entry_id)
+SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshot"
+SNAPSHOT_STORAGE_VERSION = 1
+ENERGY_STORAGE_KEY = f"{DOMAIN}.energy"
+ENERGY_STORAGE_VERSION = 1
@@ -0,0 +1,231 @@
+"""Sdílený integrátor odhadované spotřeby energie komponent vany."""
+
+import time
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Stavy, ve kterých komponenta neodebírá výkon
+IDLE_STATES = frozenset((None, "OFF", "DISABLED"))
+# Ohřev ve stavu WAITING čeká na požadavek teploty, neohřívá
+HEATER_IDLE_STATES = IDLE_STATES | {"WAITING"}
+
+# Výchozí výkony (W) podle typu komponenty - shodné s options_flow
+DEFAULT_POWER_WATTS = {
+    "HEATER": 2800,
+    "PUMP": 2200,
+    "BLOWER": 900,
+    "CIRCULATION_PUMP": 400,
+}
+# Prefix konfiguračního klíče výkonu podle typu komponenty
+_OPTION_PREFIXES = {
+    "HEATER": "heater",
+    "PUMP": "pump",
+    "BLOWER": "blower",
+    "CIRCULATION_PUMP": "circulation_pump",
+}
+# Klíč tabulky výkonu pro všechny ostatní (aktivní) stavy
+ACTIVE_STATE = "*"
+# Stavy vícerychlostních čerpadel s vlastním (volitelným) výkonem
+_SPEED_STATES = ("LOW", "MED")
+# Rozdíl (kWh) pod touto mezí je jen zaokrouhlení stavu entity, ne novější hodnota
+_RESTORE_TOLERANCE_KWH = 0.001
+# Stav kanálu, který ještě nebyl pozorován (interval před prvním pozorováním se nepočítá)
+_UNSEEN = object()
+
+
+def power_option_key(component_type, port, count):
+    """Konfigurační klíč výkonu komponenty, např. pump_2_power_watts."""
+    prefix = _OPTION_PREFIXES[component_type]
+    if port is None or count == 1:
+        return f"{prefix}_1_power_watts"
+    return f"{prefix}_{int(port) + 1}_power_watts"
+
+
+def build_power_table(component_type, port, count, config_options):
+    """Tabulka výkonu podle stavu komponenty z options integrace.
+
+    Klíč ACTIVE_STATE platí pro všechny ostatní aktivní stavy. Čerpadla mohou mít
+    zvlášť výkon pro LOW a MED (pump_N_low_power_watts, pump_N_med_power_watts).
+    """
+    key = power_option_key(component_type, port, count)
+    full_power = config_options.get(key, DEFAULT_POWER_WATTS[component_type])
+    idle_states = HEATER_IDLE_STATES if component_type == "HEATER" else IDLE_STATES
+    table = {state: 0 for state in idle_states}
+    table[ACTIVE_STATE] = full_power
+    if component_type == "PUMP":
+        for state in _SPEED_STATES:
+            speed_power = config_options.get(key.replace("_power_watts", f"_{state.lower()}_power_watts"))
+            if speed_power is not None:
+                table[state] = speed_power
+    return table
+
+
+class SpaEnergyIntegrator:
+    """Integruje spotřebu všech sledovaných komponent najednou.
+
+    Pro každý kanál (componentType, port) si pamatuje stav a monotónní čas
+    posledního pozorování. Při změně stavu mezi dvěma čteními se předpokládá
+    přechod v polovině intervalu, takže chyba odhadu nezávisí systematicky
+    na délce intervalu čtení.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._keys = []  # (componentType, port) kanálů
+        self._tables = []  # Tabulky výkonu (W) podle stavu
+        self._states = []  # Poslední pozorovaný stav
+        self._energy_wh = []  # Akumulovaná energie (Wh)
+        self._restored = []  # Hodnota (kWh) z minulého běhu, o kterou byl akumulátor doplněn
+        self._checkpoint = {}  # (componentType, port) -> kWh z uloženého checkpointu
+        self._positions = {}  # (componentType, port) -> index kanálu
+        self._last_tick = None  # Monotónní čas posledního pozorování
+        self._last_index = None  # componentIndex posledního pozorování (počáteční stav nových kanálů)
+
+    def add_channel(self, component_type, port, power_table):
+        """Zaregistruje kanál (při opakovaném volání jen aktualizuje tabulku výkonu)."""
+        key = (component_type, port)
+        position = self._positions.get(key)
+        if position is not None:
+            self._tables[position] = power_table
+            return
+        self._positions[key] = len(self._keys)
+        self._keys.append(key)
+        self._tables.append(power_table)
+        # Kanál registrovaný po prvním čtení (entity vznikají až po něm) převezme stav
+        # z posledního pozorování, takže se započítá i interval do dalšího čtení
+        if self._last_index is None:
+            self._states.append(_UNSEEN)
+        else:
+            component = self._last_index.get(key)
+            self._states.append(component.get("value") if component else None)
+        restored = self._checkpoint.get(key)
+        self._energy_wh.append(restored * 1000.0 if restored is not None else 0.0)
+        self._restored.append(restored)
+
+    def has_channel(self, component_type, port):
+        return (component_type, port) in self._positions
+
+    @staticmethod
+    def _power(table, state):
+        power = table.get(state)
+        return table[ACTIVE_STATE] if power is None else power
+
+    def observe(self, data, now=None):
+        """Započítá interval od posledního pozorování a převezme nové stavy komponent.
+
+        Vrací True, pokud přibyla energie nebo se změnil stav některého kanálu.
+        """
+        now = self._clock() if now is None else now
+        index = data.get("componentIndex") or {}
+        self._last_index = index
+        previous_tick, self._last_tick = self._last_tick, now
+        elapsed_h = (now - previous_tick) / 3600.0 if previous_tick is not None else 0.0
+        if elapsed_h < 0:
+            elapsed_h = 0.0
+        tables, states, energy = self._tables, self._states, self._energy_wh
+        changed = False
+        # Jeden průchod všemi kanály
+        for position, key in enumerate(self._keys):
+            component = index.get(key)
+            new_state = component.get("value") if component else None
+            old_state = states[position]
+            if old_state is _UNSEEN:
+                states[position] = new_state
+                changed = True
+                continue
+            if elapsed_h:
+                table = tables[position]
+                old_power = self._power(table, old_state)
+                if new_state == old_state:
+                    added = old_power * elapsed_h
+                else:
+                    # Přechod v polovině intervalu
+                    added = (old_power + self._power(table, new_state)) * elapsed_h / 2.0
+                if added:
+                    energy[position] += added
+                    changed = True
+            if new_state != old_state:
+                states[position] = new_state
+                changed = True
+        return changed
+
+    def reset_clock(self, now=None):
+        """Uzavře interval od posledního pozorování a zapomene jeho čas.
+
+        Volá se, když stav nelze přečíst (výpadek cloudu): interval do now se započítá
+        s posledními známými stavy, doba výpadku až do dalšího pozorování se nepočítá.
+        Vrací True, pokud přibyla energie.
+        """
+        now = self._clock() if now is None else now
+        previous_tick, self._last_tick = self._last_tick, None
+        if previous_tick is None or now <= previous_tick:
+            return False
+        elapsed_h = (now - previous_tick) / 3600.0
+        changed = False
+        for position, state in enumerate(self._states):
+            if state is _UNSEEN:
+                continue
+            added = self._power(self._tables[position], state) * elapsed_h
+            if added:
+                self._energy_wh[position] += added
+                changed = True
+        return changed
+
+    def energy_kwh(self, component_type, port):
+        """Akumulovaná energie kanálu v kWh (0.0 pro neznámý kanál)."""
+        position = self._positions.get((component_type, port))
+        return self._energy_wh[position] / 1000.0 if position is not None else 0.0
+
+    def restore_energy_kwh(self, component_type, port, energy_kwh):
+        """Doplní akumulátor o hodnotu z minulého běhu (např. poslední stav entity).
+
+        Hodnota se započítá jen jednou; je-li vyšší než dříve obnovená (checkpoint
+        starší než poslední stav), přičte se jen rozdíl. Vrací True, pokud se akumulátor změnil.
+        """
+        position = self._positions.get((component_type, port))
+        if position is None:
+            return False
+        base = self._restored[position]
+        if base is not None and energy_kwh <= base + _RESTORE_TOLERANCE_KWH:
+            return False
+        self._energy_wh[position] += (energy_kwh - (base or 0.0)) * 1000.0
+        self._restored[position] = energy_kwh
+        return True
+
+    def restore_checkpoint(self, entries):
+        """Převezme uložený checkpoint (viz checkpoint); kanály registrované později ho použijí při add_channel."""
+        for entry in entries or []:
+            try:
+                key = (entry["component_type"], entry["port"])
+                self._checkpoint[key] = float(entry["energy_kwh"])
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.warning("Ignoring invalid energy checkpoint entry: %s", entry)
+        for key, energy_kwh in self._checkpoint.items():
+            position = self._positions.get(key)
+            if position is not None:
+                self.restore_energy_kwh(*key, energy_kwh)
+
+    def checkpoint(self):
+        """Akumulátory všech kanálů pro uložení (i kanálů, které v tomto běhu nejsou registrovány)."""
+        energy = dict(self._checkpoint)
+        for position, key in enumerate(self._keys):
+            energy[key] = self._energy_wh[position] / 1000.0
+        return [
+            {"component_type": component_type, "port": port, "energy_kwh": round(energy_kwh, 6)}
+            for (component_type, port), energy_kwh in energy.items()
+        ]
+
+    def state(self, component_type, port):
+        """Poslední pozorovaný stav kanálu (None, pokud ještě nebyl pozorován)."""
+        position = self._positions.get((component_type, port))
+        if position is None or self._states[position] is _UNSEEN:
+            return None
+        return self._states[position]
+
+    def power_watts(self, component_type, port):
+        """Aktuální odhadovaný příkon kanálu (W)."""
+        position = self._positions.get((component_type, port))
+        if position is None or self._states[position] is _UNSEEN:
+            return 0
+        return self._power(self._tables[position], self._states[position])
@@ -4,6 +4,27 @@
 class SpaSubscriberMixin:
     """Registrace a odregistrace odběru dat ze SpaData."""
 
+    # Části stavu, na kterých entita závisí (viz SpaData._diff_state); entity je nastavují
+    # v __init__. SpaData notifikuje jen entity, jejichž část se změnila, takže entita
+    # beze změny svých dat nepočítá stav ani ho nezapisuje.
+    # None = entita je notifikována při každé aktualizaci.
+    _spa_dependencies = None
+
+    # Synchronní aktualizace ze sdíleného stavu - @callback def handle_spa_state(self, state).
+    # SpaData ji volá pro všechny odběratele v jednom průchodu a stav zapíše až poté.
+    # Entity bez ní (nebo s vlastním async_update) se aktualizují přes await async_update().
+    handle_spa_state = None
+
+    # Entita má neuložený stav - SpaData ho zapíše nejvýše jednou za aktualizaci.
+    # Nastavuje ho SpaData po handle_spa_state/async_update (handle_spa_state může vrátit
+    # False = beze změny); handle_spa_state nemá volat async_write_ha_state sám.
+    _spa_dirty = False
+
+    async def async_update(self):
+        """Aktualizace mimo notifikaci SpaData (např. update_before_add při přidání entity)."""
+        if self.handle_spa_state is not None:
+            self.handle_spa_state(self._shared_data.data)
+
     async def async_will_remove_from_hass(self) -> None:
         """Odregistruje entitu jako odběratele při odebrání z HA."""
         await super().async_will_remove_from_hass()
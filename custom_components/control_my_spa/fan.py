@@ -1,5 +1,6 @@
 from homeassistant.components.fan import FanEntity, FanEntityFeature
 from .const import DOMAIN
+from .helpers import find_component
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -120,10 +121,7 @@ class SpaPumpFan(FanEntity):
         """Získá stav pumpy z dat."""
         if not data:
             return None
-        pump = next(
-            (comp for comp in data["components"] if comp["componentType"] == "PUMP" and comp["port"] == self._pump_data["port"]),
-            None
-        )
+        pump = find_component(data, "PUMP", self._pump_data["port"])
         return pump["value"] if pump else None
 
     async def async_update(self):
@@ -258,88 +256,84 @@ class SpaPumpFan(FanEntity):
 
     async def async_turn_on(self, speed: str = None, percentage: int = None, preset_mode: str = None, **kwargs):
         """Zapnutí fan entity."""
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._pump_data["port"])
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._pump_data["port"])
             
-            # Získat aktuální stav
-            current_state = self._attr_preset_mode or ("LOW" if not self._supports_off else "OFF")
+                # Získat aktuální stav
+                current_state = self._attr_preset_mode or ("LOW" if not self._supports_off else "OFF")
             
-            # Pokud je zadán preset_mode, použít ho
-            if preset_mode:
-                target_state = preset_mode
-            # Pokud není zadán preset_mode, použít chytrou logiku pro další vyšší stav
-            else:
-                target_state = self._get_next_higher_state(current_state)
+                # Pokud je zadán preset_mode, použít ho
+                if preset_mode:
+                    target_state = preset_mode
+                # Pokud není zadán preset_mode, použít chytrou logiku pro další vyšší stav
+                else:
+                    target_state = self._get_next_higher_state(current_state)
             
-            # Odeslání požadavku
-            success = await self._try_set_pump_state(device_number, target_state)
+                # Odeslání požadavku
+                success = await self._try_set_pump_state(device_number, target_state)
             
-            # Aktualizace dat pro ověření stavu
-            await self._shared_data.async_force_update()
+                # Aktualizace dat pro ověření stavu
+                await self._shared_data.async_force_update()
             
-            # Ověření nastavené hodnoty a logování stavu
-            if not success:
-                current_state = self._get_pump_state(self._shared_data.data)
-                if current_state == target_state:
-                    self._attr_preset_mode = target_state
-                    _LOGGER.info(
-                        "Pump %s was set to %s (verified after update)",
-                        self._pump_data["port"],
-                        target_state
-                    )
-                else:
-                    _LOGGER.warning(
-                        "Pump %s was not set. Expected state: %s, Current state: %s",
-                        self._pump_data["port"],
-                        target_state,
-                        current_state
-                    )
-        except ValueError as ve:
-            _LOGGER.error("Invalid port value for pump: %s", self._pump_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error turning on pump (port %s): %s", self._pump_data["port"], str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                # Ověření nastavené hodnoty a logování stavu
+                if not success:
+                    current_state = self._get_pump_state(self._shared_data.data)
+                    if current_state == target_state:
+                        self._attr_preset_mode = target_state
+                        _LOGGER.info(
+                            "Pump %s was set to %s (verified after update)",
+                            self._pump_data["port"],
+                            target_state
+                        )
+                    else:
+                        _LOGGER.warning(
+                            "Pump %s was not set. Expected state: %s, Current state: %s",
+                            self._pump_data["port"],
+                            target_state,
+                            current_state
+                        )
+            except ValueError as ve:
+                _LOGGER.error("Invalid port value for pump: %s", self._pump_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error turning on pump (port %s): %s", self._pump_data["port"], str(e))
+                raise
 
     async def async_turn_off(self, **kwargs):
         """Vypnutí fan entity."""
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._pump_data["port"])
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._pump_data["port"])
             
-            # Pokud není OFF podporován, použít LOW místo OFF
-            target_state = "LOW" if not self._supports_off else "OFF"
+                # Pokud není OFF podporován, použít LOW místo OFF
+                target_state = "LOW" if not self._supports_off else "OFF"
             
-            # Odeslání požadavku
-            success = await self._try_set_pump_state(device_number, target_state)
+                # Odeslání požadavku
+                success = await self._try_set_pump_state(device_number, target_state)
             
-            # Aktualizace dat pro ověření stavu
-            await self._shared_data.async_force_update()
+                # Aktualizace dat pro ověření stavu
+                await self._shared_data.async_force_update()
             
-            # Ověření nastavené hodnoty a logování stavu
-            if not success:
-                current_state = self._get_pump_state(self._shared_data.data)
-                if current_state == target_state:
-                    self._attr_preset_mode = target_state
-                    _LOGGER.info(
-                        "Pump %s was turned off (verified after update)",
-                        self._pump_data["port"]
-                    )
-                else:
-                    _LOGGER.warning(
-                        "Pump %s was not turned off. Current state: %s",
-                        self._pump_data["port"],
-                        current_state
-                    )
-        except ValueError as ve:
-            _LOGGER.error("Invalid port value for pump: %s", self._pump_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error turning off pump (port %s): %s", self._pump_data["port"], str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                # Ověření nastavené hodnoty a logování stavu
+                if not success:
+                    current_state = self._get_pump_state(self._shared_data.data)
+                    if current_state == target_state:
+                        self._attr_preset_mode = target_state
+                        _LOGGER.info(
+                            "Pump %s was turned off (verified after update)",
+                            self._pump_data["port"]
+                        )
+                    else:
+                        _LOGGER.warning(
+                            "Pump %s was not turned off. Current state: %s",
+                            self._pump_data["port"],
+                            current_state
+                        )
+            except ValueError as ve:
+                _LOGGER.error("Invalid port value for pump: %s", self._pump_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error turning off pump (port %s): %s", self._pump_data["port"], str(e))
+                raise
 
     def _get_target_state_for_preset(self, current_state: str, desired_preset: str) -> str:
         """Získá cílový stav pro přechod z aktuálního stavu na požadovaný preset mode."""
@@ -384,43 +378,41 @@ class SpaPumpFan(FanEntity):
             _LOGGER.warning("Invalid preset mode: %s", preset_mode)
             return
         
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._pump_data["port"])
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._pump_data["port"])
             
-            # Získat aktuální stav
-            current_state = self._attr_preset_mode or ("LOW" if not self._supports_off else "OFF")
+                # Získat aktuální stav
+                current_state = self._attr_preset_mode or ("LOW" if not self._supports_off else "OFF")
             
-            # Určit cílový stav podle chytré logiky
-            target_state = self._get_target_state_for_preset(current_state, preset_mode)
+                # Určit cílový stav podle chytré logiky
+                target_state = self._get_target_state_for_preset(current_state, preset_mode)
             
-            # Odeslání požadavku
-            success = await self._try_set_pump_state(device_number, target_state)
+                # Odeslání požadavku
+                success = await self._try_set_pump_state(device_number, target_state)
             
-            # Aktualizace dat pro ověření stavu
-            await self._shared_data.async_force_update()
+                # Aktualizace dat pro ověření stavu
+                await self._shared_data.async_force_update()
             
-            # Ověření nastavené hodnoty a logování stavu
-            if not success:
-                current_state = self._get_pump_state(self._shared_data.data)
-                if current_state == target_state:
-                    self._attr_preset_mode = target_state
-                    _LOGGER.info(
-                        "Pump %s was set to %s (verified after update)",
-                        self._pump_data["port"],
-                        target_state
-                    )
-                else:
-                    _LOGGER.warning(
-                        "Pump %s was not set. Expected state: %s, Current state: %s",
-                        self._pump_data["port"],
-                        target_state,
-                        current_state
-                    )
-        except ValueError as ve:
-            _LOGGER.error("Invalid port value for pump: %s", self._pump_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error setting preset mode for pump (port %s): %s", self._pump_data["port"], str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                # Ověření nastavené hodnoty a logování stavu
+                if not success:
+                    current_state = self._get_pump_state(self._shared_data.data)
+                    if current_state == target_state:
+                        self._attr_preset_mode = target_state
+                        _LOGGER.info(
+                            "Pump %s was set to %s (verified after update)",
+                            self._pump_data["port"],
+                            target_state
+                        )
+                    else:
+                        _LOGGER.warning(
+                            "Pump %s was not set. Expected state: %s, Current state: %s",
+                            self._pump_data["port"],
+                            target_state,
+                            current_state
+                        )
+            except ValueError as ve:
+                _LOGGER.error("Invalid port value for pump: %s", self._pump_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error setting preset mode for pump (port %s): %s", self._pump_data["port"], str(e))
+                raise
@@ -41,3 +41,55 @@ async def get_unique_id_suffix(hass: HomeAssistant, config_entry: ConfigEntry, s
     else:
         # Pokud serial_number není k dispozici, použít entry_id jako fallback
         return f"_{config_entry.entry_id}"
+
+
+def find_component(data, component_type, port):
+    """
+    Vrátí komponentu podle typu a portu.
+
+    Používá index componentIndex sestavený jednou za dotaz v constructCurrentState,
+    takže vyhledání je O(1). Pro data bez indexu se použije lineární průchod.
+
+    Args:
+        data: Stav spa z ControlMySpa.constructCurrentState
+        component_type: Typ komponenty (např. "PUMP", "FILTER")
+        port: Port komponenty (řetězec nebo None)
+
+    Returns:
+        Slovník komponenty nebo None, pokud neexistuje
+    """
+    if not data:
+        return None
+    index = data.get("componentIndex")
+    if index is not None:
+        return index.get((component_type, port))
+    return next(
+        (
+            comp
+            for comp in data.get("components", [])
+            if comp["componentType"] == component_type and comp["port"] == port
+        ),
+        None,
+    )
+
+
+def find_tzl_zone(data, zone_id):
+    """
+    Vrátí TZL zónu podle zoneId (O(1) přes index tzlZoneIndex).
+
+    Args:
+        data: Stav spa z ControlMySpa.constructCurrentState
+        zone_id: Identifikátor zóny
+
+    Returns:
+        Slovník zóny nebo None, pokud neexistuje
+    """
+    if not data:
+        return None
+    index = data.get("tzlZoneIndex")
+    if index is not None:
+        return index.get(zone_id)
+    return next(
+        (zone for zone in data.get("tzlZones", []) if zone["zoneId"] == zone_id),
+        None,
+    )
@@ -1,12 +1,36 @@
 from homeassistant.components.light import LightEntity, ColorMode, LightEntityFeature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from .const import DOMAIN
 from .entity import SpaSubscriberMixin
+from .helpers import find_tzl_zone
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+# hass.data klíč fronty zápisů oblíbených barev (zapisují se dávkou za všechny zóny)
+_PENDING_FAVORITES_KEY = f"{DOMAIN}_pending_favorite_colors"
+
+
+@callback
+def async_queue_favorite_colors(hass: HomeAssistant, entity_id: str, colors) -> None:
+    """Naplánuje zápis oblíbených barev; zápisy všech zón se provedou jednou dávkou."""
+    pending = hass.data.get(_PENDING_FAVORITES_KEY)
+    if pending is None:
+        pending = hass.data[_PENDING_FAVORITES_KEY] = {}
+        hass.loop.call_soon(_async_flush_favorite_colors, hass)
+    pending[entity_id] = colors
+
+
+@callback
+def _async_flush_favorite_colors(hass: HomeAssistant) -> None:
+    pending = hass.data.pop(_PENDING_FAVORITES_KEY, None) or {}
+    for entity_id, colors in pending.items():
+        async_set_favorite_colors(hass, entity_id, colors)
+    if pending:
+        _LOGGER.debug("Flushed favorite colors for %s TZL zone(s)", len(pending))
+
+
 def async_set_favorite_colors(hass: HomeAssistant, entity_id: str, colors: list[tuple[int, int, int]] | None) -> None:
     """Nastaví oblíbené barvy pro light entity pomocí entity registry options."""
     try:
@@ -33,6 +57,10 @@ def async_set_favorite_colors(hass: HomeAssistant, entity_id: str, colors: list[
             # Zkusit také alternativní formát
             options["supported_color_list"] = colors
 
+        if old_options is not None and dict(old_options) == options:
+            # Registry už obsahuje stejné barvy - zbytečný zápis
+            return
+
         er.async_get(hass).async_update_entity_options(entity_id, "light", options)
         _LOGGER.info("Set favorite colors for %s: %s", entity_id, colors)
         _LOGGER.debug("Entity options after update: %s", options)
@@ -80,6 +108,7 @@ class SpaTzlZoneLight(SpaSubscriberMixin, LightEntity):
 
     def __init__(self, shared_data, device_info, unique_id_suffix, tzl_zone_data, count_tzl_zones):
         self._shared_data = shared_data
+        self._spa_dependencies = {("tzlZone", tzl_zone_data["zoneId"]), "tzlColors"}
         self._tzl_zone_data = tzl_zone_data
         self._attr_should_poll = False  # Data jsou sdílena, posluchač
         self._attr_is_on = False
@@ -89,6 +118,7 @@ class SpaTzlZoneLight(SpaSubscriberMixin, LightEntity):
         self._attr_icon = "mdi:lightbulb"
         self._attr_supported_color_list = []  # Oblíbené barvy z tzlColors
         self._attr_favorite_colors = []  # Alternativní atribut pro oblíbené barvy
+        self._palette = None  # TzlPalette, ze které jsou oblíbené barvy
         self.hass = None  # Bude nastaveno později
         self.entity_id = None  # Bude nastaveno později
         # Inicializovat oblíbené barvy hned při vytvoření
@@ -135,18 +165,12 @@ class SpaTzlZoneLight(SpaSubscriberMixin, LightEntity):
         else:
             _LOGGER.warning("No favorite colors to set in async_added_to_hass")
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající TZL zone podle zoneId
-            tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
+            tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             if tzl_zone:
                 # Nastavit stav světla - zapnuto pokud není OFF
                 state = tzl_zone.get("state", "OFF")
@@ -210,14 +234,7 @@ class SpaTzlZoneLight(SpaSubscriberMixin, LightEntity):
         data = self._shared_data.data
         if data:
             # Najít odpovídající TZL zone podle zoneId
-            tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
+            tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             if tzl_zone:
                 # Získat dostupné barvy z tzlColors
                 available_colors = []
@@ -243,56 +260,23 @@ class SpaTzlZoneLight(SpaSubscriberMixin, LightEntity):
                 return attrs
 
     def _update_favorite_colors(self, data):
-        """Aktualizuje seznam oblíbených barev z tzlColors."""
-        _LOGGER.info("=== _update_favorite_colors called ===")
-        _LOGGER.debug("Full data keys: %s", list(data.keys()) if data else "No data")
-        
-        tzl_colors = data.get("tzlColors", [])
-        _LOGGER.debug("tzlColors found: %s items", len(tzl_colors))
-        _LOGGER.debug("tzlColors content: %s", tzl_colors)
-        
-        favorite_colors = []
-        
-        for i, color in enumerate(tzl_colors):
-            _LOGGER.debug("Processing color %s: %s", i, color)
-            # Přidat RGB barvu do oblíbených (maximálně 8 barev)
-            if len(favorite_colors) < 8:
-                # Načíst skutečné barvy z tzlColors
-                red = color.get("red", 0)
-                green = color.get("green", 0)
-                blue = color.get("blue", 0)
-                
-                # Použít formát jako v ukázkovém kódu: {"rgb_color": [R, G, B]}
-                rgb_color_dict = {"rgb_color": [red, green, blue]}
-                
-                # Použít dict formát (jako v ukázkovém kódu)
-                favorite_colors.append(rgb_color_dict)           
-        
+        """Aktualizuje seznam oblíbených barev z tzlColors - jen pokud se paleta změnila."""
+        palette = self._shared_data.palette
+        if palette is self._palette:
+            return
+        previous, self._palette = self._palette, palette
+        if previous is not None and previous.favorite_colors == palette.favorite_colors:
+            return
+
+        favorite_colors = palette.favorite_colors
         self._attr_supported_color_list = favorite_colors
         self._attr_favorite_colors = favorite_colors  # Alternativní atribut
-        
-        # Nastavit oblíbené barvy pomocí entity registry (jako Scenery)
-        if hasattr(self, 'hass') and hasattr(self, 'entity_id') and self.entity_id is not None:
-            _LOGGER.debug("Calling async_set_favorite_colors from _update_favorite_colors")
-            async_set_favorite_colors(self.hass, self.entity_id, favorite_colors)
-        else:
-            _LOGGER.warning("Cannot set favorite colors - hass: %s, entity_id: %s", 
-                          hasattr(self, 'hass'), getattr(self, 'entity_id', 'NOT_SET'))
-        
-        _LOGGER.debug("Final favorite colors for TZL Zone %s: %s", 
-                     self._tzl_zone_data["zoneId"], favorite_colors)
-        _LOGGER.debug("Current _attr_supported_color_list: %s", self._attr_supported_color_list)
-        _LOGGER.debug("Current _attr_favorite_colors: %s", self._attr_favorite_colors)
-        
-        # Zkusit také nastavit jako dict pro Home Assistant
-        if hasattr(self, '_attr_supported_color_list'):
-            _LOGGER.debug("_attr_supported_color_list exists and has value: %s", 
-                        getattr(self, '_attr_supported_color_list', 'NOT_FOUND'))
-        
-        # Zkusit také přidat do extra_state_attributes pro debugging
-        if not hasattr(self, '_debug_colors_set'):
-            self._debug_colors_set = True
-            _LOGGER.debug("Setting debug flag for colors")
+        _LOGGER.debug("Favorite colors for TZL Zone %s: %s", self._tzl_zone_data["zoneId"], favorite_colors)
+
+        # Nastavit oblíbené barvy pomocí entity registry (jako Scenery); před přidáním
+        # do hass je zapíše async_added_to_hass
+        if self.hass is not None and self.entity_id is not None:
+            async_queue_favorite_colors(self.hass, self.entity_id, favorite_colors)
 
     async def async_turn_on(self, **kwargs):
         """Zapnout světlo s možnými parametry jasu a výběrových barev."""
@@ -301,176 +285,107 @@ class SpaTzlZoneLight(SpaSubscriberMixin, LightEntity):
             _LOGGER.error("No data available for TZL zone control")
             return
             
-        try:
-            self._shared_data.pause_updates()
+        async with self._shared_data.command_lease():
+            try:
+                # Index dostupných barev
+                palette = self._shared_data.palette
             
-            # Získat dostupné barvy
-            tzl_colors = data.get("tzlColors", [])
-            available_rgb_colors = [
-                (color.get("red", 0), color.get("green", 0), color.get("blue", 0))
-                for color in tzl_colors
-            ]
+                _LOGGER.info("Turn on TZL Zone %s with params: %s", self._tzl_zone_data["zoneId"], kwargs)
             
-            _LOGGER.info("Turn on TZL Zone %s with params: %s", self._tzl_zone_data["zoneId"], kwargs)
+                # Zkontrolovat aktuální stav zóny
+                current_tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             
-            # Zkontrolovat aktuální stav zóny
-            current_tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
-            
-            current_state = current_tzl_zone.get("state", "OFF") if current_tzl_zone else "OFF"
-            _LOGGER.info("Current state of TZL Zone %s: %s", self._tzl_zone_data["zoneId"], current_state)
-            
-            # Zapnout zónu na režim NORMAL pouze pokud je aktuálně OFF
-            if current_state == "OFF":
-                _LOGGER.info("Zone is OFF, switching to NORMAL mode using setChromazoneColor with color_id=0")
-                response_data = await self._shared_data._client.setChromazoneColor(
-                    0, 
-                    self._tzl_zone_data["zoneId"]
-                )
-                
-                if response_data is None:
-                    _LOGGER.warning("Function setChromazoneColor, parameter 0 is not supported")
-                    return
-                
-                # Ukončit nastavení po zapnutí zóny
-                return
-            else:
-                _LOGGER.info("Zone is already ON (state: %s), skipping setChromazoneColor", current_state)
+                current_state = current_tzl_zone.get("state", "OFF") if current_tzl_zone else "OFF"
+                _LOGGER.info("Current state of TZL Zone %s: %s", self._tzl_zone_data["zoneId"], current_state)
             
-            # Zpracovat jas - převést z Home Assistant brightness (0-255) na TZL intensity (0-8)
-            if "brightness" in kwargs:
-                brightness = kwargs["brightness"]
-                # Převést brightness (0-255) na intensity (0-8)
-                intensity = max(0, min(8, round(brightness * 8 / 255)))
-                _LOGGER.info("Set brightness to: %s (intensity: %s)", brightness, intensity)
+                # Zapnout zónu na režim NORMAL pouze pokud je aktuálně OFF
+                if current_state == "OFF":
+                    _LOGGER.info("Zone is OFF, switching to NORMAL mode using setChromazoneColor with color_id=0")
+                    response_data = await self._shared_data._client.setChromazoneColor(
+                        0, 
+                        self._tzl_zone_data["zoneId"]
+                    )
                 
-                # Nastavit intenzitu
-                intensity_response = await self._shared_data._client.setChromazoneBrightness(
-                    intensity, 
-                    self._tzl_zone_data["zoneId"]
-                )
+                    if response_data is None:
+                        _LOGGER.warning("Function setChromazoneColor, parameter 0 is not supported")
+                        return
                 
-                if intensity_response is None:
-                    _LOGGER.warning("Function setChromazoneBrightness, parameter %s is not supported", intensity)
+                    # Ukončit nastavení po zapnutí zóny
+                    return
                 else:
-                    _LOGGER.info("Successfully set TZL zone %s intensity to %s", self._tzl_zone_data["zoneId"], intensity)
+                    _LOGGER.info("Zone is already ON (state: %s), skipping setChromazoneColor", current_state)
             
-            # Zpracovat barvu z výběrových barev
-            if "rgb_color" in kwargs:
-                rgb = kwargs["rgb_color"]
-                # Najít odpovídající color_id pro danou RGB barvu
-                color_id = None
-                for color in tzl_colors:
-                    if (color.get("red", 0) == rgb[0] and 
-                        color.get("green", 0) == rgb[1] and 
-                        color.get("blue", 0) == rgb[2]):
-                        color_id = color.get("colorId")
-                        break
+                client = self._shared_data._client
+                zone_id = self._tzl_zone_data["zoneId"]
+                # Jas i barva se odešlou jednou dávkou s jediným obnovením stavu na konci
+                commands = []
+
+                # Zpracovat jas - převést z Home Assistant brightness (0-255) na TZL intensity (0-8)
+                if "brightness" in kwargs:
+                    brightness = kwargs["brightness"]
+                    # Převést brightness (0-255) na intensity (0-8)
+                    intensity = max(0, min(8, round(brightness * 8 / 255)))
+                    _LOGGER.info("Set brightness to: %s (intensity: %s)", brightness, intensity)
+                    commands.append(client.chromazoneBrightnessCommand(intensity, zone_id))
+            
+                # Zpracovat barvu z výběrových barev
+                if "rgb_color" in kwargs:
+                    rgb = kwargs["rgb_color"]
+                    # Najít odpovídající color_id pro danou RGB barvu
+                    color_id = palette.color_id(rgb)
                 
-                if color_id is not None:
-                    _LOGGER.info("Set selected color to: %s (color_id: %s)", rgb, color_id)
-                    
-                    # Nastavit barvu
-                    color_response = await self._shared_data._client.setChromazoneColor(
-                        color_id - 1, 
-                        self._tzl_zone_data["zoneId"]
-                    )
-                    
-                    if color_response is None:
-                        _LOGGER.warning("Function setChromazoneColor, parameter %s is not supported", color_id)
-                    else:
-                        _LOGGER.info("Successfully set TZL zone %s color to color_id %s", self._tzl_zone_data["zoneId"], color_id)
-                else:
-                    _LOGGER.warning("Selected color %s not found in available colors: %s", rgb, available_rgb_colors)
-                    # Najít nejbližší dostupnou barvu
-                    closest_color = self._find_closest_color(rgb, available_rgb_colors)
-                    _LOGGER.info("Using closest available color: %s", closest_color)
-                    
-                    # Zkusit najít color_id pro nejbližší barvu
-                    for color in tzl_colors:
-                        if (color.get("red", 0) == closest_color[0] and 
-                            color.get("green", 0) == closest_color[1] and 
-                            color.get("blue", 0) == closest_color[2]):
-                            color_id = color.get("colorId")
-                            break
-                    
+                    if color_id is None:
+                        _LOGGER.warning("Selected color %s not found in available colors: %s", rgb, palette.rgb_colors)
+                        # Najít nejbližší dostupnou barvu
+                        color_id = palette.nearest_color_id(rgb)
+                        _LOGGER.info("Using closest available color: %s", palette.rgb(color_id))
+
                     if color_id is not None:
-                        color_response = await self._shared_data._client.setChromazoneColor(
-                            color_id - 1, 
-                            self._tzl_zone_data["zoneId"]
-                        )
-                        if color_response:
-                            _LOGGER.info("Successfully set closest TZL zone %s color to color_id %s", self._tzl_zone_data["zoneId"], color_id)
-            
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error turning on TZL zone %s: %s", self._tzl_zone_data["zoneId"], str(e))
-        finally:
-            self._shared_data.resume_updates()
-
-    def _find_closest_color(self, target_rgb, available_colors):
-        """Najde nejbližší dostupnou barvu k cílové barvě."""
-        if not available_colors:
-            return target_rgb
+                        _LOGGER.info("Set selected color to: %s (color_id: %s)", rgb, color_id)
+                        commands.append(client.chromazoneColorCommand(color_id - 1, zone_id))
+
+                if commands:
+                    response_data = await client.sendCommands(commands)
+                    if response_data is None:
+                        _LOGGER.warning("TZL zone %s commands were not accepted: %s",
+                                        zone_id, [endpoint for endpoint, _, _ in commands])
+                    else:
+                        _LOGGER.info("Successfully sent %d command(s) to TZL zone %s", len(commands), zone_id)
             
-        min_distance = float('inf')
-        closest_color = available_colors[0]
-        
-        for color in available_colors:
-            # Vypočítat euklidovskou vzdálenost v RGB prostoru
-            distance = sum((a - b) ** 2 for a, b in zip(target_rgb, color)) ** 0.5
-            if distance < min_distance:
-                min_distance = distance
-                closest_color = color
-                
-        return closest_color
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error turning on TZL zone %s: %s", self._tzl_zone_data["zoneId"], str(e))
 
     async def async_turn_off(self, **kwargs):
         """Vypnout světlo."""
-        try:
-            self._shared_data.pause_updates()
-            
-            # Volání API pro vypnutí TZL zóny
-            response_data = await self._shared_data._client.setChromazoneFunction(
-                "OFF", 
-                self._tzl_zone_data["zoneId"]
-            )
+        async with self._shared_data.command_lease():
+            try:
+                # Volání API pro vypnutí TZL zóny
+                response_data = await self._shared_data._client.setChromazoneFunction(
+                    "OFF", 
+                    self._tzl_zone_data["zoneId"]
+                )
             
-            if response_data is None:
-                _LOGGER.warning("Function setChromazoneFunction (OFF), parameter is not supported")
-                return
+                if response_data is None:
+                    _LOGGER.warning("Function setChromazoneFunction (OFF), parameter is not supported")
+                    return
             
-            if response_data:
-                # Najít odpovídající TZL zone v odpovědi
-                tzl_zone = next(
-                    (
-                        zone
-                        for zone in response_data.get("tzlZones", [])
-                        if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                    ),
-                    None,
-                )
-                new_state = tzl_zone["state"] if tzl_zone else None
+                if response_data:
+                    # Najít odpovídající TZL zone v odpovědi
+                    tzl_zone = find_tzl_zone(response_data, self._tzl_zone_data["zoneId"])
+                    new_state = tzl_zone["state"] if tzl_zone else None
                 
-                if new_state == "OFF":
-                    _LOGGER.info("Successfully turned off TZL zone %s", self._tzl_zone_data["zoneId"])
+                    if new_state == "OFF":
+                        _LOGGER.info("Successfully turned off TZL zone %s", self._tzl_zone_data["zoneId"])
+                    else:
+                        _LOGGER.warning(
+                            "TZL zone %s was not turned off. Expected state: OFF, Current state: %s",
+                            self._tzl_zone_data["zoneId"],
+                            new_state
+                        )
                 else:
-                    _LOGGER.warning(
-                        "TZL zone %s was not turned off. Expected state: OFF, Current state: %s",
-                        self._tzl_zone_data["zoneId"],
-                        new_state
-                    )
-            else:
-                _LOGGER.error("No API response for turning off TZL zone %s", self._tzl_zone_data["zoneId"])
+                    _LOGGER.error("No API response for turning off TZL zone %s", self._tzl_zone_data["zoneId"])
                 
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error turning off TZL zone %s: %s", self._tzl_zone_data["zoneId"], str(e))
-        finally:
-            self._shared_data.resume_updates()
\ No newline at end of file
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error turning off TZL zone %s: %s", self._tzl_zone_data["zoneId"], str(e))
\ No newline at end of file
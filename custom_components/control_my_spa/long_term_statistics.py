@@ -0,0 +1,196 @@
+"""Hodinové dlouhodobé statistiky (energie, teplota) importované do recorderu."""
+
+from datetime import timedelta
+import logging
+import re
+from homeassistant.const import UnitOfEnergy, UnitOfTemperature
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+_HOUR = timedelta(hours=1)
+# Maximální počet hodin držených v bufferu, pokud recorder není k dispozici
+_MAX_BUFFERED_HOURS = 48
+
+
+def statistic_id(unique_id):
+    """ID externí statistiky z unique_id entity, např. control_my_spa:spa_heater_energy_xxx."""
+    object_id = unique_id.split(".", 1)[-1].lower()
+    return f"{DOMAIN}:{re.sub(r'[^a-z0-9_]+', '_', object_id).strip('_')}"
+
+
+def _hour_start(moment):
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _current_temperature(data):
+    """Aktuální teplota v jednotce senzoru (stejný převod jako SpaTemperatureSensor)."""
+    fahrenheit_temp = data.get("currentTemp")
+    if fahrenheit_temp is None or fahrenheit_temp == 0:
+        return None, None
+    if data.get("celsius"):
+        return data.current_temp_c, UnitOfTemperature.CELSIUS
+    return fahrenheit_temp, UnitOfTemperature.FAHRENHEIT
+
+
+class _EnergySeries:
+    """Hodinové součty jednoho kanálu energie."""
+
+    __slots__ = ("key", "statistic_id", "name", "last_time", "last_kwh", "rows")
+
+    def __init__(self, key, stat_id, name):
+        self.key = key
+        self.statistic_id = stat_id
+        self.name = name
+        self.last_time = None  # Čas posledního vzorku (UTC)
+        self.last_kwh = None  # Akumulátor při posledním vzorku
+        self.rows = []  # Dokončené hodiny čekající na zápis
+
+
+class _TemperatureSeries:
+    """Hodinové min/průměr/max teploty (průměr vážený časem)."""
+
+    __slots__ = ("statistic_id", "name", "unit", "last_time", "last_value", "hour",
+                 "minimum", "maximum", "weighted_sum", "weighted_seconds", "rows")
+
+    def __init__(self, stat_id, name):
+        self.statistic_id = stat_id
+        self.name = name
+        self.unit = None
+        self.last_time = None
+        self.last_value = None
+        self.hour = None  # Začátek rozpracované hodiny
+        self.minimum = None
+        self.maximum = None
+        self.weighted_sum = 0.0
+        self.weighted_seconds = 0.0
+        self.rows = []
+
+
+class SpaStatisticsCollector:
+    """Sbírá vzorky při každém čtení a po skončení hodiny je dávkově zapíše do recorderu.
+
+    Energie se bere z akumulátorů SpaEnergyIntegrator; stav na hranici hodiny se
+    lineárně interpoluje mezi dvěma čteními.
+    """
+
+    def __init__(self, hass, energy):
+        self._hass = hass
+        self._energy = energy
+        self._energy_series = {}  # (componentType, port) -> _EnergySeries
+        self._temperature = None  # _TemperatureSeries
+
+    def add_energy_channel(self, component_type, port, unique_id, name):
+        key = (component_type, port)
+        if key not in self._energy_series:
+            self._energy_series[key] = _EnergySeries(key, statistic_id(unique_id), name)
+
+    def add_temperature(self, unique_id, name):
+        if self._temperature is None:
+            self._temperature = _TemperatureSeries(statistic_id(unique_id), name)
+
+    @callback
+    def observe(self, data, now=None):
+        """Započítá vzorek z aktuálního čtení (now = čas čtení, UTC); dokončené hodiny zapíše."""
+        now = now or dt_util.utcnow()
+        for series in self._energy_series.values():
+            self._observe_energy(series, now)
+        if self._temperature is not None:
+            self._observe_temperature(self._temperature, data, now)
+        self._flush()
+
+    def _observe_energy(self, series, now):
+        kwh = self._energy.energy_kwh(*series.key)
+        if series.last_time is not None and now > series.last_time:
+            boundary = _hour_start(series.last_time) + _HOUR
+            span = (now - series.last_time).total_seconds()
+            while boundary <= now:
+                fraction = (boundary - series.last_time).total_seconds() / span
+                boundary_kwh = round(series.last_kwh + (kwh - series.last_kwh) * fraction, 6)
+                series.rows.append({"start": boundary - _HOUR, "state": boundary_kwh, "sum": boundary_kwh})
+                boundary += _HOUR
+        series.last_time, series.last_kwh = now, kwh
+
+    def _observe_temperature(self, series, data, now):
+        if series.last_time is not None and series.last_value is not None:
+            start = series.last_time
+            while start < now:
+                hour = _hour_start(start)
+                end = min(hour + _HOUR, now)
+                if series.hour != hour:
+                    self._close_temperature_hour(series)
+                    series.hour = hour
+                seconds = (end - start).total_seconds()
+                series.weighted_sum += series.last_value * seconds
+                series.weighted_seconds += seconds
+                series.minimum = series.last_value if series.minimum is None else min(series.minimum, series.last_value)
+                series.maximum = series.last_value if series.maximum is None else max(series.maximum, series.last_value)
+                if end == hour + _HOUR:
+                    self._close_temperature_hour(series)
+                start = end
+
+        value, unit = _current_temperature(data) if data else (None, None)
+        if unit is not None and unit != series.unit:
+            # Změna jednotky - rozpracovanou hodinu zahodit
+            if series.unit is not None:
+                self._reset_temperature_hour(series)
+                series.rows.clear()
+            series.unit = unit
+        series.last_time, series.last_value = now, value
+
+    @staticmethod
+    def _reset_temperature_hour(series):
+        series.hour = None
+        series.minimum = series.maximum = None
+        series.weighted_sum = series.weighted_seconds = 0.0
+
+    def _close_temperature_hour(self, series):
+        if series.hour is not None and series.weighted_seconds > 0:
+            series.rows.append({
+                "start": series.hour,
+                "mean": round(series.weighted_sum / series.weighted_seconds, 2),
+                "min": series.minimum,
+                "max": series.maximum,
+            })
+        self._reset_temperature_hour(series)
+
+    def _flush(self):
+        """Zapíše dokončené hodiny všech statistik (jedno volání na statistiku)."""
+        pending = [series for series in self._energy_series.values() if series.rows]
+        if self._temperature is not None and self._temperature.rows:
+            pending.append(self._temperature)
+        if not pending:
+            return
+        if "recorder" not in self._hass.config.components:
+            for series in pending:
+                del series.rows[:-_MAX_BUFFERED_HOURS]
+            return
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        for series in pending:
+            if isinstance(series, _TemperatureSeries):
+                metadata = {
+                    "has_mean": True,
+                    "has_sum": False,
+                    "name": series.name,
+                    "source": DOMAIN,
+                    "statistic_id": series.statistic_id,
+                    "unit_of_measurement": series.unit,
+                }
+            else:
+                metadata = {
+                    "has_mean": False,
+                    "has_sum": True,
+                    "name": series.name,
+                    "source": DOMAIN,
+                    "statistic_id": series.statistic_id,
+                    "unit_of_measurement": UnitOfEnergy.KILO_WATT_HOUR,
+                }
+            try:
+                async_add_external_statistics(self._hass, metadata, series.rows)
+                _LOGGER.debug("Imported %s hourly statistics row(s) for %s", len(series.rows), series.statistic_id)
+            except Exception as e:
+                _LOGGER.warning("Failed to import statistics for %s: %s", series.statistic_id, e)
+            series.rows = []
@@ -0,0 +1,176 @@
+"""Metriky HTTP volání ControlMySpa cloudu (latence, statusy, timeouty, velikosti odpovědí)."""
+
+from bisect import bisect_left
+
+# Horní meze košů histogramu latence (ms); poslední koš (nad 30 s) je otevřený
+LATENCY_BUCKETS_MS = (25, 50, 75, 100, 150, 200, 300, 400, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000, 30000)
+# Třídy HTTP statusů podle status // 100 (index 0 = odpověď bez platného statusu)
+STATUS_CLASSES = ("other", "1xx", "2xx", "3xx", "4xx", "5xx")
+# Prefix endpointů příkazů (metriky příkazů se evidují podle celé cesty)
+COMMAND_PREFIX = "/spa-commands/"
+
+
+class EndpointMetrics:
+    """Metriky jednoho endpointu s pevně alokovanými čítači.
+
+    Záznam volání jen zvýší čítače a jeden koš histogramu (nic nealokuje), kvantily
+    latence se odhadují až při čtení lineární interpolací uvnitř koše.
+    """
+
+    __slots__ = (
+        "name", "_bounds", "_buckets", "_status", "requests", "timeouts", "errors",
+        "latency_sum_ms", "latency_min_ms", "latency_max_ms", "response_bytes", "response_bytes_max",
+    )
+
+    def __init__(self, name, bounds=LATENCY_BUCKETS_MS):
+        self.name = name
+        self._bounds = bounds
+        self._buckets = [0] * (len(bounds) + 1)
+        self._status = [0] * len(STATUS_CLASSES)
+        self.requests = 0  # Všechna volání včetně timeoutů a chyb spojení
+        self.timeouts = 0
+        self.errors = 0  # Chyby spojení (bez HTTP odpovědi)
+        self.latency_sum_ms = 0.0
+        self.latency_min_ms = None
+        self.latency_max_ms = 0.0
+        self.response_bytes = 0  # Součet velikostí těl odpovědí
+        self.response_bytes_max = 0
+
+    def _observe(self, latency_ms):
+        self.requests += 1
+        self._buckets[bisect_left(self._bounds, latency_ms)] += 1
+        self.latency_sum_ms += latency_ms
+        if latency_ms > self.latency_max_ms:
+            self.latency_max_ms = latency_ms
+        if self.latency_min_ms is None or latency_ms < self.latency_min_ms:
+            self.latency_min_ms = latency_ms
+
+    def record(self, latency_ms, status, size=0):
+        """Započítá volání s HTTP odpovědí status a tělem o size bajtech."""
+        self._observe(latency_ms)
+        status_class = status // 100
+        self._status[status_class if 0 < status_class < len(STATUS_CLASSES) else 0] += 1
+        self.response_bytes += size
+        if size > self.response_bytes_max:
+            self.response_bytes_max = size
+
+    def record_failure(self, latency_ms, timeout=False):
+        """Započítá volání bez odpovědi (timeout nebo chyba spojení)."""
+        self._observe(latency_ms)
+        if timeout:
+            self.timeouts += 1
+        else:
+            self.errors += 1
+
+    @property
+    def failures(self):
+        """Neúspěšná volání: timeouty, chyby spojení a odpovědi 4xx/5xx."""
+        return self.timeouts + self.errors + self._status[4] + self._status[5]
+
+    def quantile(self, q):
+        """Odhad kvantilu latence (ms) z histogramu, omezený naměřeným minimem a maximem; None bez dat."""
+        if not self.requests:
+            return None
+        target = q * self.requests
+        seen = 0
+        lower = 0.0
+        for index, count in enumerate(self._buckets):
+            upper = self._bounds[index] if index < len(self._bounds) else self.latency_max_ms
+            if count and seen + count >= target:
+                value = lower + (upper - lower) * (target - seen) / count
+                return max(self.latency_min_ms, min(value, self.latency_max_ms))
+            seen += count
+            lower = upper
+        return self.latency_max_ms
+
+    def merge(self, other):
+        """Přičte metriky jiného endpointu se stejnými koši (souhrn více endpointů)."""
+        for index, count in enumerate(other._buckets):
+            self._buckets[index] += count
+        for index, count in enumerate(other._status):
+            self._status[index] += count
+        self.requests += other.requests
+        self.timeouts += other.timeouts
+        self.errors += other.errors
+        self.latency_sum_ms += other.latency_sum_ms
+        self.latency_max_ms = max(self.latency_max_ms, other.latency_max_ms)
+        if other.latency_min_ms is not None and (self.latency_min_ms is None or other.latency_min_ms < self.latency_min_ms):
+            self.latency_min_ms = other.latency_min_ms
+        self.response_bytes += other.response_bytes
+        self.response_bytes_max = max(self.response_bytes_max, other.response_bytes_max)
+        return self
+
+    def as_dict(self):
+        """Souhrn pro diagnostiku (latence v ms zaokrouhlené na celé ms)."""
+        def rounded(value):
+            return None if value is None else round(value)
+
+        result = {
+            "requests": self.requests,
+            "p50_ms": rounded(self.quantile(0.5)),
+            "p90_ms": rounded(self.quantile(0.9)),
+            "p99_ms": rounded(self.quantile(0.99)),
+            "mean_ms": rounded(self.latency_sum_ms / self.requests) if self.requests else None,
+            "max_ms": rounded(self.latency_max_ms) if self.requests else None,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+        for index, status_class in enumerate(STATUS_CLASSES):
+            if self._status[index]:
+                result[f"status_{status_class}"] = self._status[index]
+        responses = self.requests - self.timeouts - self.errors
+        result["response_bytes_mean"] = round(self.response_bytes / responses) if responses else None
+        result["response_bytes_max"] = self.response_bytes_max
+        return result
+
+
+class MetricsRegistry:
+    """Metriky podle názvu endpointu (vytváří se při prvním použití)."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self._bounds = bounds
+        self._metrics = {}
+
+    def get(self, name):
+        metrics = self._metrics.get(name)
+        if metrics is None:
+            metrics = self._metrics[name] = EndpointMetrics(name, self._bounds)
+        return metrics
+
+    def find(self, name):
+        """Metriky endpointu, nebo None, pokud ještě nebyl volán."""
+        return self._metrics.get(name)
+
+    def published(self):
+        """Hodnoty zobrazované senzory (zaokrouhlené kvantily, selhání) podle endpointu.
+
+        Změna znamená nová data pro senzory; samotný počet volání roste při každém čtení.
+        """
+        return {
+            name: (
+                round(metrics.quantile(0.5)), round(metrics.quantile(0.9)), round(metrics.quantile(0.99)),
+                metrics.failures, metrics.timeouts,
+            )
+            for name, metrics in self._metrics.items()
+            if metrics.requests
+        }
+
+    def commands(self):
+        """Metriky jednotlivých příkazů podle názvu bez prefixu /spa-commands/."""
+        return {
+            name[len(COMMAND_PREFIX):]: metrics
+            for name, metrics in self._metrics.items()
+            if name.startswith(COMMAND_PREFIX)
+        }
+
+    def combined(self, names):
+        """Souhrnné metriky více endpointů (nový objekt, registr se nemění)."""
+        total = EndpointMetrics("+".join(names), self._bounds)
+        for name in names:
+            metrics = self._metrics.get(name)
+            if metrics is not None:
+                total.merge(metrics)
+        return total
+
+    def as_dict(self):
+        return {name: metrics.as_dict() for name, metrics in self._metrics.items()}
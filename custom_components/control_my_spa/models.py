@@ -0,0 +1,343 @@
+"""Typovaný kompaktní model stavu spa dekódovaný z odpovědi dashboardu.
+
+Záznamy mají __slots__ a drží jen pole, která integrace používá. Zároveň se chovají
+jako jen-pro-čtení Mapping (get, [], in, keys), takže kód pracující se stavem jako
+se slovníkem funguje beze změny.
+
+Při dekódování dalšího čtení se záznamy, které se nezměnily, převezmou z předchozího
+stavu (stejný objekt) a výčtové řetězce (OFF, HIGH, PUMP, C8Z_*) se internují.
+Nezměněné části po sobě jdoucích stavů jsou tak identické (porovnání přes is).
+"""
+
+from collections.abc import Mapping
+import json
+import logging
+import sys
+
+try:
+    import orjson
+except ImportError:  # orjson je součástí Home Assistant, mimo HA nemusí být
+    orjson = None
+    try:
+        import msgspec
+    except ImportError:
+        msgspec = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rychlý dekodér JSON: orjson, msgspec, nebo standardní json
+if orjson is not None:
+    json_loads = orjson.loads
+elif msgspec is not None:
+    json_loads = msgspec.json.decode
+else:
+    json_loads = json.loads
+
+_MISSING = object()  # Pole, které v odpovědi nebylo (get vrací default)
+_intern = sys.intern
+
+
+def _parse_float(value):
+    """Převod hodnoty z API na float (None pro chybějící nebo nečíselnou hodnotu)."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def fahrenheit_to_celsius(value):
+    """°F -> °C zaokrouhleno na desetiny (None a 0 = neznámá teplota)."""
+    if not value:
+        return None
+    return round((value - 32) * 5.0 / 9.0, 1)
+
+
+class _Record(Mapping):
+    """Základ záznamu: __slots__ s poli _FIELDS, rozhraní Mapping nad přítomnými poli."""
+
+    __slots__ = ()
+    _FIELDS = ()
+    _INTERNED = ()  # Pole s výčtovými řetězci (hodnota nebo seznam hodnot) k internování
+
+    def __init__(self, source=None, **values):
+        if source:
+            values = {**source, **values} if values else source
+        for field in self._FIELDS:
+            object.__setattr__(self, field, values.get(field, _MISSING))
+        for field in self._INTERNED:
+            value = getattr(self, field)
+            if type(value) is str:
+                object.__setattr__(self, field, _intern(value))
+            elif type(value) is list:
+                object.__setattr__(self, field, [_intern(item) if type(item) is str else item for item in value])
+
+    def matches(self, source):
+        """True, pokud záznam odpovídá surovému slovníku z odpovědi (lze ho sdílet)."""
+        for field in self._FIELDS:
+            if getattr(self, field) != source.get(field, _MISSING):
+                return False
+        return True
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key):
+        value = getattr(self, key, _MISSING) if key in self._FIELDS else _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = getattr(self, key, _MISSING) if key in self._FIELDS else _MISSING
+        return default if value is _MISSING else value
+
+    def __contains__(self, key):
+        return key in self._FIELDS and getattr(self, key) is not _MISSING
+
+    def __iter__(self):
+        return (field for field in self._FIELDS if getattr(self, field) is not _MISSING)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if type(other) is type(self):
+            return all(getattr(self, field) == getattr(other, field) for field in self._FIELDS)
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def to_dict(self):
+        """Slovník přítomných polí (pro uložení snapshotu)."""
+        return {field: _to_plain(getattr(self, field)) for field in self}
+
+
+def _to_plain(value):
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+class Component(_Record):
+    """Komponenta vany (PUMP, HEATER, FILTER, ...)."""
+
+    _FIELDS = ("componentType", "port", "value", "name", "availableValues",
+               "targetValue", "hour", "minute", "durationMinutes")
+    __slots__ = _FIELDS
+    _INTERNED = ("componentType", "port", "value", "availableValues", "targetValue")
+
+
+class TzlZone(_Record):
+    """Zóna osvětlení Chromazone (TZL)."""
+
+    _FIELDS = ("zoneId", "zoneName", "state", "intensity", "speed", "colorId", "red", "green", "blue")
+    __slots__ = _FIELDS
+    _INTERNED = ("zoneId", "state")
+
+
+class TzlColor(_Record):
+    """Barva palety TZL."""
+
+    _FIELDS = ("colorId", "red", "green", "blue", "isSecondary")
+    __slots__ = _FIELDS
+
+
+class C8zState(_Record):
+    """Stav tepelného čerpadla Clim8Zone (c8zCurrentState)."""
+
+    _FIELDS = ("c8zHeaterState", "c8zStatus", "c8zHeater", "c8zMode", "c8zSpeed")
+    __slots__ = _FIELDS
+    _INTERNED = _FIELDS
+
+
+# Indexy SpaState dostupné přes get()/[] (ostatní odvozené hodnoty jen jako atributy)
+_INDEX_KEYS = frozenset(("componentIndex", "tzlZoneIndex"))
+
+# Pole teploty (°F) -> odvozená hodnota ve °C
+_CELSIUS_FIELDS = {
+    "currentTemp": "current_temp_c",
+    "desiredTemp": "desired_temp_c",
+    "targetDesiredTemp": "target_desired_temp_c",
+}
+
+
+def _records(record_type, items, previous=None):
+    """Záznamy ze seznamu slovníků; nezměněné záznamy (na stejné pozici) převezme z previous.
+
+    Pokud se nezměnil žádný záznam, vrátí přímo seznam previous.
+    """
+    if isinstance(previous, list) and previous:
+        records = []
+        shared = 0
+        for item in items or ():
+            if isinstance(item, _Record):
+                records.append(item)
+                continue
+            if not isinstance(item, Mapping):
+                continue
+            old = previous[len(records)] if len(records) < len(previous) else None
+            if old is not None and old.matches(item):
+                records.append(old)
+                shared += 1
+            else:
+                records.append(record_type(item))
+        return previous if shared == len(records) == len(previous) else records
+    return [
+        item if isinstance(item, _Record) else record_type(item)
+        for item in items or () if isinstance(item, Mapping)
+    ]
+
+
+def _field(record, field):
+    """Pole záznamu, nebo None (bez záznamu nebo pole chybí)."""
+    value = getattr(record, field) if record is not None else None
+    return None if value is _MISSING else value
+
+
+def _shared(value, previous):
+    """Převezme předchozí hodnotu (seznam, slovník), pokud se nezměnila."""
+    if previous is not None and previous == value:
+        return previous
+    return value
+
+
+class SpaState(_Record):
+    """Stav spa - výsledek ControlMySpa.constructCurrentState.
+
+    Klíče odpovídají dřívějšímu slovníku stavu; navíc obsahuje indexy componentIndex
+    a tzlZoneIndex a odvozené teploty ve °C (current_temp_c, desired_temp_c,
+    target_desired_temp_c), spočtené jednou při dekódování.
+    """
+
+    _FIELDS = (
+        "desiredTemp", "targetDesiredTemp", "currentTemp", "celsius", "panelLock",
+        "heaterMode", "components", "runMode", "tempRange", "setupParams", "time",
+        "serialNumber", "controllerSoftwareVersion", "isOnline", "currentFaultMessage",
+        "totalAlerts", "c8zCurrentState", "tzlZones", "tzlZoneFunctions", "tzlColors",
+    )
+    # Indexy a odvozené hodnoty nejsou položkami Mappingu (nejsou v to_dict ani v diffu)
+    _DERIVED = ("componentIndex", "tzlZoneIndex", "current_temp_c", "desired_temp_c", "target_desired_temp_c")
+    __slots__ = _FIELDS + _DERIVED
+    _INTERNED = ("heaterMode", "runMode", "tempRange")
+
+    def __init__(self, source=None, previous=None, **values):
+        """previous je předchozí SpaState, jehož nezměněné části se převezmou (sdílí)."""
+        super().__init__(source, **values)
+        components = self.get("components")
+        tzl_zones = self.get("tzlZones")
+        tzl_colors = self.get("tzlColors")
+        c8z = self.get("c8zCurrentState")
+        setattr_ = object.__setattr__
+        setattr_(self, "components", _records(Component, components, _field(previous, "components")))
+        setattr_(self, "tzlZones", _records(TzlZone, tzl_zones, _field(previous, "tzlZones")))
+        setattr_(self, "tzlColors", _records(TzlColor, tzl_colors, _field(previous, "tzlColors")))
+        if self.tzlZoneFunctions is _MISSING:
+            setattr_(self, "tzlZoneFunctions", [])
+        setattr_(self, "tzlZoneFunctions", _shared(self.tzlZoneFunctions, _field(previous, "tzlZoneFunctions")))
+        setattr_(self, "setupParams", _shared(self.setupParams, _field(previous, "setupParams")))
+        if isinstance(c8z, Mapping) and not isinstance(c8z, C8zState):
+            old_c8z = _field(previous, "c8zCurrentState")
+            if isinstance(old_c8z, C8zState) and old_c8z.matches(c8z):
+                setattr_(self, "c8zCurrentState", old_c8z)
+            else:
+                setattr_(self, "c8zCurrentState", C8zState(c8z))
+
+        if previous is not None and self.components is previous.components:
+            component_index = previous.componentIndex
+        else:
+            component_index = {}
+            for comp in self.components:
+                component_index.setdefault((comp.get("componentType"), comp.get("port")), comp)
+        setattr_(self, "componentIndex", component_index)
+        if previous is not None and self.tzlZones is previous.tzlZones:
+            setattr_(self, "tzlZoneIndex", previous.tzlZoneIndex)
+        else:
+            setattr_(self, "tzlZoneIndex", {zone.get("zoneId"): zone for zone in self.tzlZones})
+        setattr_(self, "current_temp_c", fahrenheit_to_celsius(self.get("currentTemp")))
+        setattr_(self, "desired_temp_c", fahrenheit_to_celsius(self.get("desiredTemp")))
+        setattr_(self, "target_desired_temp_c", fahrenheit_to_celsius(self.get("targetDesiredTemp")))
+
+    def get(self, key, default=None):
+        if key in _INDEX_KEYS:
+            return getattr(self, key)
+        return super().get(key, default)
+
+    def __getitem__(self, key):
+        if key in _INDEX_KEYS:
+            return getattr(self, key)
+        return super().__getitem__(key)
+
+    def display_temperature(self, field):
+        """Teplota pole (currentTemp, desiredTemp, targetDesiredTemp) v jednotce spa."""
+        fahrenheit = self.get(field)
+        if not fahrenheit:
+            return None
+        if self.get("celsius"):
+            return getattr(self, _CELSIUS_FIELDS[field])
+        return fahrenheit
+
+    @classmethod
+    def from_dashboard(cls, spa_data, previous=None):
+        """Stav z části data odpovědi /spas/{id}/dashboard.
+
+        S previous (stav z předchozího čtení) se nezměněné záznamy a seznamy převezmou.
+        """
+        desired_temp = _parse_float(spa_data.get("desiredTemp"))
+        range_limits = spa_data["rangeLimits"]
+        values = {
+            "desiredTemp": desired_temp,
+            "targetDesiredTemp": desired_temp,
+            "currentTemp": _parse_float(spa_data.get("currentTemp")),
+            "celsius": bool(spa_data["isCelsius"]),
+            "panelLock": spa_data["isPanelLocked"],
+            "heaterMode": spa_data["heaterMode"],
+            "components": spa_data.get("components", []),
+            "runMode": spa_data["heaterMode"],
+            "tempRange": spa_data["tempRange"],
+            "setupParams": {
+                "highRangeLow": range_limits["highRangeLow"],
+                "highRangeHigh": range_limits["highRangeHigh"],
+                "lowRangeLow": range_limits["lowRangeLow"],
+                "lowRangeHigh": range_limits["lowRangeHigh"],
+            },
+            "time": spa_data["time"],
+            "serialNumber": spa_data["serialNumber"],
+            "controllerSoftwareVersion": spa_data["systemInfo"]["controllerSoftwareVersion"],
+            "isOnline": bool(spa_data.get("isOnline")),
+            "currentFaultMessage": spa_data.get("currentFaultMessage"),
+            "totalAlerts": spa_data.get("totalAlerts"),
+            "c8zCurrentState": spa_data.get("c8zCurrentState"),
+        }
+        # Načtení TZL zones pokud je TZL připojen
+        if spa_data.get("primaryTZLStatus") == "TZL_CONNECTED":
+            tzl_state = spa_data.get("tzlState", {})
+            values["tzlZones"] = tzl_state.get("tzlLightStatus", {}).get("tzlZones", [])
+            values["tzlZoneFunctions"] = tzl_state.get("tzlConfiguration", {}).get("tzlZoneFunctions", [])
+            values["tzlColors"] = tzl_state.get("tzlColorSettings", {}).get("tzlColors", [])
+        else:
+            values["tzlZones"] = []
+            values["tzlZoneFunctions"] = []
+            values["tzlColors"] = []
+        return cls(values, previous)
+
+    @classmethod
+    def from_dashboard_bytes(cls, body, previous=None):
+        """Stav přímo z těla odpovědi dashboardu (bytes)."""
+        return cls.from_dashboard(json_loads(body)["data"], previous)
+
+    @classmethod
+    def from_dict(cls, state):
+        """Stav ze slovníku (uložený snapshot, viz to_dict)."""
+        return cls(state)
+
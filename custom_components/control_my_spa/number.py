@@ -1,6 +1,6 @@
 from homeassistant.components.number import NumberEntity
 from homeassistant.const import UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from .const import DOMAIN
 from .entity import SpaSubscriberMixin
 import logging
@@ -48,6 +48,7 @@ class SpaTargetDesiredTempNumber(SpaSubscriberMixin, NumberEntity):
 
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"targetDesiredTemp", "celsius"}
         self._attr_device_info = device_info
         self._attr_unique_id = f"number.spa_target_desired_temperature{unique_id_suffix}"
         self.entity_id = self._attr_unique_id
@@ -59,9 +60,10 @@ class SpaTargetDesiredTempNumber(SpaSubscriberMixin, NumberEntity):
         self._pending_value = None
         self._is_processing = False
 
-    async def async_update(self):
+    @callback
+    def handle_spa_state(self, state):
         """Aktualizace hodnoty z datového zdroje."""
-        data = self._shared_data.data
+        data = state
         if data:
             fahrenheit_temp = data.get("targetDesiredTemp")
             if fahrenheit_temp is not None:
@@ -70,7 +72,7 @@ class SpaTargetDesiredTempNumber(SpaSubscriberMixin, NumberEntity):
                     self.native_unit_of_measurement = UnitOfTemperature.CELSIUS
                     self.native_min_value = 10.0
                     self.native_max_value = 40.0
-                    self._state = round((fahrenheit_temp - 32) * 5.0 / 9.0, 1)
+                    self._state = data.target_desired_temp_c
                     _LOGGER.debug(
                         "Updated target temperature: %s °C", self._state
                     )
@@ -156,34 +158,32 @@ class SpaTargetDesiredTempNumber(SpaSubscriberMixin, NumberEntity):
             return
 
         self._is_processing = True
-        try:
-            self._shared_data.pause_updates()
-            
-            # Převést hodnotu na Fahrenheit podle aktuální jednotky
-            if self.native_unit_of_measurement == UnitOfTemperature.CELSIUS:
-                fahrenheit_temp = round(value * 9.0 / 5.0 + 32, 1)
-                unit_symbol = "°C"
-            else:
-                fahrenheit_temp = value
-                unit_symbol = "°F"
+        async with self._shared_data.command_lease():
+            try:
+                # Převést hodnotu na Fahrenheit podle aktuální jednotky
+                if self.native_unit_of_measurement == UnitOfTemperature.CELSIUS:
+                    fahrenheit_temp = round(value * 9.0 / 5.0 + 32, 1)
+                    unit_symbol = "°C"
+                else:
+                    fahrenheit_temp = value
+                    unit_symbol = "°F"
                 
-            success = await self._shared_data._client.setTemp(fahrenheit_temp)
+                success = await self._shared_data._client.setTemp(fahrenheit_temp)
 
-            if success:
-                self._state = value
-                _LOGGER.info("Set target temperature to %s %s", value, unit_symbol)
-            else:
-                _LOGGER.error(
-                    "Failed to set target temperature to %s %s", value, unit_symbol
-                )
+                if success:
+                    self._state = value
+                    _LOGGER.info("Set target temperature to %s %s", value, unit_symbol)
+                else:
+                    _LOGGER.error(
+                        "Failed to set target temperature to %s %s", value, unit_symbol
+                    )
 
-            await self._shared_data.async_force_update()
+                await self._shared_data.async_force_update()
 
-        except Exception as e:
-            _LOGGER.exception("Error setting temperature: %s", e)
-        finally:
-            self._shared_data.resume_updates()
-            self._is_processing = False
+            except Exception as e:
+                _LOGGER.exception("Error setting temperature: %s", e)
+            finally:
+                self._is_processing = False
 
     def set_debounce_delay(self, delay: float):
         """Změní zpoždění debounce mechanismu."""
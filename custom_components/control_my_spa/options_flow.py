@@ -75,6 +75,13 @@ class ControlMySpaOptionsFlowHandler(config_entries.OptionsFlow):
                 config_key,
                 default=current_config.get(config_key, 2200)
             )] = vol.All(vol.Coerce(int), vol.Range(min=0, max=10000))
+            # Volitelný výkon pro nižší rychlosti (prázdné = stejný jako plný výkon)
+            for speed in ("low", "med"):
+                speed_key = f"pump_{i}_{speed}_power_watts"
+                schema_dict[vol.Optional(
+                    speed_key,
+                    description={"suggested_value": current_config.get(speed_key)}
+                )] = vol.All(vol.Coerce(int), vol.Range(min=0, max=10000))
         
         # Přidat položky pro heatery
         # Home Assistant automaticky použije překlady z translations/{lang}.json
@@ -118,6 +125,26 @@ class ControlMySpaOptionsFlowHandler(config_entries.OptionsFlow):
             default=current_config.get("enable_temp_change_notification", True),
         )] = cv.boolean
 
+        # Import hodinových statistik energie a teploty do recorderu (méně zápisů stavu)
+        schema_dict[vol.Optional(
+            "import_long_term_statistics",
+            default=current_config.get("import_long_term_statistics", False),
+        )] = cv.boolean
+
+        # Adaptivní interval čtení z cloudu (vypnuto = pevný interval z nastavení integrace) a jeho meze (s)
+        schema_dict[vol.Optional(
+            "adaptive_polling",
+            default=current_config.get("adaptive_polling", False),
+        )] = cv.boolean
+        schema_dict[vol.Optional(
+            "min_poll_interval_seconds",
+            default=current_config.get("min_poll_interval_seconds", 30)
+        )] = vol.All(vol.Coerce(int), vol.Range(min=10, max=3600))
+        schema_dict[vol.Optional(
+            "max_poll_interval_seconds",
+            default=current_config.get("max_poll_interval_seconds", 900)
+        )] = vol.All(vol.Coerce(int), vol.Range(min=60, max=86400))
+
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(schema_dict),
@@ -0,0 +1,294 @@
+"""Paleta barev TZL (tzlColors) s předpočítanými indexy.
+
+TzlPalette se sestavuje jen při změně palety (viz SpaData.palette) a drží
+přesný index RGB -> colorId, cache nejbližších barev podle RGB
+a lokalizované popisky voleb pro select barev.
+"""
+
+# Lokalizované názvy barev s emoji (chybějící jazyk -> čeština)
+_COLOR_NAMES = {
+    "white": {
+        "cs": "⚪ Bílá",
+        "en": "⚪ White", 
+        "de": "⚪ Weiß"
+    },
+    "red": {
+        "cs": "🔴 Červená",
+        "en": "🔴 Red",
+        "de": "🔴 Rot"
+    },
+    "green": {
+        "cs": "🟢 Zelená",
+        "en": "🟢 Green",
+        "de": "🟢 Grün"
+    },
+    "blue": {
+        "cs": "🔵 Modrá",
+        "en": "🔵 Blue",
+        "de": "🔵 Blau"
+    },
+    "yellow": {
+        "cs": "🟡 Žlutá",
+        "en": "🟡 Yellow",
+        "de": "🟡 Gelb"
+    },
+    "purple": {
+        "cs": "🟣 Fialová",
+        "en": "🟣 Purple",
+        "de": "🟣 Lila"
+    },
+    "cyan": {
+        "cs": "🔵 Azurová",
+        "en": "🔵 Cyan",
+        "de": "🔵 Cyan"
+    },
+    "black": {
+        "cs": "⚫ Černá",
+        "en": "⚫ Black",
+        "de": "⚫ Schwarz"
+    },
+    "light_gray": {
+        "cs": "⚪ Světle šedá",
+        "en": "⚪ Light Gray",
+        "de": "⚪ Hellgrau"
+    },
+    "dark_gray": {
+        "cs": "⚫ Tmavě šedá",
+        "en": "⚫ Dark Gray",
+        "de": "⚫ Dunkelgrau"
+    },
+    "light_red": {
+        "cs": "🔴 Světle červená",
+        "en": "🔴 Light Red",
+        "de": "🔴 Hellrot"
+    },
+    "light_green": {
+        "cs": "🟢 Světle zelená",
+        "en": "🟢 Light Green",
+        "de": "🟢 Hellgrün"
+    },
+    "light_blue": {
+        "cs": "🔵 Světle modrá",
+        "en": "🔵 Light Blue",
+        "de": "🔵 Hellblau"
+    },
+    "light_yellow": {
+        "cs": "🟡 Světle žlutá",
+        "en": "🟡 Light Yellow",
+        "de": "🟡 Hellgelb"
+    },
+    "light_purple": {
+        "cs": "🟣 Světle fialová",
+        "en": "🟣 Light Purple",
+        "de": "🟣 Helllila"
+    },
+    "light_cyan": {
+        "cs": "🔵 Světle azurová",
+        "en": "🔵 Light Cyan",
+        "de": "🔵 Hellcyan"
+    },
+    "orange": {
+        "cs": "🟠 Oranžová",
+        "en": "🟠 Orange",
+        "de": "🟠 Orange"
+    },
+    "lime": {
+        "cs": "🟢 Limetková",
+        "en": "🟢 Lime",
+        "de": "🟢 Limette"
+    },
+    "mint": {
+        "cs": "🟢 Mátová",
+        "en": "🟢 Mint",
+        "de": "🟢 Minze"
+    },
+    "pink": {
+        "cs": "🩷 Růžová",
+        "en": "🩷 Pink",
+        "de": "🩷 Rosa"
+    },
+    "magenta": {
+        "cs": "🟣 Magenta",
+        "en": "🟣 Magenta",
+        "de": "🟣 Magenta"
+    },
+    "dark_pink": {
+        "cs": "🩷 Tmavě růžová",
+        "en": "🩷 Dark Pink",
+        "de": "🩷 Dunkelrosa"
+    }
+}
+
+
+# Maximální počet oblíbených barev převzatých z palety
+MAX_FAVORITE_COLORS = 8
+# Omezení cache popisků a nejbližších barev (zóna v režimu PARTY apod. může hlásit libovolné RGB)
+_LABEL_CACHE_SIZE = 256
+_NEAREST_CACHE_SIZE = 256
+
+
+def localized_color(color_key, language):
+    """Vrátí lokalizovaný název barvy s emoji."""
+    return _COLOR_NAMES.get(color_key, {}).get(language, _COLOR_NAMES[color_key]["cs"])
+
+
+def _color_key(red, green, blue):
+    """Klíč názvu barvy podle RGB, nebo None pro barvy bez názvu."""
+    # Základní barvy (přesné shody)
+    if red == 255 and green == 255 and blue == 255:
+        return "white"
+    elif red == 255 and green == 0 and blue == 0:
+        return "red"
+    elif red == 0 and green == 255 and blue == 0:
+        return "green"
+    elif red == 0 and green == 0 and blue == 255:
+        return "blue"
+    elif red == 255 and green == 255 and blue == 0:
+        return "yellow"
+    elif red == 255 and green == 0 and blue == 255:
+        return "purple"
+    elif red == 0 and green == 255 and blue == 255:
+        return "cyan"
+    elif red == 0 and green == 0 and blue == 0:
+        return "black"
+
+    # Rozšířené barvy (přibližné shody)
+    elif red > 200 and green > 200 and blue > 200:
+        return "light_gray"
+    elif red < 50 and green < 50 and blue < 50:
+        return "dark_gray"
+    elif red > 200 and green < 100 and blue < 100:
+        return "pink"
+    elif red < 100 and green > 200 and blue < 100:
+        return "light_green"
+    elif red < 100 and green < 100 and blue > 200:
+        return "light_blue"
+    elif red > 200 and green > 200 and blue < 100:
+        return "light_yellow"
+    elif red > 200 and green < 100 and blue > 200:
+        return "light_purple"
+    elif red < 100 and green > 200 and blue > 200:
+        return "light_cyan"
+
+    # Smíšené barvy
+    elif red > 150 and green > 100 and blue < 100:
+        return "orange"
+    elif red > 100 and green > 150 and blue < 100:
+        return "lime"
+    elif red < 100 and green > 150 and blue > 100:
+        return "mint"
+    elif red > 100 and green < 100 and blue > 150:
+        return "purple"
+    elif red > 150 and green < 100 and blue > 100:
+        return "magenta"
+
+    # Specifické barvy z TZL
+    elif red == 177 and green == 0 and blue == 255:
+        return "dark_pink"
+    elif red == 255 and green == 0 and blue == 92:
+        return "purple"
+    elif red == 83 and green == 106 and blue == 255:
+        return "light_blue"
+    return None
+
+
+def color_name(red, green, blue, language):
+    """Vrátí název barvy na základě RGB hodnot."""
+    key = _color_key(red, green, blue)
+    if key is None:
+        # Pro ostatní barvy použít RGB hodnoty
+        return f"RGB({red},{green},{blue})"
+    return localized_color(key, language)
+
+
+def color_label(red, green, blue, language):
+    """Popisek volby select barvy, např. "🔴 Red (RGB: 255,0,0)"."""
+    return f"{color_name(red, green, blue, language)} (RGB: {red},{green},{blue})"
+
+
+def palette_fingerprint(tzl_colors) -> tuple:
+    """Otisk palety - colorId a RGB všech barev."""
+    return tuple(
+        (color.get("colorId"), color.get("red", 0), color.get("green", 0), color.get("blue", 0))
+        for color in tzl_colors
+    )
+
+
+class TzlPalette:
+    """Index jedné palety tzlColors (po sestavení se nemění)."""
+
+    def __init__(self, tzl_colors):
+        self.colors = list(tzl_colors)
+        self.fingerprint = palette_fingerprint(self.colors)
+        self._id_by_rgb = {}
+        self._rgb_by_id = {}
+        for color_id, red, green, blue in self.fingerprint:
+            self._id_by_rgb.setdefault((red, green, blue), color_id)
+            self._rgb_by_id.setdefault(color_id, (red, green, blue))
+        self.rgb_colors = [(red, green, blue) for _, red, green, blue in self.fingerprint]
+        # Formát jako v ukázkovém kódu: {"rgb_color": [R, G, B]}
+        self.favorite_colors = [
+            {"rgb_color": list(rgb)} for rgb in self.rgb_colors[:MAX_FAVORITE_COLORS]
+        ]
+        self._nearest = {}  # RGB -> colorId nejbližší barvy (plní se líně)
+        self._labels = {}  # jazyk -> (volby, popisek -> colorId)
+        self._label_cache = {}  # (jazyk, rgb) -> popisek
+
+    def __len__(self):
+        return len(self.colors)
+
+    def color_id(self, rgb):
+        """colorId barvy s přesně tímto RGB, nebo None."""
+        return self._id_by_rgb.get(tuple(rgb))
+
+    def rgb(self, color_id):
+        """RGB barvy podle colorId, nebo None."""
+        return self._rgb_by_id.get(color_id)
+
+    def nearest_color_id(self, rgb):
+        """colorId přesné nebo nejbližší barvy (euklidovská vzdálenost RGB), None pro prázdnou paletu.
+
+        Při shodné vzdálenosti vyhrává dřívější barva palety; výsledky se pamatují podle RGB.
+        """
+        rgb = tuple(rgb)
+        exact = self._id_by_rgb.get(rgb)
+        if exact is not None or not self._id_by_rgb:
+            return exact
+        color_id = self._nearest.get(rgb)
+        if color_id is None:
+            best, best_distance = None, None
+            for color in self.rgb_colors:
+                distance = sum((a - b) ** 2 for a, b in zip(rgb, color))
+                if best_distance is None or distance < best_distance:
+                    best, best_distance = color, distance
+            color_id = self._id_by_rgb[best]
+            if len(self._nearest) < _NEAREST_CACHE_SIZE:
+                self._nearest[rgb] = color_id
+        return color_id
+
+    def options(self, language):
+        """Volby select barvy ("OFF" + popisky barev) a mapování popisek -> colorId."""
+        cached = self._labels.get(language)
+        if cached is None:
+            options = ["OFF"]  # Vždy přidat možnost vypnutí
+            ids = {"OFF": None}
+            for color_id, red, green, blue in self.fingerprint:
+                option_label = self.label((red, green, blue), language)
+                options.append(option_label)
+                ids[option_label] = color_id
+            cached = self._labels[language] = (options, ids)
+        return cached
+
+    def label(self, rgb, language):
+        """Popisek barvy (i mimo paletu); výsledky se pamatují."""
+        key = (language, tuple(rgb))
+        label = self._label_cache.get(key)
+        if label is None:
+            label = color_label(*rgb, language)
+            if len(self._label_cache) < _LABEL_CACHE_SIZE:
+                self._label_cache[key] = label
+        return label
+
+    def name(self, rgb, language):
+        """Lokalizovaný název barvy."""
+        return color_name(*rgb, language)
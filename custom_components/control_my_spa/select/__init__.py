@@ -1,5 +1,6 @@
 """Select entities for ControlMySpa integration."""
 
+from collections.abc import Mapping
 from datetime import timedelta
 from homeassistant.components.select import SelectEntity
 from homeassistant.helpers.event import async_track_time_interval
@@ -76,7 +77,6 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 
     # Najít všechny TZL zones
     tzl_zones = shared_data.data.get("tzlZones", [])
-    tzl_colors = shared_data.data.get("tzlColors", [])
 
     config_options = config_entry.options or {}
 
@@ -89,7 +89,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     entities.append(SpaTempRangeSelect(shared_data, device_info, unique_id_suffix, hass, config_options))  # Přidat entitu
     entities.append(SpaHeaterModeSelect(shared_data, device_info, unique_id_suffix))  # Přidat entitu pro heater mode
     c8z = shared_data.data.get("c8zCurrentState")
-    if isinstance(c8z, dict) and is_c8z_installed(c8z):
+    if isinstance(c8z, Mapping) and is_c8z_installed(c8z):
         # Každý select jen pokud API vrátí daný klíč v c8zCurrentState (může chybět jen část)
         if "c8zHeater" in c8z:
             entities.append(SpaC8zHeaterSelect(shared_data, device_info, unique_id_suffix))
@@ -98,7 +98,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         if "c8zSpeed" in c8z:
             entities.append(SpaC8zSpeedSelect(shared_data, device_info, unique_id_suffix))
     entities += [SpaTzlZoneModeSelect(shared_data, device_info, unique_id_suffix, tzl_zone_data, len(tzl_zones)) for tzl_zone_data in tzl_zones]
-    entities += [SpaTzlZoneColorSelect(shared_data, device_info, unique_id_suffix, tzl_zone_data, tzl_colors, len(tzl_zones), hass) for tzl_zone_data in tzl_zones]
+    entities += [SpaTzlZoneColorSelect(shared_data, device_info, unique_id_suffix, tzl_zone_data, len(tzl_zones), hass) for tzl_zone_data in tzl_zones]
     entities += [SpaTzlZoneIntensitySelect(shared_data, device_info, unique_id_suffix, tzl_zone_data, len(tzl_zones)) for tzl_zone_data in tzl_zones]
     entities += [SpaTzlZoneSpeedSelect(shared_data, device_info, unique_id_suffix, tzl_zone_data, len(tzl_zones)) for tzl_zone_data in tzl_zones]
 
@@ -15,3 +15,7 @@ class SpaSelectBase(SpaSubscriberMixin, SelectEntity):
         if getattr(self, "_is_processing", False):
             return False
         return self._shared_data.is_remote_control_allowed
+
+    async def _send_commands(self, *commands):
+        """Odešle příkazy (ControlMySpa.*Command) jednou dávkou s jedním obnovením stavu."""
+        return await self._shared_data._client.sendCommands(list(commands))
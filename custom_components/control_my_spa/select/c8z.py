@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 import logging
+from collections.abc import Mapping
 from typing import Any
+from homeassistant.core import callback
 from .base import SpaSelectBase
 
 _LOGGER = logging.getLogger(__name__)
@@ -31,30 +33,30 @@ async def c8z_set_speed(shared_data: Any, option: str) -> dict | None:
 C8Z_STATUS_NOT_PRESENT = "C8Z_STATUS_NOT_PRESENT"
 
 
-def _read_c8z_dict(shared_data: Any) -> dict | None:
+def _read_c8z_dict(shared_data: Any) -> Mapping | None:
     """Vrátí slovník c8zCurrentState nebo None, pokud chybí nebo není dict."""
     data = shared_data.data
     if not data:
         return None
     c8z = data.get("c8zCurrentState")
-    if not isinstance(c8z, dict):
+    if not isinstance(c8z, Mapping):
         if c8z is not None:
             _LOGGER.debug("c8zCurrentState is not a dict, ignoring: %r", type(c8z).__name__)
         return None
     return c8z
 
 
-def is_c8z_installed(c8z: dict) -> bool:
+def is_c8z_installed(c8z: Mapping) -> bool:
     """True pokud cloud hlásí fyzicky přítomné Clim8Zone (ne NOT_PRESENT)."""
     return c8z.get("c8zStatus") != C8Z_STATUS_NOT_PRESENT
 
 
-def _new_state_from_response(response_data: dict | None, field: str) -> str | None:
+def _new_state_from_response(response_data: Mapping | None, field: str) -> str | None:
     """Z odpovědi API vytáhne hodnotu pole z vnořeného c8zCurrentState."""
-    if not isinstance(response_data, dict):
+    if not isinstance(response_data, Mapping):
         return None
     c8z = response_data.get("c8zCurrentState")
-    if not isinstance(c8z, dict):
+    if not isinstance(c8z, Mapping):
         return None
     val = c8z.get(field)
     return val if isinstance(val, str) else None
@@ -70,6 +72,7 @@ class SpaC8zHeaterSelect(SpaSelectBase):
 
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"c8zCurrentState"}
         # Hodnoty API c8zHeater (heaterState)
         self._attr_options = [
             "C8Z_HEATER_AUTO",
@@ -92,7 +95,8 @@ class SpaC8zHeaterSelect(SpaSelectBase):
             return "mdi:sync"
         return "mdi:heat-pump"
 
-    async def async_update(self):
+    @callback
+    def handle_spa_state(self, state):
         c8z = _read_c8z_dict(self._shared_data)
         if not c8z:
             self._attr_current_option = None
@@ -131,17 +135,15 @@ class SpaC8zHeaterSelect(SpaSelectBase):
     async def async_select_option(self, option: str):
         if option not in self._attr_options:
             return
-        try:
-            self._shared_data.pause_updates()
-            success = await self._try_set(option)
-            if not success:
-                _LOGGER.info("Retrying to set C8Z heater to %s", option)
-                await self._try_set(option, True)
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error setting C8Z heater to %s: %s", option, e)
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                success = await self._try_set(option)
+                if not success:
+                    _LOGGER.info("Retrying to set C8Z heater to %s", option)
+                    await self._try_set(option, True)
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error setting C8Z heater to %s: %s", option, e)
 
 
 class SpaC8zModeSelect(SpaSelectBase):
@@ -151,6 +153,7 @@ class SpaC8zModeSelect(SpaSelectBase):
 
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"c8zCurrentState"}
         self._attr_options = [
             "C8Z_MODE_HEAT",
             "C8Z_MODE_BOTH",
@@ -172,7 +175,8 @@ class SpaC8zModeSelect(SpaSelectBase):
             return "mdi:sync"
         return "mdi:heat-pump-outline"
 
-    async def async_update(self):
+    @callback
+    def handle_spa_state(self, state):
         c8z = _read_c8z_dict(self._shared_data)
         if not c8z:
             self._attr_current_option = None
@@ -211,17 +215,15 @@ class SpaC8zModeSelect(SpaSelectBase):
     async def async_select_option(self, option: str):
         if option not in self._attr_options:
             return
-        try:
-            self._shared_data.pause_updates()
-            success = await self._try_set(option)
-            if not success:
-                _LOGGER.info("Retrying to set C8Z mode to %s", option)
-                await self._try_set(option, True)
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error setting C8Z mode to %s: %s", option, e)
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                success = await self._try_set(option)
+                if not success:
+                    _LOGGER.info("Retrying to set C8Z mode to %s", option)
+                    await self._try_set(option, True)
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error setting C8Z mode to %s: %s", option, e)
 
 
 class SpaC8zSpeedSelect(SpaSelectBase):
@@ -231,6 +233,7 @@ class SpaC8zSpeedSelect(SpaSelectBase):
 
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"c8zCurrentState"}
         self._attr_options = [
             "C8Z_SPEED_SMART",
             "C8Z_SPEED_POWERFUL",
@@ -251,7 +254,8 @@ class SpaC8zSpeedSelect(SpaSelectBase):
             return "mdi:sync"
         return "mdi:fan"
 
-    async def async_update(self):
+    @callback
+    def handle_spa_state(self, state):
         c8z = _read_c8z_dict(self._shared_data)
         if not c8z:
             self._attr_current_option = None
@@ -290,14 +294,12 @@ class SpaC8zSpeedSelect(SpaSelectBase):
     async def async_select_option(self, option: str):
         if option not in self._attr_options:
             return
-        try:
-            self._shared_data.pause_updates()
-            success = await self._try_set(option)
-            if not success:
-                _LOGGER.info("Retrying to set C8Z speed to %s", option)
-                await self._try_set(option, True)
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error setting C8Z speed to %s: %s", option, e)
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                success = await self._try_set(option)
+                if not success:
+                    _LOGGER.info("Retrying to set C8Z speed to %s", option)
+                    await self._try_set(option, True)
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error setting C8Z speed to %s: %s", option, e)
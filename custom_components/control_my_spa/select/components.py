@@ -1,6 +1,8 @@
 """Component-related select entities (pump, light, blower)."""
 
+from homeassistant.core import callback
 from .base import SpaSelectBase
+from ..helpers import find_component
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -11,6 +13,7 @@ class SpaPumpSelect(SpaSelectBase):
     
     def __init__(self, shared_data, device_info, unique_id_suffix, pump_data, pump_count):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "PUMP", pump_data["port"])}
         self._pump_data = pump_data
         self._attr_options = pump_data["availableValues"]  # Možnosti výběru
         self._attr_should_poll = False  # Data jsou sdílena, posluchac
@@ -29,14 +32,12 @@ class SpaPumpSelect(SpaSelectBase):
             return "mdi:sync"  # Ikona pro zpracování
         return "mdi:weather-windy"
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající PUMP podle portu
-            pump = next(
-                (comp for comp in data["components"] if comp["componentType"] == "PUMP" and comp["port"] == self._pump_data["port"]),
-                None
-            )
+            pump = find_component(data, "PUMP", self._pump_data["port"])
             if pump:
                 pump_value = pump["value"]
                 # Pokud je hodnota 'LOW'
@@ -72,10 +73,7 @@ class SpaPumpSelect(SpaSelectBase):
             if response_data is None:
                 _LOGGER.warning("Function setJetState, parameter %s is not supported", target_state)
                 return False
-            pump = next(
-                (comp for comp in response_data["components"] if comp["componentType"] == "PUMP" and comp["port"] == self._pump_data["port"]),
-                None
-            )
+            pump = find_component(response_data, "PUMP", self._pump_data["port"])
             new_state = pump["value"] if pump else None
             
             if new_state == target_state:
@@ -105,32 +103,31 @@ class SpaPumpSelect(SpaSelectBase):
         if option not in self._attr_options:
             return
 
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._pump_data["port"])
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._pump_data["port"])
             
-            # První pokus
-            success = await self._try_set_pump_state(device_number, option)
+                # První pokus
+                success = await self._try_set_pump_state(device_number, option)
             
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to set pump %s to %s", self._pump_data["port"], option)
-                success = await self._try_set_pump_state(device_number, option, True)
+                # Druhý pokus pokud první selhal
+                if not success:
+                    _LOGGER.info("Retrying to set pump %s to %s", self._pump_data["port"], option)
+                    success = await self._try_set_pump_state(device_number, option, True)
                 
-            await self._shared_data.async_force_update()
-        except ValueError as ve:
-            _LOGGER.error("Invalid port value for pump: %s", self._pump_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error setting pump (port %s) to %s: %s", self._pump_data["port"], option, str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except ValueError as ve:
+                _LOGGER.error("Invalid port value for pump: %s", self._pump_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error setting pump (port %s) to %s: %s", self._pump_data["port"], option, str(e))
+                raise
 
 class SpaLightSelect(SpaSelectBase):
     """Select entity for spa light."""
     
     def __init__(self, shared_data, device_info, unique_id_suffix, light_data, light_count):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "LIGHT", light_data["port"])}
         self._light_data = light_data
         self._attr_options = light_data["availableValues"]  # Možnosti výběru
         self._attr_should_poll = False  # Data jsou sdílena, posluchac
@@ -149,14 +146,12 @@ class SpaLightSelect(SpaSelectBase):
             return "mdi:sync"  # Ikona pro zpracování
         return "mdi:lightbulb"
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající LIGHT podle portu
-            light = next(
-                (comp for comp in data["components"] if comp["componentType"] == "LIGHT" and comp["port"] == self._light_data["port"]),
-                None
-            )
+            light = find_component(data, "LIGHT", self._light_data["port"])
             if light:
                 self._attr_current_option = light["value"]
                 _LOGGER.debug("Updated Light %s: %s", self._light_data["port"], self._attr_current_option)
@@ -171,10 +166,7 @@ class SpaLightSelect(SpaSelectBase):
             if response_data is None:
                 _LOGGER.warning("Function setLightState, parameter %s is not supported", target_state)
                 return False
-            light = next(
-                (comp for comp in response_data["components"] if comp["componentType"] == "LIGHT" and comp["port"] == self._light_data["port"]),
-                None
-            )
+            light = find_component(response_data, "LIGHT", self._light_data["port"])
             new_state = light["value"] if light else None
             
             if new_state == target_state:
@@ -204,32 +196,31 @@ class SpaLightSelect(SpaSelectBase):
         if option not in self._attr_options:
             return
 
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._light_data["port"])
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._light_data["port"])
             
-            # První pokus
-            success = await self._try_set_light_state(device_number, option)
+                # První pokus
+                success = await self._try_set_light_state(device_number, option)
             
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to set light %s to %s", self._light_data["port"], option)
-                success = await self._try_set_light_state(device_number, option, True)
+                # Druhý pokus pokud první selhal
+                if not success:
+                    _LOGGER.info("Retrying to set light %s to %s", self._light_data["port"], option)
+                    success = await self._try_set_light_state(device_number, option, True)
                 
-            await self._shared_data.async_force_update()
-        except ValueError as ve:
-            _LOGGER.error("Invalid port value for light: %s", self._light_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error setting light (port %s) to %s: %s", self._light_data["port"], option, str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except ValueError as ve:
+                _LOGGER.error("Invalid port value for light: %s", self._light_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error setting light (port %s) to %s: %s", self._light_data["port"], option, str(e))
+                raise
 
 class SpaBlowerSelect(SpaSelectBase):
     """Select entity for spa blower."""
     
     def __init__(self, shared_data, device_info, unique_id_suffix, blower_data, blower_count):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "BLOWER", blower_data["port"])}
         self._blower_data = blower_data
         self._attr_options = blower_data["availableValues"]  # Možnosti výběru
         self._attr_should_poll = False  # Data jsou sdílena, posluchac
@@ -248,14 +239,12 @@ class SpaBlowerSelect(SpaSelectBase):
             return "mdi:sync"  # Ikona pro zpracování
         return "mdi:weather-dust"
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající BLOWER podle portu
-            blower = next(
-                (comp for comp in data["components"] if comp["componentType"] == "BLOWER" and comp["port"] == self._blower_data["port"]),
-                None
-            )
+            blower = find_component(data, "BLOWER", self._blower_data["port"])
             if blower:
                 self._attr_current_option = blower["value"]
                 _LOGGER.debug("Updated Blower %s: %s", self._blower_data["port"], self._attr_current_option)
@@ -270,10 +259,7 @@ class SpaBlowerSelect(SpaSelectBase):
             if response_data is None:
                 _LOGGER.warning("Function setBlowerState, parameter %s is not supported", target_state)
                 return False
-            blower = next(
-                (comp for comp in response_data["components"] if comp["componentType"] == "BLOWER" and comp["port"] == self._blower_data["port"]),
-                None
-            )
+            blower = find_component(response_data, "BLOWER", self._blower_data["port"])
             new_state = blower["value"] if blower else None
             
             if new_state == target_state:
@@ -303,23 +289,21 @@ class SpaBlowerSelect(SpaSelectBase):
         if option not in self._attr_options:
             return
 
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._blower_data["port"])
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._blower_data["port"])
             
-            # První pokus
-            success = await self._try_set_blower_state(device_number, option)
+                # První pokus
+                success = await self._try_set_blower_state(device_number, option)
             
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to set blower %s to %s", self._blower_data["port"], option)
-                success = await self._try_set_blower_state(device_number, option, True)
+                # Druhý pokus pokud první selhal
+                if not success:
+                    _LOGGER.info("Retrying to set blower %s to %s", self._blower_data["port"], option)
+                    success = await self._try_set_blower_state(device_number, option, True)
                 
-            await self._shared_data.async_force_update()
-        except ValueError as ve:
-            _LOGGER.error("Invalid port value for blower: %s", self._blower_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error setting blower (port %s) to %s: %s", self._blower_data["port"], option, str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except ValueError as ve:
+                _LOGGER.error("Invalid port value for blower: %s", self._blower_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error setting blower (port %s) to %s: %s", self._blower_data["port"], option, str(e))
+                raise
@@ -3,8 +3,10 @@
 import logging
 
 from homeassistant.const import EntityCategory
+from homeassistant.core import callback
 
 from .base import SpaSelectBase
+from ..helpers import find_component
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,6 +16,7 @@ class SpaFilterTimeSelect(SpaSelectBase):
     
     def __init__(self, shared_data, device_info, unique_id_suffix, filter_data, count_filter):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "FILTER", filter_data["port"])}
         self._filter_data = filter_data
         self._attr_options = shared_data._client.createTimeOptions()  # Použít metodu z ControlMySpa
         self._attr_should_poll = False  # Data jsou sdílena, posluchač
@@ -41,18 +44,12 @@ class SpaFilterTimeSelect(SpaSelectBase):
             return "mdi:sync"  # Ikona pro zpracování
         return "mdi:clock-outline"
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající FILTER podle portu
-            filter_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "FILTER" and comp["port"] == self._filter_data["port"]
-                ),
-                None,
-            )
+            filter_comp = find_component(data, "FILTER", self._filter_data["port"])
             if filter_comp:
                 # Sestavit čas z hour a minute
                 hour = filter_comp.get('hour', 0)
@@ -72,14 +69,7 @@ class SpaFilterTimeSelect(SpaSelectBase):
             
             # Získání numOfIntervals z aktuálních dat filtru
             data = self._shared_data.data
-            filter_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "FILTER" and comp["port"] == self._filter_data["port"]
-                ),
-                None,
-            )
+            filter_comp = find_component(data, "FILTER", self._filter_data["port"])
             
             if not filter_comp:
                 _LOGGER.error("Filter component not found for port %s", self._filter_data["port"])
@@ -106,14 +96,7 @@ class SpaFilterTimeSelect(SpaSelectBase):
             
             if response_data:
                 # Najít odpovídající FILTER v odpovědi
-                filter_comp = next(
-                    (
-                        comp
-                        for comp in response_data["components"]
-                        if comp["componentType"] == "FILTER" and comp["port"] == self._filter_data["port"]
-                    ),
-                    None,
-                )
+                filter_comp = find_component(response_data, "FILTER", self._filter_data["port"])
                 
                 if filter_comp:
                     # Sestavit čas z odpovědi
@@ -163,29 +146,27 @@ class SpaFilterTimeSelect(SpaSelectBase):
         if option not in self._attr_options:
             return
 
-        try:
-            self._shared_data.pause_updates()
+        async with self._shared_data.command_lease():
+            try:
+                # První pokus
+                success = await self._try_set_filter_time(option)
             
-            # První pokus
-            success = await self._try_set_filter_time(option)
-            
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to set filter %s time to %s", self._filter_data["port"], option)
-                success = await self._try_set_filter_time(option, True)
+                # Druhý pokus pokud první selhal
+                if not success:
+                    _LOGGER.info("Retrying to set filter %s time to %s", self._filter_data["port"], option)
+                    success = await self._try_set_filter_time(option, True)
                 
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error setting filter time (port %s) to %s: %s", self._filter_data["port"], option, str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error setting filter time (port %s) to %s: %s", self._filter_data["port"], option, str(e))
+                raise
 
 class SpaFilterDurationSelect(SpaSelectBase):
     """Select entity for spa filter duration."""
     
     def __init__(self, shared_data, device_info, unique_id_suffix, filter_data, count_filter):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "FILTER", filter_data["port"])}
         self._filter_data = filter_data
         self._attr_options = shared_data._client.createDurationOptions()  # Použít metodu z ControlMySpa
         self._attr_should_poll = False  # Data jsou sdílena, posluchač
@@ -243,18 +224,12 @@ class SpaFilterDurationSelect(SpaSelectBase):
         
         return total_minutes
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající FILTER podle portu
-            filter_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "FILTER" and comp["port"] == self._filter_data["port"]
-                ),
-                None,
-            )
+            filter_comp = find_component(data, "FILTER", self._filter_data["port"])
             if filter_comp:
                 # Převedení durationMinutes na řetězec
                 duration_minutes = filter_comp.get('durationMinutes', 120)
@@ -274,14 +249,7 @@ class SpaFilterDurationSelect(SpaSelectBase):
             
             # Získání aktuálního času filtru
             data = self._shared_data.data
-            filter_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "FILTER" and comp["port"] == self._filter_data["port"]
-                ),
-                None,
-            )
+            filter_comp = find_component(data, "FILTER", self._filter_data["port"])
             
             if not filter_comp:
                 _LOGGER.error("Filter component not found for port %s", self._filter_data["port"])
@@ -308,14 +276,7 @@ class SpaFilterDurationSelect(SpaSelectBase):
             
             if response_data:
                 # Najít odpovídající FILTER v odpovědi
-                filter_comp = next(
-                    (
-                        comp
-                        for comp in response_data["components"]
-                        if comp["componentType"] == "FILTER" and comp["port"] == self._filter_data["port"]
-                    ),
-                    None,
-                )
+                filter_comp = find_component(response_data, "FILTER", self._filter_data["port"])
                 
                 if filter_comp:
                     # Zkontrolovat, jestli se délka nastavila správně
@@ -364,20 +325,17 @@ class SpaFilterDurationSelect(SpaSelectBase):
         if option not in self._attr_options:
             return
 
-        try:
-            self._shared_data.pause_updates()
+        async with self._shared_data.command_lease():
+            try:
+                # První pokus
+                success = await self._try_set_filter_duration(option)
             
-            # První pokus
-            success = await self._try_set_filter_duration(option)
-            
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to set filter %s duration to %s", self._filter_data["port"], option)
-                success = await self._try_set_filter_duration(option, True)
+                # Druhý pokus pokud první selhal
+                if not success:
+                    _LOGGER.info("Retrying to set filter %s duration to %s", self._filter_data["port"], option)
+                    success = await self._try_set_filter_duration(option, True)
                 
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error setting filter duration (port %s) to %s: %s", self._filter_data["port"], option, str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error setting filter duration (port %s) to %s: %s", self._filter_data["port"], option, str(e))
+                raise
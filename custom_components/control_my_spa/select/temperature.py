@@ -5,6 +5,7 @@ import time
 
 from homeassistant.components import persistent_notification
 from homeassistant.helpers import translation
+from homeassistant.core import callback
 
 from ..const import DOMAIN
 from .base import SpaSelectBase
@@ -17,6 +18,7 @@ class SpaTempRangeSelect(SpaSelectBase):
     
     def __init__(self, shared_data, device_info, unique_id_suffix, hass, config_options=None):
         self._shared_data = shared_data
+        self._spa_dependencies = {"tempRange"}
         self._hass = hass  # Uložit hass objekt pro notifikace
         self._config_options = config_options or {}
         self._attr_options = ["HIGH", "LOW"]  # Možnosti výběru
@@ -35,8 +37,9 @@ class SpaTempRangeSelect(SpaSelectBase):
             return "mdi:sync"  # Ikona pro zpracování
         return "mdi:pool-thermometer"
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             self._attr_current_option = data.get("tempRange")
             _LOGGER.debug("Updated tempRange: %s", self._attr_current_option)
@@ -78,7 +81,7 @@ class SpaTempRangeSelect(SpaSelectBase):
                         # Získat novou hodnotu desiredTemp z odpovědi
                         new_desired_temp_f = response_data.get("desiredTemp")
                         if new_desired_temp_f is not None and current_high_range_temp is not None:
-                            new_desired_temp_c = round((new_desired_temp_f - 32) * 5.0 / 9.0, 1)
+                            new_desired_temp_c = response_data.desired_temp_c
                             
                             # Porovnat hodnoty a zkontrolovat, zda je notifikace zapnutá v options
                             if (
@@ -142,29 +145,27 @@ class SpaTempRangeSelect(SpaSelectBase):
         if option not in self._attr_options:
             return
 
-        try:
-            self._shared_data.pause_updates()
-            
-            # První pokus
-            success = await self._try_set_temp_range(option)
+        async with self._shared_data.command_lease():
+            try:
+                # První pokus
+                success = await self._try_set_temp_range(option)
             
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to set temperature range to %s", option)
-                success = await self._try_set_temp_range(option, True)
+                # Druhý pokus pokud první selhal
+                if not success:
+                    _LOGGER.info("Retrying to set temperature range to %s", option)
+                    success = await self._try_set_temp_range(option, True)
                 
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error setting temperature range to %s: %s", option, str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error setting temperature range to %s: %s", option, str(e))
+                raise
 
 class SpaHeaterModeSelect(SpaSelectBase):
     """Select entity for spa heater mode."""
     
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"heaterMode"}
         self._attr_options = ["READY", "REST", "READY_REST"]  
         self._attr_should_poll = False
         self._attr_current_option = None
@@ -181,8 +182,9 @@ class SpaHeaterModeSelect(SpaSelectBase):
             return "mdi:sync"  # Ikona pro zpracování
         return "mdi:radiator"
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             self._attr_current_option = data.get("heaterMode")
             _LOGGER.debug("Updated heaterMode: %s", self._attr_current_option)
@@ -225,20 +227,17 @@ class SpaHeaterModeSelect(SpaSelectBase):
         if option not in self._attr_options:
             return
 
-        try:
-            self._shared_data.pause_updates()
-
-            # První pokus
-            success = await self._try_set_heater_mode(option)
+        async with self._shared_data.command_lease():
+            try:
+                # První pokus
+                success = await self._try_set_heater_mode(option)
 
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to set heater mode to %s", option)
-                success = await self._try_set_heater_mode(option, True)
+                # Druhý pokus pokud první selhal
+                if not success:
+                    _LOGGER.info("Retrying to set heater mode to %s", option)
+                    success = await self._try_set_heater_mode(option, True)
 
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error setting heater mode to %s: %s", option, str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error setting heater mode to %s: %s", option, str(e))
+                raise
@@ -1,6 +1,8 @@
 """TZL (Therapeutic Zone Lighting) related select entities."""
 
+from homeassistant.core import callback
 from .base import SpaSelectBase
+from ..helpers import find_tzl_zone
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -11,6 +13,7 @@ class SpaTzlZoneModeSelect(SpaSelectBase):
     
     def __init__(self, shared_data, device_info, unique_id_suffix, tzl_zone_data, count_tzl_zones):
         self._shared_data = shared_data
+        self._spa_dependencies = {("tzlZone", tzl_zone_data["zoneId"])}
         self._tzl_zone_data = tzl_zone_data
         self._attr_options = ["OFF", "PARTY", "RELAX", "WHEEL", "NORMAL"]  # Pevné možnosti
         self._attr_should_poll = False  # Data jsou sdílena, posluchač
@@ -37,18 +40,12 @@ class SpaTzlZoneModeSelect(SpaSelectBase):
             return "mdi:sync"  # Ikona pro zpracování
         return "mdi:lightbulb"
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající TZL zone podle zoneId
-            tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
+            tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             if tzl_zone:
                 self._attr_current_option = tzl_zone["state"]
                 _LOGGER.debug("Updated TZL Zone Mode %s: %s", self._tzl_zone_data["zoneId"], self._attr_current_option)
@@ -61,9 +58,10 @@ class SpaTzlZoneModeSelect(SpaSelectBase):
         try:
             # Pro NORMAL se volá setChromazoneColor s color_id=0
             if target_state == "NORMAL":
-                response_data = await self._shared_data._client.setChromazoneColor(
-                    0, 
-                    self._tzl_zone_data["zoneId"]
+                response_data = await self._send_commands(
+                    self._shared_data._client.chromazoneColorCommand(
+                        0, self._tzl_zone_data["zoneId"]
+                    )
                 )
                 
                 if response_data is None:
@@ -71,9 +69,10 @@ class SpaTzlZoneModeSelect(SpaSelectBase):
                     return False
             else:
                 # Pro ostatní stavy se volá setChromazoneFunction
-                response_data = await self._shared_data._client.setChromazoneFunction(
-                    target_state, 
-                    self._tzl_zone_data["zoneId"]
+                response_data = await self._send_commands(
+                    self._shared_data._client.chromazoneFunctionCommand(
+                        target_state, self._tzl_zone_data["zoneId"]
+                    )
                 )
                 
                 if response_data is None:
@@ -82,14 +81,7 @@ class SpaTzlZoneModeSelect(SpaSelectBase):
             
             if response_data:
                 # Najít odpovídající TZL zone v odpovědi
-                tzl_zone = next(
-                    (
-                        zone
-                        for zone in response_data.get("tzlZones", [])
-                        if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                    ),
-                    None,
-                )
+                tzl_zone = find_tzl_zone(response_data, self._tzl_zone_data["zoneId"])
                 new_state = tzl_zone["state"] if tzl_zone else None
                 
                 if new_state == target_state:
@@ -131,37 +123,27 @@ class SpaTzlZoneModeSelect(SpaSelectBase):
         if option not in self._attr_options:
             return
 
-        try:
-            self._shared_data.pause_updates()
-            
-            # První pokus
-            success = await self._try_set_tzl_zone_mode(option)
+        async with self._shared_data.command_lease():
+            try:
+                # První pokus
+                success = await self._try_set_tzl_zone_mode(option)
             
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to set TZL zone %s to %s", self._tzl_zone_data["zoneId"], option)
-                success = await self._try_set_tzl_zone_mode(option, True)
+                # Druhý pokus pokud první selhal
+                if not success:
+                    _LOGGER.info("Retrying to set TZL zone %s to %s", self._tzl_zone_data["zoneId"], option)
+                    success = await self._try_set_tzl_zone_mode(option, True)
                 
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error setting TZL zone (ID %s) to %s: %s", self._tzl_zone_data["zoneId"], option, str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error setting TZL zone (ID %s) to %s: %s", self._tzl_zone_data["zoneId"], option, str(e))
+                raise
 
     @property
     def extra_state_attributes(self):
         data = self._shared_data.data
         if data:
             # Najít odpovídající TZL zone podle zoneId
-            tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
+            tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             if tzl_zone:
                 attrs = {
                     "zone_name": tzl_zone.get("zoneName"),
@@ -174,10 +156,10 @@ class SpaTzlZoneColorSelect(SpaSelectBase):
     
     _attr_has_entity_name = True
 
-    def __init__(self, shared_data, device_info, unique_id_suffix, tzl_zone_data, tzl_colors, count_tzl_zones, hass):
+    def __init__(self, shared_data, device_info, unique_id_suffix, tzl_zone_data, count_tzl_zones, hass):
         self._shared_data = shared_data
+        self._spa_dependencies = {("tzlZone", tzl_zone_data["zoneId"]), "tzlColors"}
         self._tzl_zone_data = tzl_zone_data
-        self._tzl_colors = tzl_colors
         self._hass = hass
         self._attr_device_info = device_info
         self._attr_should_poll = False
@@ -195,216 +177,27 @@ class SpaTzlZoneColorSelect(SpaSelectBase):
             else f"tzl_color_select_{tzl_zone_data['zoneId']}"
         )
         self.entity_id = self._attr_unique_id
-        self._options = self._create_color_options()
+        self._palette = None  # TzlPalette, ze které jsou aktuální volby
+        self._options = []
+        self._color_ids = {}  # popisek volby -> colorId
+        self._refresh_options()
 
-    def _create_color_options(self):
-        """Vytvoří seznam možností barev z tzlColors."""
-        options = ["OFF"]  # Vždy přidat možnost vypnutí
-        self._color_options_data = {"OFF": {"color_id": None, "rgb": (0,0,0), "name": "OFF"}}
-        
-        for color in self._tzl_colors:
-            color_id = color.get("colorId")
-            red = color.get("red", 0)
-            green = color.get("green", 0)
-            blue = color.get("blue", 0)
-            
-            # Vytvořit název barvy
-            color_name = self._get_color_name(red, green, blue)
-            option_label = f"{color_name} (RGB: {red},{green},{blue})"
-            
-            options.append(option_label)
-            self._color_options_data[option_label] = {
-                "color_id": color_id,
-                "rgb": (red, green, blue),
-                "name": color_name
-            }
-            
-        return options
-
-    def _get_localized_color(self, color_key, language):
-        """Vrátí lokalizovaný název barvy s emoji."""
-        colors = {
-            "white": {
-                "cs": "⚪ Bílá",
-                "en": "⚪ White", 
-                "de": "⚪ Weiß"
-            },
-            "red": {
-                "cs": "🔴 Červená",
-                "en": "🔴 Red",
-                "de": "🔴 Rot"
-            },
-            "green": {
-                "cs": "🟢 Zelená",
-                "en": "🟢 Green",
-                "de": "🟢 Grün"
-            },
-            "blue": {
-                "cs": "🔵 Modrá",
-                "en": "🔵 Blue",
-                "de": "🔵 Blau"
-            },
-            "yellow": {
-                "cs": "🟡 Žlutá",
-                "en": "🟡 Yellow",
-                "de": "🟡 Gelb"
-            },
-            "purple": {
-                "cs": "🟣 Fialová",
-                "en": "🟣 Purple",
-                "de": "🟣 Lila"
-            },
-            "cyan": {
-                "cs": "🔵 Azurová",
-                "en": "🔵 Cyan",
-                "de": "🔵 Cyan"
-            },
-            "black": {
-                "cs": "⚫ Černá",
-                "en": "⚫ Black",
-                "de": "⚫ Schwarz"
-            },
-            "light_gray": {
-                "cs": "⚪ Světle šedá",
-                "en": "⚪ Light Gray",
-                "de": "⚪ Hellgrau"
-            },
-            "dark_gray": {
-                "cs": "⚫ Tmavě šedá",
-                "en": "⚫ Dark Gray",
-                "de": "⚫ Dunkelgrau"
-            },
-            "light_red": {
-                "cs": "🔴 Světle červená",
-                "en": "🔴 Light Red",
-                "de": "🔴 Hellrot"
-            },
-            "light_green": {
-                "cs": "🟢 Světle zelená",
-                "en": "🟢 Light Green",
-                "de": "🟢 Hellgrün"
-            },
-            "light_blue": {
-                "cs": "🔵 Světle modrá",
-                "en": "🔵 Light Blue",
-                "de": "🔵 Hellblau"
-            },
-            "light_yellow": {
-                "cs": "🟡 Světle žlutá",
-                "en": "🟡 Light Yellow",
-                "de": "🟡 Hellgelb"
-            },
-            "light_purple": {
-                "cs": "🟣 Světle fialová",
-                "en": "🟣 Light Purple",
-                "de": "🟣 Helllila"
-            },
-            "light_cyan": {
-                "cs": "🔵 Světle azurová",
-                "en": "🔵 Light Cyan",
-                "de": "🔵 Hellcyan"
-            },
-            "orange": {
-                "cs": "🟠 Oranžová",
-                "en": "🟠 Orange",
-                "de": "🟠 Orange"
-            },
-            "lime": {
-                "cs": "🟢 Limetková",
-                "en": "🟢 Lime",
-                "de": "🟢 Limette"
-            },
-            "mint": {
-                "cs": "🟢 Mátová",
-                "en": "🟢 Mint",
-                "de": "🟢 Minze"
-            },
-            "pink": {
-                "cs": "🩷 Růžová",
-                "en": "🩷 Pink",
-                "de": "🩷 Rosa"
-            },
-            "magenta": {
-                "cs": "🟣 Magenta",
-                "en": "🟣 Magenta",
-                "de": "🟣 Magenta"
-            },
-            "dark_pink": {
-                "cs": "🩷 Tmavě růžová",
-                "en": "🩷 Dark Pink",
-                "de": "🩷 Dunkelrosa"
-            }
-        }
-        
-        return colors.get(color_key, {}).get(language, colors[color_key]["cs"])
-
-    def _get_color_name(self, red, green, blue):
-        """Vrátí název barvy na základě RGB hodnot."""
+    def _language(self):
         # Získat aktuální jazyk Home Assistant
         try:
-            language = self._hass.config.language
-        except:
-            language = "cs"  # Fallback na češtinu
-        
-        # Základní barvy (přesné shody)
-        if red == 255 and green == 255 and blue == 255:
-            return self._get_localized_color("white", language)
-        elif red == 255 and green == 0 and blue == 0:
-            return self._get_localized_color("red", language)
-        elif red == 0 and green == 255 and blue == 0:
-            return self._get_localized_color("green", language)
-        elif red == 0 and green == 0 and blue == 255:
-            return self._get_localized_color("blue", language)
-        elif red == 255 and green == 255 and blue == 0:
-            return self._get_localized_color("yellow", language)
-        elif red == 255 and green == 0 and blue == 255:
-            return self._get_localized_color("purple", language)
-        elif red == 0 and green == 255 and blue == 255:
-            return self._get_localized_color("cyan", language)
-        elif red == 0 and green == 0 and blue == 0:
-            return self._get_localized_color("black", language)
-        
-        # Rozšířené barvy (přibližné shody)
-        elif red > 200 and green > 200 and blue > 200:
-            return self._get_localized_color("light_gray", language)
-        elif red < 50 and green < 50 and blue < 50:
-            return self._get_localized_color("dark_gray", language)
-        elif red > 200 and green < 100 and blue < 100:
-            return self._get_localized_color("pink", language)
-        elif red < 100 and green > 200 and blue < 100:
-            return self._get_localized_color("light_green", language)
-        elif red < 100 and green < 100 and blue > 200:
-            return self._get_localized_color("light_blue", language)
-        elif red > 200 and green > 200 and blue < 100:
-            return self._get_localized_color("light_yellow", language)
-        elif red > 200 and green < 100 and blue > 200:
-            return self._get_localized_color("light_purple", language)
-        elif red < 100 and green > 200 and blue > 200:
-            return self._get_localized_color("light_cyan", language)
-        
-        # Smíšené barvy
-        elif red > 150 and green > 100 and blue < 100:
-            return self._get_localized_color("orange", language)
-        elif red > 100 and green > 150 and blue < 100:
-            return self._get_localized_color("lime", language)
-        elif red < 100 and green > 150 and blue > 100:
-            return self._get_localized_color("mint", language)
-        elif red > 100 and green < 100 and blue > 150:
-            return self._get_localized_color("purple", language)
-        elif red > 150 and green < 100 and blue > 100:
-            return self._get_localized_color("magenta", language)
-        
-        # Specifické barvy z TZL
-        elif red == 177 and green == 0 and blue == 255:
-            return self._get_localized_color("dark_pink", language)
-        elif red == 255 and green == 0 and blue == 92:
-            return self._get_localized_color("purple", language)
-        elif red == 83 and green == 106 and blue == 255:
-            return self._get_localized_color("light_blue", language)
-        
-        # Pro ostatní barvy použít RGB hodnoty
-        else:
-            return f"RGB({red},{green},{blue})"
+            return self._hass.config.language
+        except Exception:
+            return "cs"  # Fallback na češtinu
+
+    def _refresh_options(self):
+        """Převezme volby z palety sdílených dat; vrací True, pokud se paleta změnila."""
+        palette = self._shared_data.palette
+        if palette is self._palette:
+            return False
+        self._palette = palette
+        self._options, self._color_ids = palette.options(self._language())
+        self._attr_options = self._options
+        return True
 
     def _rgb_to_hex(self, red, green, blue):
         """Převede RGB hodnoty na hex kód barvy."""
@@ -418,51 +211,28 @@ class SpaTzlZoneColorSelect(SpaSelectBase):
     def current_option(self):
         return self._current_option
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
-            # Kontrola, jestli se změnily tzl_colors
-            current_tzl_colors = data.get("tzlColors", [])
-            if current_tzl_colors != self._tzl_colors:
+            # Kontrola, jestli se změnila paleta tzl_colors (nové volby zapíše SpaData se stavem)
+            if self._refresh_options():
                 _LOGGER.info("TZL colors changed, reloading color options for zone %s", self._tzl_zone_data["zoneId"])
-                self._tzl_colors = current_tzl_colors
-                self._options = self._create_color_options()
-                self._attr_options = self._options
-                self.async_write_ha_state()
             
             # Najít odpovídající TZL zone podle zoneId
-            tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
+            tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             if tzl_zone:
                 state = tzl_zone.get("state", "OFF")
                 red = tzl_zone.get("red", 0)
                 green = tzl_zone.get("green", 0)
                 blue = tzl_zone.get("blue", 0)
+                rgb = (red, green, blue)
                 
-                # Prioritně najít shodu s definovanými barvami
-                found_match = False
-                for color in self._tzl_colors:
-                    if (color.get("red") == red and 
-                        color.get("green") == green and 
-                        color.get("blue") == blue):
-                        color_name = self._get_color_name(red, green, blue)
-                        self._current_option = f"{color_name} (RGB: {red},{green},{blue})"
-                        found_match = True
-                        break
-                
-                # Pokud se nenašla shoda a barva je černá (0,0,0) a stav je OFF, nastavit na OFF
-                if not found_match and red == 0 and green == 0 and blue == 0 and state == "OFF":
+                # Černá mimo paletu při vypnuté zóně = OFF, jinak popisek barvy (i mimo paletu)
+                if rgb == (0, 0, 0) and state == "OFF" and self._palette.color_id(rgb) is None:
                     self._current_option = "OFF"
-                elif not found_match:
-                    # Pokud se nenašla shoda, ale barva není černá, zobrazit RGB hodnoty
-                    color_name = self._get_color_name(red, green, blue)
-                    self._current_option = f"{color_name} (RGB: {red},{green},{blue})"
+                else:
+                    self._current_option = self._palette.label(rgb, self._language())
                 
                 _LOGGER.debug("Updated TZL Color Select %s: %s (RGB: %s,%s,%s)", 
                              self._tzl_zone_data["zoneId"], self._current_option, red, green, blue)
@@ -470,9 +240,10 @@ class SpaTzlZoneColorSelect(SpaSelectBase):
     async def _try_set_tzl_zone_off(self, is_retry: bool = False) -> bool:
         """Pokus o vypnutí TZL zóny s možností opakování."""
         try:
-            response_data = await self._shared_data._client.setChromazoneFunction(
-                "OFF", 
-                self._tzl_zone_data["zoneId"]
+            response_data = await self._send_commands(
+                self._shared_data._client.chromazoneFunctionCommand(
+                    "OFF", self._tzl_zone_data["zoneId"]
+                )
             )
             
             if response_data is None:
@@ -481,14 +252,7 @@ class SpaTzlZoneColorSelect(SpaSelectBase):
             
             if response_data:
                 # Najít odpovídající TZL zone v odpovědi
-                tzl_zone = next(
-                    (
-                        zone
-                        for zone in response_data.get("tzlZones", [])
-                        if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                    ),
-                    None,
-                )
+                tzl_zone = find_tzl_zone(response_data, self._tzl_zone_data["zoneId"])
                 new_state = tzl_zone["state"] if tzl_zone else None
                 
                 if new_state == "OFF":
@@ -522,9 +286,10 @@ class SpaTzlZoneColorSelect(SpaSelectBase):
     async def _try_set_tzl_zone_color(self, color_id: int, is_retry: bool = False) -> bool:
         """Pokus o nastavení barvy TZL zóny s možností opakování."""
         try:
-            response_data = await self._shared_data._client.setChromazoneColor(
-                color_id - 1, 
-                self._tzl_zone_data["zoneId"]
+            response_data = await self._send_commands(
+                self._shared_data._client.chromazoneColorCommand(
+                    color_id - 1, self._tzl_zone_data["zoneId"]
+                )
             )
             
             if response_data is None:
@@ -533,14 +298,7 @@ class SpaTzlZoneColorSelect(SpaSelectBase):
             
             if response_data:
                 # Najít odpovídající TZL zone v odpovědi
-                tzl_zone = next(
-                    (
-                        zone
-                        for zone in response_data.get("tzlZones", [])
-                        if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                    ),
-                    None,
-                )
+                tzl_zone = find_tzl_zone(response_data, self._tzl_zone_data["zoneId"])
                 
                 if tzl_zone:
                     # Zkontrolovat, jestli se barva nastavila správně
@@ -549,21 +307,14 @@ class SpaTzlZoneColorSelect(SpaSelectBase):
                     blue = tzl_zone.get("blue", 0)
                     
                     # Najít očekávanou barvu podle color_id
-                    expected_color = None
-                    for color in self._tzl_colors:
-                        if color.get("colorId") == color_id:
-                            expected_color = color
-                            break
+                    expected_rgb = self._palette.rgb(color_id)
                     
-                    if expected_color:
-                        expected_red = expected_color.get("red", 0)
-                        expected_green = expected_color.get("green", 0)
-                        expected_blue = expected_color.get("blue", 0)
+                    if expected_rgb:
+                        expected_red, expected_green, expected_blue = expected_rgb
                         
-                        if (red == expected_red and green == expected_green and blue == expected_blue):
+                        if (red, green, blue) == expected_rgb:
                             # Aktualizovat current_option
-                            color_name = self._get_color_name(red, green, blue)
-                            self._current_option = f"{color_name} (RGB: {red},{green},{blue})"
+                            self._current_option = self._palette.label(expected_rgb, self._language())
                             
                             _LOGGER.info(
                                 "Successfully set TZL zone %s color to color_id %s%s",
@@ -601,63 +352,53 @@ class SpaTzlZoneColorSelect(SpaSelectBase):
             return False
 
     async def async_select_option(self, option: str):
-        try:
-            self._shared_data.pause_updates()
-            
-            if option == "OFF":
-                # První pokus pro vypnutí
-                success = await self._try_set_tzl_zone_off()
+        async with self._shared_data.command_lease():
+            try:
+                if option == "OFF":
+                    # První pokus pro vypnutí
+                    success = await self._try_set_tzl_zone_off()
                 
-                # Druhý pokus pokud první selhal
-                if not success:
-                    _LOGGER.info("Retrying to turn off TZL zone %s", self._tzl_zone_data["zoneId"])
-                    success = await self._try_set_tzl_zone_off(True)
-            else:
-                # Najít odpovídající barvu podle option v dictionary
-                if option in self._color_options_data:
-                    color_data = self._color_options_data[option]
-                    color_id = color_data["color_id"]
+                    # Druhý pokus pokud první selhal
+                    if not success:
+                        _LOGGER.info("Retrying to turn off TZL zone %s", self._tzl_zone_data["zoneId"])
+                        success = await self._try_set_tzl_zone_off(True)
+                else:
+                    # Najít odpovídající barvu podle option v dictionary
+                    if option in self._color_ids:
+                        color_id = self._color_ids[option]
                     
-                    if color_id is not None:
-                        # První pokus pro nastavení barvy
-                        success = await self._try_set_tzl_zone_color(color_id)
+                        if color_id is not None:
+                            # První pokus pro nastavení barvy
+                            success = await self._try_set_tzl_zone_color(color_id)
                         
-                        # Druhý pokus pokud první selhal
-                        if not success:
-                            _LOGGER.info("Retrying to set TZL zone %s color to color_id %s", 
-                                       self._tzl_zone_data["zoneId"], color_id)
-                            success = await self._try_set_tzl_zone_color(color_id, True)
+                            # Druhý pokus pokud první selhal
+                            if not success:
+                                _LOGGER.info("Retrying to set TZL zone %s color to color_id %s", 
+                                           self._tzl_zone_data["zoneId"], color_id)
+                                success = await self._try_set_tzl_zone_color(color_id, True)
+                        else:
+                            _LOGGER.error(f"Color_id is None for option: {option}")
                     else:
-                        _LOGGER.error(f"Color_id is None for option: {option}")
-                else:
-                    _LOGGER.error(f"Unknown option: {option}")
+                        _LOGGER.error(f"Unknown option: {option}")
             
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error setting TZL color (ID %s) to %s: %s", 
-                         self._tzl_zone_data["zoneId"], option, str(e))
-        finally:
-            self._shared_data.resume_updates()
-            self.async_write_ha_state()
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error setting TZL color (ID %s) to %s: %s", 
+                             self._tzl_zone_data["zoneId"], option, str(e))
+            finally:
+                self.async_write_ha_state()
 
     @property
     def extra_state_attributes(self):
         data = self._shared_data.data
         if data:
             # Najít odpovídající TZL zone podle zoneId
-            tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
+            tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             if tzl_zone:
                 red = tzl_zone.get("red", 0)
                 green = tzl_zone.get("green", 0)
                 blue = tzl_zone.get("blue", 0)
-                current_color_name = self._get_color_name(red, green, blue)
+                current_color_name = self._palette.name((red, green, blue), self._language())
                 
                 attrs = {
                     "zone_name": tzl_zone.get("zoneName"),
@@ -672,6 +413,7 @@ class SpaTzlZoneIntensitySelect(SpaSelectBase):
     
     def __init__(self, shared_data, device_info, unique_id_suffix, tzl_zone_data, count_tzl_zones):
         self._shared_data = shared_data
+        self._spa_dependencies = {("tzlZone", tzl_zone_data["zoneId"])}
         self._tzl_zone_data = tzl_zone_data
         self._attr_options = ["0", "1", "2", "3", "4", "5", "6", "7", "8"]  # Intenzita 0-8
         self._attr_should_poll = False  # Data jsou sdílena, posluchač
@@ -698,18 +440,12 @@ class SpaTzlZoneIntensitySelect(SpaSelectBase):
             return "mdi:sync"  # Ikona pro zpracování
         return "mdi:brightness-6"
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající TZL zone podle zoneId
-            tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
+            tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             if tzl_zone:
                 intensity = tzl_zone.get("intensity", 0)
                 self._attr_current_option = str(intensity)
@@ -722,9 +458,10 @@ class SpaTzlZoneIntensitySelect(SpaSelectBase):
         
         try:
             # Volání API pro nastavení intenzity TZL zóny
-            response_data = await self._shared_data._client.setChromazoneBrightness(
-                intensity, 
-                self._tzl_zone_data["zoneId"]
+            response_data = await self._send_commands(
+                self._shared_data._client.chromazoneBrightnessCommand(
+                    intensity, self._tzl_zone_data["zoneId"]
+                )
             )
             
             if response_data is None:
@@ -733,14 +470,7 @@ class SpaTzlZoneIntensitySelect(SpaSelectBase):
             
             if response_data:
                 # Najít odpovídající TZL zone v odpovědi
-                tzl_zone = next(
-                    (
-                        zone
-                        for zone in response_data.get("tzlZones", [])
-                        if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                    ),
-                    None,
-                )
+                tzl_zone = find_tzl_zone(response_data, self._tzl_zone_data["zoneId"])
                 new_intensity = tzl_zone.get("intensity") if tzl_zone else None
                 
                 if new_intensity == intensity:
@@ -782,40 +512,31 @@ class SpaTzlZoneIntensitySelect(SpaSelectBase):
         if option not in self._attr_options:
             return
 
-        try:
-            self._shared_data.pause_updates()
-            intensity = int(option)
+        async with self._shared_data.command_lease():
+            try:
+                intensity = int(option)
             
-            # První pokus
-            success = await self._try_set_tzl_zone_intensity(intensity)
+                # První pokus
+                success = await self._try_set_tzl_zone_intensity(intensity)
             
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to set TZL zone %s intensity to %s", self._tzl_zone_data["zoneId"], intensity)
-                success = await self._try_set_tzl_zone_intensity(intensity, True)
+                # Druhý pokus pokud první selhal
+                if not success:
+                    _LOGGER.info("Retrying to set TZL zone %s intensity to %s", self._tzl_zone_data["zoneId"], intensity)
+                    success = await self._try_set_tzl_zone_intensity(intensity, True)
                 
-            await self._shared_data.async_force_update()
-        except ValueError:
-            _LOGGER.error("Invalid intensity value: %s", option)
-        except Exception as e:
-            _LOGGER.error("Error setting TZL zone intensity (ID %s) to %s: %s", self._tzl_zone_data["zoneId"], option, str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except ValueError:
+                _LOGGER.error("Invalid intensity value: %s", option)
+            except Exception as e:
+                _LOGGER.error("Error setting TZL zone intensity (ID %s) to %s: %s", self._tzl_zone_data["zoneId"], option, str(e))
+                raise
 
     @property
     def extra_state_attributes(self):
         data = self._shared_data.data
         if data:
             # Najít odpovídající TZL zone podle zoneId
-            tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
+            tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             if tzl_zone:
                 attrs = {
                     "zone_name": tzl_zone.get("zoneName"),
@@ -829,6 +550,7 @@ class SpaTzlZoneSpeedSelect(SpaSelectBase):
     
     def __init__(self, shared_data, device_info, unique_id_suffix, tzl_zone_data, count_tzl_zones):
         self._shared_data = shared_data
+        self._spa_dependencies = {("tzlZone", tzl_zone_data["zoneId"])}
         self._tzl_zone_data = tzl_zone_data
         self._attr_options = ["0", "1", "2", "3", "4", "5"]  # Rychlost 0-5
         self._attr_should_poll = False  # Data jsou sdílena, posluchač
@@ -855,18 +577,12 @@ class SpaTzlZoneSpeedSelect(SpaSelectBase):
             return "mdi:sync"  # Ikona pro zpracování
         return "mdi:speedometer"
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající TZL zone podle zoneId
-            tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
+            tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             if tzl_zone:
                 speed = tzl_zone.get("speed", 0)
                 self._attr_current_option = str(speed)
@@ -879,9 +595,10 @@ class SpaTzlZoneSpeedSelect(SpaSelectBase):
         
         try:
             # Volání API pro nastavení rychlosti TZL zóny
-            response_data = await self._shared_data._client.setChromazoneSpeed(
-                speed, 
-                self._tzl_zone_data["zoneId"]
+            response_data = await self._send_commands(
+                self._shared_data._client.chromazoneSpeedCommand(
+                    speed, self._tzl_zone_data["zoneId"]
+                )
             )
             
             if response_data is None:
@@ -890,14 +607,7 @@ class SpaTzlZoneSpeedSelect(SpaSelectBase):
             
             if response_data:
                 # Najít odpovídající TZL zone v odpovědi
-                tzl_zone = next(
-                    (
-                        zone
-                        for zone in response_data.get("tzlZones", [])
-                        if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                    ),
-                    None,
-                )
+                tzl_zone = find_tzl_zone(response_data, self._tzl_zone_data["zoneId"])
                 new_speed = tzl_zone.get("speed") if tzl_zone else None
                 
                 if new_speed == speed:
@@ -939,40 +649,31 @@ class SpaTzlZoneSpeedSelect(SpaSelectBase):
         if option not in self._attr_options:
             return
 
-        try:
-            self._shared_data.pause_updates()
-            speed = int(option)
+        async with self._shared_data.command_lease():
+            try:
+                speed = int(option)
             
-            # První pokus
-            success = await self._try_set_tzl_zone_speed(speed)
+                # První pokus
+                success = await self._try_set_tzl_zone_speed(speed)
             
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to set TZL zone %s speed to %s", self._tzl_zone_data["zoneId"], speed)
-                success = await self._try_set_tzl_zone_speed(speed, True)
+                # Druhý pokus pokud první selhal
+                if not success:
+                    _LOGGER.info("Retrying to set TZL zone %s speed to %s", self._tzl_zone_data["zoneId"], speed)
+                    success = await self._try_set_tzl_zone_speed(speed, True)
                 
-            await self._shared_data.async_force_update()
-        except ValueError:
-            _LOGGER.error("Invalid speed value: %s", option)
-        except Exception as e:
-            _LOGGER.error("Error setting TZL zone speed (ID %s) to %s: %s", self._tzl_zone_data["zoneId"], option, str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except ValueError:
+                _LOGGER.error("Invalid speed value: %s", option)
+            except Exception as e:
+                _LOGGER.error("Error setting TZL zone speed (ID %s) to %s: %s", self._tzl_zone_data["zoneId"], option, str(e))
+                raise
 
     @property
     def extra_state_attributes(self):
         data = self._shared_data.data
         if data:
             # Najít odpovídající TZL zone podle zoneId
-            tzl_zone = next(
-                (
-                    zone
-                    for zone in data.get("tzlZones", [])
-                    if zone["zoneId"] == self._tzl_zone_data["zoneId"]
-                ),
-                None,
-            )
+            tzl_zone = find_tzl_zone(data, self._tzl_zone_data["zoneId"])
             if tzl_zone:
                 attrs = {
                     "zone_name": tzl_zone.get("zoneName"),
@@ -1,5 +1,6 @@
 """Sensor entities for ControlMySpa integration."""
 
+from collections.abc import Mapping
 from homeassistant.core import HomeAssistant
 from ..const import DOMAIN
 from .base import SpaSensorBase
@@ -11,6 +12,7 @@ from .components import (
     SpaHeaterSensor
 )
 from .energy import (
+    SpaEnergySensor,
     SpaHeaterEnergySensor,
     SpaPumpEnergySensor,
     SpaBlowerEnergySensor,
@@ -20,6 +22,14 @@ from .alerts import SpaFaultMessageSensor, SpaTotalAlertsSensor
 from .c8z_heater_sensor import SpaC8zHeaterStateSensor, SpaC8zStatusSensor
 from ..select.c8z import is_c8z_installed
 from .clock import SpaClockSensor
+from .polling import SpaPollIntervalSensor
+from .cloud import SpaCloudStatusSensor
+from .cloud_metrics import (
+    SpaCloudLatencySensor,
+    SpaDashboardLatencySensor,
+    SpaCommandLatencySensor,
+    SpaCloudErrorsSensor
+)
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -108,12 +118,17 @@ async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entitie
     entities.append(SpaFaultMessageSensor(shared_data, device_info, unique_id_suffix))
     entities.append(SpaTotalAlertsSensor(shared_data, device_info, unique_id_suffix))
     c8z = shared_data.data.get("c8zCurrentState")
-    if isinstance(c8z, dict):
+    if isinstance(c8z, Mapping):
         if "c8zStatus" in c8z:
             entities.append(SpaC8zStatusSensor(shared_data, device_info, unique_id_suffix))
         if is_c8z_installed(c8z) and "c8zHeaterState" in c8z:
             entities.append(SpaC8zHeaterStateSensor(shared_data, device_info, unique_id_suffix))
     entities.append(SpaClockSensor(shared_data, device_info, unique_id_suffix))
+    entities.append(SpaPollIntervalSensor(shared_data, device_info, unique_id_suffix))
+    entities.append(SpaCloudStatusSensor(shared_data, device_info, unique_id_suffix))
+    entities.append(SpaDashboardLatencySensor(shared_data, device_info, unique_id_suffix))
+    entities.append(SpaCommandLatencySensor(shared_data, device_info, unique_id_suffix))
+    entities.append(SpaCloudErrorsSensor(shared_data, device_info, unique_id_suffix))
 
     async_add_entities(entities, True)
     _LOGGER.debug("START Śensor control_my_spa")
@@ -130,6 +145,7 @@ __all__ = [
     "SpaFilterSensor",
     "SpaOzoneSensor",
     "SpaHeaterSensor",
+    "SpaEnergySensor",
     "SpaHeaterEnergySensor",
     "SpaPumpEnergySensor",
     "SpaBlowerEnergySensor",
@@ -139,6 +155,12 @@ __all__ = [
     "SpaC8zHeaterStateSensor",
     "SpaC8zStatusSensor",
     "SpaClockSensor",
+    "SpaPollIntervalSensor",
+    "SpaCloudStatusSensor",
+    "SpaCloudLatencySensor",
+    "SpaDashboardLatencySensor",
+    "SpaCommandLatencySensor",
+    "SpaCloudErrorsSensor",
     "async_setup_entry",
 ]
 
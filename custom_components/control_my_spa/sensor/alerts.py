@@ -4,6 +4,7 @@ import logging
 
 from homeassistant.components.sensor import SensorStateClass
 from homeassistant.const import EntityCategory
+from homeassistant.core import callback
 
 from .base import SpaSensorBase
 
@@ -13,6 +14,7 @@ _LOGGER = logging.getLogger(__name__)
 class SpaFaultMessageSensor(SpaSensorBase):
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"currentFaultMessage"}
         self._state = None
         self._attr_should_poll = False
         self._attr_icon = "mdi:alert-circle"
@@ -22,8 +24,9 @@ class SpaFaultMessageSensor(SpaSensorBase):
         self._attr_translation_key = "fault_message"
         self.entity_id = self._attr_unique_id
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             fault = data.get("currentFaultMessage")
             if isinstance(fault, dict):
@@ -50,6 +53,7 @@ class SpaFaultMessageSensor(SpaSensorBase):
 class SpaTotalAlertsSensor(SpaSensorBase):
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"totalAlerts"}
         self._state = None
         self._attr_should_poll = False
         self._attr_icon = "mdi:bell-alert"
@@ -60,8 +64,9 @@ class SpaTotalAlertsSensor(SpaSensorBase):
         self._attr_translation_key = "total_alerts"
         self.entity_id = self._attr_unique_id
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             self._state = data.get("totalAlerts")
             _LOGGER.debug("Updated total alerts: %s", self._state)
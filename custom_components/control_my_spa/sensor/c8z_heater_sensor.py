@@ -1,5 +1,7 @@
 """C8Z Chromazone current state sensors (API c8zCurrentState)."""
 
+from collections.abc import Mapping
+from homeassistant.core import callback
 from .base import SpaSensorBase
 import logging
 
@@ -12,7 +14,7 @@ def _read_c8z_state(shared_data):
     if not data:
         return None
     c8z = data.get("c8zCurrentState")
-    if not isinstance(c8z, dict):
+    if not isinstance(c8z, Mapping):
         if c8z is not None:
             _LOGGER.debug("c8zCurrentState is not a dict, ignoring: %r", type(c8z).__name__)
         return None
@@ -24,6 +26,7 @@ class SpaC8zHeaterStateSensor(SpaSensorBase):
 
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"c8zCurrentState"}
         self._state = None
         self._attr_should_poll = False
         # Tepelné čerpadlo (C8Z ohřev) — mdi:heat-pump je v MDI přímo TČ
@@ -33,7 +36,8 @@ class SpaC8zHeaterStateSensor(SpaSensorBase):
         self._attr_translation_key = "c8z_heater_state"
         self.entity_id = self._attr_unique_id
 
-    async def async_update(self):
+    @callback
+    def handle_spa_state(self, state):
         c8z = _read_c8z_state(self._shared_data)
         if c8z is None:
             self._state = None
@@ -51,6 +55,7 @@ class SpaC8zStatusSensor(SpaSensorBase):
 
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"c8zCurrentState"}
         self._state = None
         self._attr_should_poll = False
         # Stav jednotky TČ / C8Z — odlišná varianta stejné rodiny ikon
@@ -60,7 +65,8 @@ class SpaC8zStatusSensor(SpaSensorBase):
         self._attr_translation_key = "c8z_status"
         self.entity_id = self._attr_unique_id
 
-    async def async_update(self):
+    @callback
+    def handle_spa_state(self, state):
         c8z = _read_c8z_state(self._shared_data)
         if c8z is None:
             self._state = None
@@ -1,6 +1,7 @@
 """Clock sensor exposing the time reported by the spa control panel."""
 
 from homeassistant.helpers.entity import EntityCategory
+from homeassistant.core import callback
 from .base import SpaSensorBase
 import logging
 
@@ -12,6 +13,7 @@ class SpaClockSensor(SpaSensorBase):
 
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"time"}
         self._state = None
         self._attr_should_poll = False
         self._attr_icon = "mdi:clock-outline"
@@ -21,8 +23,9 @@ class SpaClockSensor(SpaSensorBase):
         self._attr_translation_key = "spa_clock"
         self.entity_id = self._attr_unique_id
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             self._state = data.get("time")
             _LOGGER.debug("Updated spa clock: %s", self._state)
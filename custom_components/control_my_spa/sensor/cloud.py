@@ -0,0 +1,50 @@
+"""Diagnostic sensor exposing the ControlMySpa cloud circuit breakers."""
+
+from datetime import timedelta
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
+from .base import SpaSensorBase
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SpaCloudStatusSensor(SpaSensorBase):
+    """Diagnostic sensor showing the worst circuit breaker state (closed, half_open, open)."""
+
+    def __init__(self, shared_data, device_info, unique_id_suffix):
+        self._shared_data = shared_data
+        self._spa_dependencies = {"cloudStatus"}
+        self._state = None
+        self._attributes = {}
+        self._attr_should_poll = False
+        self._attr_icon = "mdi:cloud-check-outline"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC  # sekce Diagnostika na kartě zařízení
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"sensor.spa_cloud_status{unique_id_suffix}"
+        self._attr_translation_key = "cloud_status"
+        self.entity_id = self._attr_unique_id
+
+    @callback
+    def handle_spa_state(self, state):
+        status = self._shared_data.cloud_status
+        if not status:
+            return
+        self._state = status["state"]
+        self._attributes = {}
+        now = self._shared_data.clock.utcnow()
+        for name, endpoint in status["endpoints"].items():
+            self._attributes[f"{name}_state"] = endpoint["state"]
+            self._attributes[f"{name}_failures"] = endpoint["failures"]
+            if endpoint["retry_in"]:
+                self._attributes[f"{name}_retry_at"] = (now + timedelta(seconds=endpoint["retry_in"])).isoformat()
+        self._attr_icon = "mdi:cloud-check-outline" if self._state == "closed" else "mdi:cloud-alert"
+        _LOGGER.debug("Updated cloud status: %s", self._state)
+
+    @property
+    def native_value(self):
+        return self._state
+
+    @property
+    def extra_state_attributes(self):
+        return self._attributes
@@ -0,0 +1,147 @@
+"""Diagnostic sensors exposing ControlMySpa cloud request metrics (latency, errors)."""
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import callback
+from .base import SpaSensorBase
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Endpointy mimo příkazy (přihlášení, profil, seznam van, dashboard)
+_ENDPOINTS = ("login", "profile", "owned", "dashboard")
+
+
+class SpaCloudLatencySensor(SpaSensorBase):
+    """Společný základ senzorů latence - medián (ms) z histogramu SpaData.cloud_metrics."""
+
+    _entity_name = None  # Základ unique_id a translation_key, např. "dashboard_latency"
+    _endpoint = None  # Název endpointu v registru metrik, např. "dashboard"
+    # Počty volání se mění s každým čtením - recorder je neukládá (ani rozpad podle příkazů)
+    _unrecorded_attributes = frozenset({
+        "requests", "timeouts", "errors", "status_1xx", "status_2xx", "status_3xx",
+        "status_4xx", "status_5xx", "status_other", "response_bytes_mean", "response_bytes_max",
+        "commands",
+    })
+
+    def __init__(self, shared_data, device_info, unique_id_suffix):
+        self._shared_data = shared_data
+        self._spa_dependencies = {"cloudMetrics"}
+        self._state = None
+        self._attributes = {}
+        self._attr_should_poll = False
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC  # sekce Diagnostika na kartě zařízení
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"sensor.spa_{self._entity_name}{unique_id_suffix}"
+        self._attr_translation_key = self._entity_name
+        self.entity_id = self._attr_unique_id
+
+    def _metrics(self):
+        """Metriky zobrazeného endpointu (EndpointMetrics), nebo None bez volání."""
+        return self._shared_data.cloud_metrics.find(self._endpoint)
+
+    def _extra_attributes(self):
+        return {}
+
+    @callback
+    def handle_spa_state(self, state):
+        metrics = self._metrics()
+        if metrics is None or not metrics.requests:
+            return False
+        summary = metrics.as_dict()
+        previous = (self._state, self._attributes)
+        self._state = summary.pop("p50_ms")
+        self._attributes = {**summary, **self._extra_attributes()}
+        _LOGGER.debug("Updated %s: %s ms", self._entity_name, self._state)
+        return (self._state, self._attributes) != previous
+
+    @property
+    def native_value(self):
+        return self._state
+
+    @property
+    def extra_state_attributes(self):
+        return self._attributes
+
+
+class SpaDashboardLatencySensor(SpaCloudLatencySensor):
+    """Latency of /spas/{id}/dashboard reads."""
+
+    _entity_name = "dashboard_latency"
+    _endpoint = "dashboard"
+
+
+class SpaCommandLatencySensor(SpaCloudLatencySensor):
+    """Latency of all /spa-commands/* calls, with the median of each command in the commands attribute."""
+
+    _entity_name = "command_latency"
+
+    def __init__(self, shared_data, device_info, unique_id_suffix):
+        super().__init__(shared_data, device_info, unique_id_suffix)
+        self._attr_icon = "mdi:timer-play-outline"
+
+    def _metrics(self):
+        registry = self._shared_data.cloud_metrics
+        commands = registry.commands()
+        if not commands:
+            return None
+        return registry.combined([metrics.name for metrics in commands.values()])
+
+    def _extra_attributes(self):
+        # Jeden vnořený atribut - názvy příkazů jsou dynamické a frozenset výše je nepokryje
+        commands = {}
+        for name, metrics in self._shared_data.cloud_metrics.commands().items():
+            commands[name.replace("/", "_").replace("-", "_")] = {
+                "p50_ms": round(metrics.quantile(0.5)),
+                "requests": metrics.requests,
+            }
+        return {"commands": commands}
+
+
+class SpaCloudErrorsSensor(SpaSensorBase):
+    """Failed cloud requests (timeouts, connection errors, 4xx/5xx) since start, per endpoint as attributes."""
+
+    def __init__(self, shared_data, device_info, unique_id_suffix):
+        self._shared_data = shared_data
+        self._spa_dependencies = {"cloudMetrics"}
+        self._state = None
+        self._attributes = {}
+        self._attr_should_poll = False
+        self._attr_icon = "mdi:cloud-alert-outline"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC  # sekce Diagnostika na kartě zařízení
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"sensor.spa_cloud_errors{unique_id_suffix}"
+        self._attr_translation_key = "cloud_errors"
+        self.entity_id = self._attr_unique_id
+
+    @callback
+    def handle_spa_state(self, state):
+        registry = self._shared_data.cloud_metrics
+        endpoints = {name: registry.find(name) for name in _ENDPOINTS}
+        endpoints.update(registry.commands())
+        previous = (self._state, self._attributes)
+        failures = 0
+        attributes = {}
+        for name, metrics in endpoints.items():
+            if metrics is None:
+                continue
+            key = name.replace("/", "_").replace("-", "_")
+            failures += metrics.failures
+            attributes[f"{key}_failures"] = metrics.failures
+            attributes[f"{key}_timeouts"] = metrics.timeouts
+        self._state = failures
+        self._attributes = attributes
+        return (self._state, self._attributes) != previous
+
+    @property
+    def native_value(self):
+        return self._state
+
+    @property
+    def extra_state_attributes(self):
+        return self._attributes
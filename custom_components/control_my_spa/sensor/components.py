@@ -1,6 +1,8 @@
 """Component-related sensor entities."""
 
+from homeassistant.core import callback
 from .base import SpaSensorBase
+from ..helpers import find_component
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -9,6 +11,7 @@ _LOGGER = logging.getLogger(__name__)
 class SpaCirculationPumpSensor(SpaSensorBase):
     def __init__(self, shared_data, device_info, unique_id_suffix, pump_data, count_pump):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "CIRCULATION_PUMP", pump_data["port"])}
         self._pump_data = pump_data
         self._attr_native_unit_of_measurement = None  # Jednotka není potřeba
         self._attr_should_poll = False  # Data jsou sdílena, posluchac
@@ -20,15 +23,13 @@ class SpaCirculationPumpSensor(SpaSensorBase):
         self._attr_translation_key = f"circulation_pump" if count_pump == 1 or pump_data['port'] == None else f"spa_circulation_pump_{pump_data['port']}"
         self.entity_id = self._attr_unique_id
 
-    async def async_update(self):
+    @callback
+    def handle_spa_state(self, state):
         # Data jsou již aktualizována v async_setup_entry
-        data = self._shared_data.data
+        data = state
         if data:
             # Najít odpovídající CIRCULATION_PUMP podle portu
-            pump = next(
-                (comp for comp in data["components"] if comp["componentType"] == "CIRCULATION_PUMP" and comp["port"] == self._pump_data["port"]),
-                None
-            )
+            pump = find_component(data, "CIRCULATION_PUMP", self._pump_data["port"])
             if pump:
                 self._state = pump["value"]  # Stav čerpadla 
                 _LOGGER.debug("Updated Circulation Pump %s: %s", self._pump_data["port"], self._state)
@@ -41,6 +42,7 @@ class SpaCirculationPumpSensor(SpaSensorBase):
 class SpaFilterSensor(SpaSensorBase):
     def __init__(self, shared_data, device_info, unique_id_suffix, filter_data, count_filter):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "FILTER", filter_data["port"])}
         self._filter_data = filter_data
         self._attr_native_unit_of_measurement = None  # Jednotka není potřeba
         self._attr_should_poll = False  # Data jsou sdílena, posluchač
@@ -60,18 +62,12 @@ class SpaFilterSensor(SpaSensorBase):
         )
         self.entity_id = self._attr_unique_id
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající FILTER podle portu
-            filter_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "FILTER" and comp["port"] == self._filter_data["port"]
-                ),
-                None,
-            )
+            filter_comp = find_component(data, "FILTER", self._filter_data["port"])
             if filter_comp:
                 self._state = filter_comp["value"]
                 _LOGGER.debug("Updated Filter %s: %s", self._filter_data["port"], self._state)
@@ -85,14 +81,7 @@ class SpaFilterSensor(SpaSensorBase):
         data = self._shared_data.data
         if data:
             # Najít odpovídající FILTER podle portu
-            filter_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "FILTER" and comp["port"] == self._filter_data["port"]
-                ),
-                None,
-            )
+            filter_comp = find_component(data, "FILTER", self._filter_data["port"])
             if filter_comp:
                 attrs = {
                     "Start time": f"{filter_comp['hour']} : {str(filter_comp['minute']).zfill(2)}",
@@ -104,6 +93,7 @@ class SpaFilterSensor(SpaSensorBase):
 class SpaOzoneSensor(SpaSensorBase):
     def __init__(self, shared_data, device_info, unique_id_suffix, ozone_data, count_ozone):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "OZONE", ozone_data["port"])}
         self._ozone_data = ozone_data
         self._attr_native_unit_of_measurement = None  # Jednotka není potřeba
         self._attr_should_poll = False  # Data jsou sdílena, posluchač
@@ -123,18 +113,12 @@ class SpaOzoneSensor(SpaSensorBase):
         )
         self.entity_id = self._attr_unique_id
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající OZONE podle portu
-            ozone_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "OZONE" and comp["port"] == self._ozone_data["port"]
-                ),
-                None,
-            )
+            ozone_comp = find_component(data, "OZONE", self._ozone_data["port"])
             if ozone_comp:
                 self._state = ozone_comp["value"]
                 _LOGGER.debug("Updated Ozone %s: %s", self._ozone_data["port"], self._state)
@@ -147,6 +131,7 @@ class SpaOzoneSensor(SpaSensorBase):
 class SpaHeaterSensor(SpaSensorBase):
     def __init__(self, shared_data, device_info, unique_id_suffix, heater_data, count_heater):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "HEATER", heater_data["port"])}
         self._heater_data = heater_data
         self._attr_native_unit_of_measurement = None  # Jednotka není potřeba
         self._attr_should_poll = False  # Data jsou sdílena, posluchač
@@ -166,18 +151,12 @@ class SpaHeaterSensor(SpaSensorBase):
         )
         self.entity_id = self._attr_unique_id
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             # Najít odpovídající HEATER podle portu
-            heater_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "HEATER" and comp["port"] == self._heater_data["port"]
-                ),
-                None,
-            )
+            heater_comp = find_component(data, "HEATER", self._heater_data["port"])
             if heater_comp:
                 self._state = heater_comp["value"]
                 _LOGGER.debug("Updated Heater %s: %s", self._heater_data["port"], self._state)
@@ -1,250 +1,96 @@
 """Energy sensor entities for Energy Dashboard."""
 
-from datetime import datetime
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.const import UnitOfEnergy
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.core import callback
 from .base import SpaSensorBase
+from ..energy_integrator import build_power_table
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class SpaHeaterEnergySensor(SpaSensorBase, RestoreEntity):
-    """Senzor pro energii heateru (kWh) - používá se pro Energy Dashboard."""
-    def __init__(self, shared_data, device_info, unique_id_suffix, heater_data, count_heater, config_options):
-        self._shared_data = shared_data
-        self._heater_data = heater_data
-        self._config_options = config_options
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_should_poll = False  # Data jsou sdílena, posluchač
-        self._total_energy_kwh = 0.0  # Celková spotřeba v kWh
-        self._last_update_time = None
-        self._last_heater_state = None
-        self._attr_device_info = device_info
-        self._attr_icon = "mdi:lightning-bolt-circle"
-        
-        # Určit port pro získání konfiguračního výkonu
-        heater_port = heater_data.get('port')
-        if heater_port is None or count_heater == 1:
-            config_key = "heater_1_power_watts"
-        else:
-            port_num = int(heater_port) + 1
-            config_key = f"heater_{port_num}_power_watts"
-        
-        # Načíst výkon z konfigurace (výchozí 3000 W)
-        self._heater_power_watts = config_options.get(config_key, 2800)
-        
-        base_id = (
-            f"sensor.spa_heater_energy"
-            if count_heater == 1 or heater_data['port'] is None
-            else f"sensor.spa_heater_energy_{int(heater_data['port']) + 1}"
-        )
-        self._attr_unique_id = f"{base_id}{unique_id_suffix}"
-        self._attr_translation_key = (
-            "heater_energy"
-            if count_heater == 1 or heater_data['port'] is None
-            else f"heater_energy_{int(heater_data['port']) + 1}"
-        )
-        self.entity_id = self._attr_unique_id
-
-    async def async_added_to_hass(self):
-        """Obnovit stav po restartu Home Assistant."""
-        await super().async_added_to_hass()
-        
-        # Obnovit předchozí stav z databáze
-        last_state = await self.async_get_last_state()
-        if last_state is not None and last_state.state not in ("unknown", "unavailable", None):
-            try:
-                # Obnovit uloženou hodnotu energie
-                restored_value = float(last_state.state)
-                self._total_energy_kwh = restored_value
-                _LOGGER.info("Restored Heater Energy %s: %s kWh from previous session", 
-                           self._heater_data["port"], round(self._total_energy_kwh, 3))
-            except (ValueError, TypeError):
-                _LOGGER.warning("Could not restore energy value for heater %s: %s", 
-                              self._heater_data["port"], last_state.state)
-        
-        # Obnovit také čas posledního update (pokud je dostupný v atributech)
-        if last_state is not None and last_state.attributes:
-            last_update_str = last_state.attributes.get("last_update_time")
-            if last_update_str:
-                try:
-                    self._last_update_time = datetime.fromisoformat(last_update_str)
-                    self._last_heater_state = last_state.attributes.get("last_heater_state", "OFF")
-                except (ValueError, TypeError):
-                    pass
-
-    async def async_update(self):
-        data = self._shared_data.data
-        current_time = datetime.now()
-        
-        if data:
-            # Najít odpovídající HEATER podle portu
-            heater_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "HEATER" and comp["port"] == self._heater_data["port"]
-                ),
-                None,
-            )
-            
-            current_heater_state = heater_comp["value"] if heater_comp else "OFF"
-            is_heater_on = current_heater_state != "OFF" and current_heater_state != "WAITING"
-            
-            # Pokud máme předchozí update, počítat spotřebu
-            if self._last_update_time is not None:
-                time_delta = current_time - self._last_update_time
-                hours_elapsed = time_delta.total_seconds() / 3600.0
-                
-                # Pokud byl heater zapnutý během tohoto období, přidat spotřebu
-                if self._last_heater_state is not None and self._last_heater_state != "OFF":
-                    # Přidat spotřebu: výkon (W) * čas (h) / 1000 = kWh
-                    energy_added = (self._heater_power_watts * hours_elapsed) / 1000.0
-                    self._total_energy_kwh += energy_added
-                    _LOGGER.debug("Heater Energy %s: Added %s kWh (power: %s W, time: %s h)", 
-                                 self._heater_data["port"], round(energy_added, 6), 
-                                 self._heater_power_watts, round(hours_elapsed, 4))
-            
-            # Aktualizovat čas a stav
-            self._last_update_time = current_time
-            self._last_heater_state = current_heater_state
-            
-            _LOGGER.debug("Updated Heater Energy %s: %s kWh (state: %s)", 
-                         self._heater_data["port"], round(self._total_energy_kwh, 3), current_heater_state)
-        else:
-            # Pokud nejsou dostupná data, inicializovat čas (ale neresetovat energii)
-            if self._last_update_time is None:
-                self._last_update_time = current_time
-                self._last_heater_state = "OFF"
-
-    @property
-    def native_value(self):
-        return round(self._total_energy_kwh, 3)
-
-    @property
-    def extra_state_attributes(self):
-        """Vrátí dodatečné atributy pro uložení stavu."""
-        attrs = {}
-        if self._last_update_time is not None:
-            attrs["last_update_time"] = self._last_update_time.isoformat()
-        if self._last_heater_state is not None:
-            attrs["last_heater_state"] = self._last_heater_state
-        return attrs
+class SpaEnergySensor(SpaSensorBase, RestoreEntity):
+    """Společný základ energy senzorů (kWh) - hodnotu počítá SpaData.energy."""
 
+    _component_type = None  # componentType sledované komponenty
+    _entity_name = None  # Základ unique_id a translation_key, např. "heater_energy"
+    _label = None  # Název pro logování
+    # Atributy se mění s každým přepnutím komponenty - recorder je neukládá
+    _unrecorded_attributes = frozenset({"component_state", "power_watts"})
 
-class SpaPumpEnergySensor(SpaSensorBase, RestoreEntity):
-    """Senzor pro energii pumpy (kWh) - používá se pro Energy Dashboard."""
-    def __init__(self, shared_data, device_info, unique_id_suffix, pump_data, count_pump, config_options):
+    def __init__(self, shared_data, device_info, unique_id_suffix, component_data, count_component, config_options):
         self._shared_data = shared_data
-        self._pump_data = pump_data
-        self._config_options = config_options
+        self._spa_dependencies = {"energy"}
+        self._component_data = component_data
+        self._port = component_data.get("port")
         self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
         self._attr_device_class = SensorDeviceClass.ENERGY
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_should_poll = False  # Data jsou sdílena, posluchač
         self._total_energy_kwh = 0.0  # Celková spotřeba v kWh
-        self._last_update_time = None
-        self._last_pump_state = None
+        self._energy_attributes = None  # Atributy při posledním zápisu stavu
         self._attr_device_info = device_info
         self._attr_icon = "mdi:lightning-bolt-circle"
-        
-        # Určit port pro získání konfiguračního výkonu
-        pump_port = pump_data.get('port')
-        if pump_port is None or count_pump == 1:
-            config_key = "pump_1_power_watts"
-        else:
-            port_num = int(pump_port) + 1
-            config_key = f"pump_{port_num}_power_watts"
-        
-        # Načíst výkon z konfigurace (výchozí 2000 W)
-        self._pump_power_watts = config_options.get(config_key, 2200)
-        
+
+        # Zaregistrovat kanál ve sdíleném integrátoru s výkonem z konfigurace
+        self._energy = shared_data.energy
+        self._energy.add_channel(
+            self._component_type,
+            self._port,
+            build_power_table(self._component_type, self._port, count_component, config_options),
+        )
+
+        single = count_component == 1 or self._port is None
         base_id = (
-            f"sensor.spa_pump_energy"
-            if count_pump == 1 or pump_data['port'] is None
-            else f"sensor.spa_pump_energy_{int(pump_data['port']) + 1}"
+            f"sensor.spa_{self._entity_name}"
+            if single
+            else f"sensor.spa_{self._entity_name}_{int(self._port) + 1}"
         )
         self._attr_unique_id = f"{base_id}{unique_id_suffix}"
         self._attr_translation_key = (
-            "pump_energy"
-            if count_pump == 1 or pump_data['port'] is None
-            else f"pump_energy_{int(pump_data['port']) + 1}"
+            self._entity_name
+            if single
+            else f"{self._entity_name}_{int(self._port) + 1}"
         )
         self.entity_id = self._attr_unique_id
 
+        # Hodinové statistiky (pokud je zapnut import do recorderu)
+        if shared_data.statistics is not None:
+            name = f"Spa {self._label.lower()} energy" + ("" if single else f" {int(self._port) + 1}")
+            shared_data.statistics.add_energy_channel(self._component_type, self._port, self._attr_unique_id, name)
+
     async def async_added_to_hass(self):
-        """Obnovit stav po restartu Home Assistant."""
+        """Obnovit stav po restartu Home Assistant (záloha, pokud chybí checkpoint energie)."""
         await super().async_added_to_hass()
-        
+
         # Obnovit předchozí stav z databáze
         last_state = await self.async_get_last_state()
         if last_state is not None and last_state.state not in ("unknown", "unavailable", None):
             try:
-                # Obnovit uloženou hodnotu energie
+                # Obnovit uloženou hodnotu energie do sdíleného akumulátoru
                 restored_value = float(last_state.state)
-                self._total_energy_kwh = restored_value
-                _LOGGER.info("Restored Pump Energy %s: %s kWh from previous session", 
-                           self._pump_data["port"], round(self._total_energy_kwh, 3))
+                if self._energy.restore_energy_kwh(self._component_type, self._port, restored_value):
+                    _LOGGER.info("Restored %s Energy %s: %s kWh from previous session",
+                                 self._label, self._port, round(restored_value, 3))
             except (ValueError, TypeError):
-                _LOGGER.warning("Could not restore energy value for pump %s: %s", 
-                              self._pump_data["port"], last_state.state)
-        
-        # Obnovit také čas posledního update (pokud je dostupný v atributech)
-        if last_state is not None and last_state.attributes:
-            last_update_str = last_state.attributes.get("last_update_time")
-            if last_update_str:
-                try:
-                    self._last_update_time = datetime.fromisoformat(last_update_str)
-                    self._last_pump_state = last_state.attributes.get("last_pump_state", "OFF")
-                except (ValueError, TypeError):
-                    pass
-
-    async def async_update(self):
-        data = self._shared_data.data
-        current_time = datetime.now()
-        
-        if data:
-            # Najít odpovídající PUMP podle portu
-            pump_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "PUMP" and comp["port"] == self._pump_data["port"]
-                ),
-                None,
-            )
-            
-            current_pump_state = pump_comp["value"] if pump_comp else "OFF"
-            
-            # Pokud máme předchozí update, počítat spotřebu
-            if self._last_update_time is not None:
-                time_delta = current_time - self._last_update_time
-                hours_elapsed = time_delta.total_seconds() / 3600.0
-                
-                # Pokud byla pumpa zapnutá během tohoto období (není OFF), přidat spotřebu
-                if self._last_pump_state is not None and self._last_pump_state != "OFF":
-                    # Přidat spotřebu: výkon (W) * čas (h) / 1000 = kWh
-                    energy_added = (self._pump_power_watts * hours_elapsed) / 1000.0
-                    self._total_energy_kwh += energy_added
-                    _LOGGER.debug("Pump Energy %s: Added %s kWh (power: %s W, time: %s h, total: %s kWh)", 
-                                 self._pump_data["port"], round(energy_added, 6), 
-                                 self._pump_power_watts, round(hours_elapsed, 4), round(self._total_energy_kwh, 3))
-            
-            # Aktualizovat čas a stav
-            self._last_update_time = current_time
-            self._last_pump_state = current_pump_state
-            
-            _LOGGER.debug("Updated Pump Energy %s: %s kWh (state: %s)", 
-                         self._pump_data["port"], round(self._total_energy_kwh, 3), current_pump_state)
-        else:
-            # Pokud nejsou dostupná data, inicializovat čas (ale neresetovat energii)
-            if self._last_update_time is None:
-                self._last_update_time = current_time
-                self._last_pump_state = "OFF"
+                _LOGGER.warning("Could not restore energy value for %s %s: %s",
+                                self._label.lower(), self._port, last_state.state)
+        self._total_energy_kwh = self._energy.energy_kwh(self._component_type, self._port)
+
+    @callback
+    def handle_spa_state(self, state):
+        # Integraci provádí SpaData.energy při každém čtení, senzor jen přebírá akumulátor
+        previous = (round(self._total_energy_kwh, 3), self._energy_attributes)
+        self._total_energy_kwh = self._energy.energy_kwh(self._component_type, self._port)
+        self._energy_attributes = self.extra_state_attributes
+        _LOGGER.debug("Updated %s Energy %s: %s kWh (state: %s)",
+                      self._label, self._port, round(self._total_energy_kwh, 3),
+                      self._energy.state(self._component_type, self._port))
+        # Beze změny zobrazené hodnoty i atributů není co zapisovat
+        if (self.native_value, self._energy_attributes) == previous:
+            return False
 
     @property
     def native_value(self):
@@ -252,261 +98,40 @@ class SpaPumpEnergySensor(SpaSensorBase, RestoreEntity):
 
     @property
     def extra_state_attributes(self):
-        """Vrátí dodatečné atributy pro uložení stavu."""
-        attrs = {}
-        if self._last_update_time is not None:
-            attrs["last_update_time"] = self._last_update_time.isoformat()
-        if self._last_pump_state is not None:
-            attrs["last_pump_state"] = self._last_pump_state
-        return attrs
-
+        """Vrátí dodatečné atributy (aktuální stav a odhadovaný příkon)."""
+        return {
+            "component_state": self._energy.state(self._component_type, self._port),
+            "power_watts": self._energy.power_watts(self._component_type, self._port),
+        }
 
-class SpaBlowerEnergySensor(SpaSensorBase, RestoreEntity):
-    """Senzor pro energii bloweru (kWh) - používá se pro Energy Dashboard."""
-    def __init__(self, shared_data, device_info, unique_id_suffix, blower_data, count_blower, config_options):
-        self._shared_data = shared_data
-        self._blower_data = blower_data
-        self._config_options = config_options
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_should_poll = False  # Data jsou sdílena, posluchač
-        self._total_energy_kwh = 0.0  # Celková spotřeba v kWh
-        self._last_update_time = None
-        self._last_blower_state = None
-        self._attr_device_info = device_info
-        self._attr_icon = "mdi:lightning-bolt-circle"
-        
-        # Určit port pro získání konfiguračního výkonu
-        blower_port = blower_data.get('port')
-        if blower_port is None or count_blower == 1:
-            config_key = "blower_1_power_watts"
-        else:
-            port_num = int(blower_port) + 1
-            config_key = f"blower_{port_num}_power_watts"
-        
-        # Načíst výkon z konfigurace (výchozí 1500 W)
-        self._blower_power_watts = config_options.get(config_key, 900)
-        
-        base_id = (
-            f"sensor.spa_blower_energy"
-            if count_blower == 1 or blower_data['port'] is None
-            else f"sensor.spa_blower_energy_{int(blower_data['port']) + 1}"
-        )
-        self._attr_unique_id = f"{base_id}{unique_id_suffix}"
-        self._attr_translation_key = (
-            "blower_energy"
-            if count_blower == 1 or blower_data['port'] is None
-            else f"blower_energy_{int(blower_data['port']) + 1}"
-        )
-        self.entity_id = self._attr_unique_id
 
-    async def async_added_to_hass(self):
-        """Obnovit stav po restartu Home Assistant."""
-        await super().async_added_to_hass()
-        
-        # Obnovit předchozí stav z databáze
-        last_state = await self.async_get_last_state()
-        if last_state is not None and last_state.state not in ("unknown", "unavailable", None):
-            try:
-                # Obnovit uloženou hodnotu energie
-                restored_value = float(last_state.state)
-                self._total_energy_kwh = restored_value
-                _LOGGER.info("Restored Blower Energy %s: %s kWh from previous session", 
-                           self._blower_data["port"], round(self._total_energy_kwh, 3))
-            except (ValueError, TypeError):
-                _LOGGER.warning("Could not restore energy value for blower %s: %s", 
-                              self._blower_data["port"], last_state.state)
-        
-        # Obnovit také čas posledního update (pokud je dostupný v atributech)
-        if last_state is not None and last_state.attributes:
-            last_update_str = last_state.attributes.get("last_update_time")
-            if last_update_str:
-                try:
-                    self._last_update_time = datetime.fromisoformat(last_update_str)
-                    self._last_blower_state = last_state.attributes.get("last_blower_state", "OFF")
-                except (ValueError, TypeError):
-                    pass
+class SpaHeaterEnergySensor(SpaEnergySensor):
+    """Senzor pro energii heateru (kWh) - používá se pro Energy Dashboard."""
 
-    async def async_update(self):
-        data = self._shared_data.data
-        current_time = datetime.now()
-        
-        if data:
-            # Najít odpovídající BLOWER podle portu
-            blower_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "BLOWER" and comp["port"] == self._blower_data["port"]
-                ),
-                None,
-            )
-            
-            current_blower_state = blower_comp["value"] if blower_comp else "OFF"
-            
-            # Pokud máme předchozí update, počítat spotřebu
-            if self._last_update_time is not None:
-                time_delta = current_time - self._last_update_time
-                hours_elapsed = time_delta.total_seconds() / 3600.0
-                
-                # Pokud byl blower zapnutý během tohoto období (není OFF), přidat spotřebu
-                if self._last_blower_state is not None and self._last_blower_state != "OFF":
-                    # Přidat spotřebu: výkon (W) * čas (h) / 1000 = kWh
-                    energy_added = (self._blower_power_watts * hours_elapsed) / 1000.0
-                    self._total_energy_kwh += energy_added
-                    _LOGGER.debug("Blower Energy %s: Added %s kWh (power: %s W, time: %s h)", 
-                                 self._blower_data["port"], round(energy_added, 6), 
-                                 self._blower_power_watts, round(hours_elapsed, 4))
-            
-            # Aktualizovat čas a stav
-            self._last_update_time = current_time
-            self._last_blower_state = current_blower_state
-            
-            _LOGGER.debug("Updated Blower Energy %s: %s kWh (state: %s)", 
-                         self._blower_data["port"], round(self._total_energy_kwh, 3), current_blower_state)
-        else:
-            # Pokud nejsou dostupná data, inicializovat čas (ale neresetovat energii)
-            if self._last_update_time is None:
-                self._last_update_time = current_time
-                self._last_blower_state = "OFF"
+    _component_type = "HEATER"
+    _entity_name = "heater_energy"
+    _label = "Heater"
 
-    @property
-    def native_value(self):
-        return round(self._total_energy_kwh, 3)
 
-    @property
-    def extra_state_attributes(self):
-        """Vrátí dodatečné atributy pro uložení stavu."""
-        attrs = {}
-        if self._last_update_time is not None:
-            attrs["last_update_time"] = self._last_update_time.isoformat()
-        if self._last_blower_state is not None:
-            attrs["last_blower_state"] = self._last_blower_state
-        return attrs
+class SpaPumpEnergySensor(SpaEnergySensor):
+    """Senzor pro energii pumpy (kWh) - používá se pro Energy Dashboard."""
 
+    _component_type = "PUMP"
+    _entity_name = "pump_energy"
+    _label = "Pump"
 
-class SpaCirculationPumpEnergySensor(SpaSensorBase, RestoreEntity):
-    """Senzor pro energii circulation pumpu (kWh) - používá se pro Energy Dashboard."""
-    def __init__(self, shared_data, device_info, unique_id_suffix, pump_data, count_pump, config_options):
-        self._shared_data = shared_data
-        self._pump_data = pump_data
-        self._config_options = config_options
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_should_poll = False  # Data jsou sdílena, posluchač
-        self._total_energy_kwh = 0.0  # Celková spotřeba v kWh
-        self._last_update_time = None
-        self._last_pump_state = None
-        self._attr_device_info = device_info
-        self._attr_icon = "mdi:lightning-bolt-circle"
-        
-        # Určit port pro získání konfiguračního výkonu
-        pump_port = pump_data.get('port')
-        if pump_port is None or count_pump == 1:
-            config_key = "circulation_pump_1_power_watts"
-        else:
-            port_num = int(pump_port) + 1
-            config_key = f"circulation_pump_{port_num}_power_watts"
-        
-        # Načíst výkon z konfigurace (výchozí 500 W)
-        self._circulation_pump_power_watts = config_options.get(config_key, 400)
-        
-        base_id = (
-            f"sensor.spa_circulation_pump_energy"
-            if count_pump == 1 or pump_data['port'] is None
-            else f"sensor.spa_circulation_pump_energy_{int(pump_data['port']) + 1}"
-        )
-        self._attr_unique_id = f"{base_id}{unique_id_suffix}"
-        self._attr_translation_key = (
-            "circulation_pump_energy"
-            if count_pump == 1 or pump_data['port'] is None
-            else f"circulation_pump_energy_{int(pump_data['port']) + 1}"
-        )
-        self.entity_id = self._attr_unique_id
 
-    async def async_added_to_hass(self):
-        """Obnovit stav po restartu Home Assistant."""
-        await super().async_added_to_hass()
-        
-        # Obnovit předchozí stav z databáze
-        last_state = await self.async_get_last_state()
-        if last_state is not None and last_state.state not in ("unknown", "unavailable", None):
-            try:
-                # Obnovit uloženou hodnotu energie
-                restored_value = float(last_state.state)
-                self._total_energy_kwh = restored_value
-                _LOGGER.info("Restored Circulation Pump Energy %s: %s kWh from previous session", 
-                           self._pump_data["port"], round(self._total_energy_kwh, 3))
-            except (ValueError, TypeError):
-                _LOGGER.warning("Could not restore energy value for circulation pump %s: %s", 
-                              self._pump_data["port"], last_state.state)
-        
-        # Obnovit také čas posledního update (pokud je dostupný v atributech)
-        if last_state is not None and last_state.attributes:
-            last_update_str = last_state.attributes.get("last_update_time")
-            if last_update_str:
-                try:
-                    self._last_update_time = datetime.fromisoformat(last_update_str)
-                    self._last_pump_state = last_state.attributes.get("last_pump_state", "OFF")
-                except (ValueError, TypeError):
-                    pass
+class SpaBlowerEnergySensor(SpaEnergySensor):
+    """Senzor pro energii bloweru (kWh) - používá se pro Energy Dashboard."""
 
-    async def async_update(self):
-        data = self._shared_data.data
-        current_time = datetime.now()
-        
-        if data:
-            # Najít odpovídající CIRCULATION_PUMP podle portu
-            pump_comp = next(
-                (
-                    comp
-                    for comp in data["components"]
-                    if comp["componentType"] == "CIRCULATION_PUMP" and comp["port"] == self._pump_data["port"]
-                ),
-                None,
-            )
-            
-            current_pump_state = pump_comp["value"] if pump_comp else "OFF"
-            
-            # Pokud máme předchozí update, počítat spotřebu
-            if self._last_update_time is not None:
-                time_delta = current_time - self._last_update_time
-                hours_elapsed = time_delta.total_seconds() / 3600.0
-                
-                # Pokud bylo čerpadlo zapnuté během tohoto období (není OFF), přidat spotřebu
-                if self._last_pump_state is not None and self._last_pump_state != "OFF":
-                    # Přidat spotřebu: výkon (W) * čas (h) / 1000 = kWh
-                    energy_added = (self._circulation_pump_power_watts * hours_elapsed) / 1000.0
-                    self._total_energy_kwh += energy_added
-                    _LOGGER.debug("Circulation Pump Energy %s: Added %s kWh (power: %s W, time: %s h, total: %s kWh)", 
-                                 self._pump_data["port"], round(energy_added, 6), 
-                                 self._circulation_pump_power_watts, round(hours_elapsed, 4), round(self._total_energy_kwh, 3))
-            
-            # Aktualizovat čas a stav
-            self._last_update_time = current_time
-            self._last_pump_state = current_pump_state
-            
-            _LOGGER.debug("Updated Circulation Pump Energy %s: %s kWh (state: %s)", 
-                         self._pump_data["port"], round(self._total_energy_kwh, 3), current_pump_state)
-        else:
-            # Pokud nejsou dostupná data, inicializovat čas (ale neresetovat energii)
-            if self._last_update_time is None:
-                self._last_update_time = current_time
-                self._last_pump_state = "OFF"
+    _component_type = "BLOWER"
+    _entity_name = "blower_energy"
+    _label = "Blower"
 
-    @property
-    def native_value(self):
-        return round(self._total_energy_kwh, 3)
 
-    @property
-    def extra_state_attributes(self):
-        """Vrátí dodatečné atributy pro uložení stavu."""
-        attrs = {}
-        if self._last_update_time is not None:
-            attrs["last_update_time"] = self._last_update_time.isoformat()
-        if self._last_pump_state is not None:
-            attrs["last_pump_state"] = self._last_pump_state
-        return attrs
+class SpaCirculationPumpEnergySensor(SpaEnergySensor):
+    """Senzor pro energii circulation pumpu (kWh) - používá se pro Energy Dashboard."""
 
+    _component_type = "CIRCULATION_PUMP"
+    _entity_name = "circulation_pump_energy"
+    _label = "Circulation Pump"
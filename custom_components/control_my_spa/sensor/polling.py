@@ -0,0 +1,61 @@
+"""Diagnostic sensor exposing the adaptive polling decision."""
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import callback
+from .base import SpaSensorBase
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SpaPollIntervalSensor(SpaSensorBase):
+    """Diagnostic sensor showing the interval until the next cloud poll and why it was chosen."""
+
+    # Počty notifikací rostou s každým čtením - recorder je neukládá
+    _unrecorded_attributes = frozenset({"notifications_dispatched", "notifications_skipped"})
+
+    def __init__(self, shared_data, device_info, unique_id_suffix):
+        self._shared_data = shared_data
+        self._spa_dependencies = {"pollDecision", "fromSnapshot"}
+        self._state = None
+        self._attributes = {}
+        self._attr_should_poll = False
+        self._attr_icon = "mdi:timer-sync-outline"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC  # sekce Diagnostika na kartě zařízení
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.SECONDS
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"sensor.spa_poll_interval{unique_id_suffix}"
+        self._attr_translation_key = "poll_interval"
+        self.entity_id = self._attr_unique_id
+
+    @callback
+    def handle_spa_state(self, state):
+        decision = self._shared_data.poll_decision
+        if decision:
+            self._state = decision["interval"]
+            self._attributes = {
+                "reason": decision["reason"],
+                "quiet_polls": decision["quiet_polls"],
+            }
+            bounds = self._shared_data.poll_bounds
+            if bounds:
+                self._attributes["min_interval"], self._attributes["max_interval"] = bounds
+            _LOGGER.debug("Updated poll interval: %s s (%s)", self._state, decision["reason"])
+        # Entity zatím zobrazují stav obnovený ze snapshotu (cloud po startu ještě neodpověděl)
+        self._attributes["from_snapshot"] = self._shared_data.is_from_snapshot
+
+    @property
+    def native_value(self):
+        return self._state
+
+    @property
+    def extra_state_attributes(self):
+        # Počty notifikací SpaData (odeslané / přeskočené díky diffu stavu) v okamžiku zápisu
+        stats = self._shared_data.notification_stats
+        return {
+            **self._attributes,
+            "notifications_dispatched": stats["dispatched"],
+            "notifications_skipped": stats["skipped"],
+        }
@@ -2,6 +2,7 @@
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.const import UnitOfTemperature
+from homeassistant.core import callback
 from .base import SpaSensorBase
 import logging
 
@@ -11,6 +12,7 @@ _LOGGER = logging.getLogger(__name__)
 class SpaTemperatureSensor(SpaSensorBase):
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"currentTemp", "celsius"}
         self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS  # Výchozí hodnota
         self._attr_device_class = SensorDeviceClass.TEMPERATURE
         self._attr_state_class = SensorStateClass.MEASUREMENT
@@ -21,16 +23,20 @@ class SpaTemperatureSensor(SpaSensorBase):
         self._attr_unique_id = f"sensor.spa_current_temperature{unique_id_suffix}"
         self._attr_translation_key = f"current_temperature"
         self.entity_id = self._attr_unique_id
+        # Hodinové statistiky (pokud je zapnut import do recorderu)
+        if shared_data.statistics is not None:
+            shared_data.statistics.add_temperature(self._attr_unique_id, "Spa water temperature")
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             fahrenheit_temp = data.get("currentTemp")
             if fahrenheit_temp is not None and fahrenheit_temp != 0:
                 # Nastavit jednotku podle data.get("celsius")
                 if data.get("celsius"):
                     self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-                    self._state = round((fahrenheit_temp - 32) * 5.0 / 9.0, 1)  # Převod na Celsia
+                    self._state = data.current_temp_c  # Převod na Celsia (spočten při dekódování)
                     _LOGGER.debug("Updated current temperature (Celsius): %s", self._state)
                 else:
                     self._attr_native_unit_of_measurement = UnitOfTemperature.FAHRENHEIT
@@ -45,6 +51,7 @@ class SpaTemperatureSensor(SpaSensorBase):
 class SpaDesiredTemperatureSensor(SpaSensorBase):
     def __init__(self, shared_data, device_info, unique_id_suffix):
         self._shared_data = shared_data
+        self._spa_dependencies = {"desiredTemp", "tempRange", "celsius"}
         self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS  # Výchozí hodnota
         self._attr_device_class = SensorDeviceClass.TEMPERATURE
         self._attr_state_class = SensorStateClass.MEASUREMENT
@@ -58,8 +65,9 @@ class SpaDesiredTemperatureSensor(SpaSensorBase):
         self._attr_translation_key = f"desired_temperature"
         self.entity_id = self._attr_unique_id
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             fahrenheit_temp = data.get("desiredTemp")
             temp_range = data.get("tempRange")
@@ -68,7 +76,7 @@ class SpaDesiredTemperatureSensor(SpaSensorBase):
                 # Nastavit jednotku podle data.get("celsius")
                 if data.get("celsius"):
                     self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-                    celsius_temp = round((fahrenheit_temp - 32) * 5.0 / 9.0, 1)  # Převod na Celsia
+                    celsius_temp = data.desired_temp_c  # Převod na Celsia (spočten při dekódování)
                     self._state = celsius_temp
                     
                     # Uložit hodnotu podle aktuálního rozsahu
@@ -1,6 +1,8 @@
 """Component-related switch entities (light, blower)."""
 
+from homeassistant.core import callback
 from .base import SpaSwitchBase
+from ..helpers import find_component
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -9,6 +11,7 @@ _LOGGER = logging.getLogger(__name__)
 class SpaLightSwitch(SpaSwitchBase):
     def __init__(self, shared_data, device_info, unique_id_suffix, light_data, light_count):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "LIGHT", light_data["port"])}
         self._light_data = light_data
         self._attr_device_info = device_info
         self._attr_icon = "mdi:lightbulb"
@@ -40,14 +43,12 @@ class SpaLightSwitch(SpaSwitchBase):
         """Získá stav světla z dat."""
         if not data:
             return None
-        light = next(
-            (comp for comp in data["components"] if comp["componentType"] == "LIGHT" and comp["port"] == self._light_data["port"]),
-            None
-        )
+        light = find_component(data, "LIGHT", self._light_data["port"])
         return light["value"] if light else None
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             light_state = self._get_light_state(data)
             if light_state is not None:
@@ -56,8 +57,13 @@ class SpaLightSwitch(SpaSwitchBase):
             else:
                 self._attr_is_on = False
 
-    async def _try_set_light_state(self, device_number: int, target_state: str, is_retry: bool = False) -> bool:
-        """Pokus o nastavení stavu světla s možností opakování."""
+    async def _try_set_light_state(self, device_number: int, target_state: str, is_retry: bool = False) -> bool | None:
+        """Pokus o nastavení stavu světla s možností opakování.
+
+        Vrací True při potvrzení, False pokud spa příkaz nepřijala (opakování
+        má smysl) a None, pokud ho přijala, ale stav se nepotvrdil do
+        COMMAND_CONFIRM_TIMEOUT; opakování by pak jen znovu čekalo.
+        """
         self._is_processing = True  # Zneplatnění tlačítka
         self.async_write_ha_state()
 
@@ -86,59 +92,56 @@ class SpaLightSwitch(SpaSwitchBase):
                     new_state,
                     " (2nd attempt)" if is_retry else ""
                 )
-                return False
+                return None
         finally:
             self._is_processing = False  # Obnovení tlačítka
             self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs):
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._light_data["port"])
-
-            # První pokus
-            success = await self._try_set_light_state(device_number, self._on_value)
-
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to turn on light %s", self._light_data["port"])
-                success = await self._try_set_light_state(device_number, self._on_value, True)
-
-            await self._shared_data.async_force_update()
-        except ValueError:
-            _LOGGER.error("Invalid port value for light: %s", self._light_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error turning on light (port %s): %s", self._light_data["port"], str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._light_data["port"])
+
+                # První pokus
+                success = await self._try_set_light_state(device_number, self._on_value)
+
+                # Druhý pokus pokud první selhal
+                if success is False:
+                    _LOGGER.info("Retrying to turn on light %s", self._light_data["port"])
+                    success = await self._try_set_light_state(device_number, self._on_value, True)
+
+                await self._shared_data.async_force_update()
+            except ValueError:
+                _LOGGER.error("Invalid port value for light: %s", self._light_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error turning on light (port %s): %s", self._light_data["port"], str(e))
+                raise
 
     async def async_turn_off(self, **kwargs):
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._light_data["port"])
-
-            # První pokus
-            success = await self._try_set_light_state(device_number, self._off_value)
-
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to turn off light %s", self._light_data["port"])
-                success = await self._try_set_light_state(device_number, self._off_value, True)
-
-            await self._shared_data.async_force_update()
-        except ValueError:
-            _LOGGER.error("Invalid port value for light: %s", self._light_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error turning off light (port %s): %s", self._light_data["port"], str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._light_data["port"])
+
+                # První pokus
+                success = await self._try_set_light_state(device_number, self._off_value)
+
+                # Druhý pokus pokud první selhal
+                if success is False:
+                    _LOGGER.info("Retrying to turn off light %s", self._light_data["port"])
+                    success = await self._try_set_light_state(device_number, self._off_value, True)
+
+                await self._shared_data.async_force_update()
+            except ValueError:
+                _LOGGER.error("Invalid port value for light: %s", self._light_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error turning off light (port %s): %s", self._light_data["port"], str(e))
+                raise
 
 
 class SpaBlowerSwitch(SpaSwitchBase):
     def __init__(self, shared_data, device_info, unique_id_suffix, blower_data, blower_count):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "BLOWER", blower_data["port"])}
         self._blower_data = blower_data
         self._attr_device_info = device_info
         self._attr_icon = "mdi:weather-dust"
@@ -194,21 +197,24 @@ class SpaBlowerSwitch(SpaSwitchBase):
         else:
             return value == self._on_value
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
-            blower = next(
-                (comp for comp in data["components"] if comp["componentType"] == "BLOWER" and comp["port"] == self._blower_data["port"]),
-                None
-            )
+            blower = find_component(data, "BLOWER", self._blower_data["port"])
             _LOGGER.debug("Updated Blower %s: %s", self._blower_data["port"], blower["value"])
             if blower:
                 self._attr_is_on = self._calculate_is_on_state(blower["value"])
             else:
                 self._attr_is_on = False
 
-    async def _try_set_blower_state(self, device_number: int, target_state: str, is_retry: bool = False) -> bool:
-        """Pokus o nastavení stavu vzduchovače s možností opakování."""
+    async def _try_set_blower_state(self, device_number: int, target_state: str, is_retry: bool = False) -> bool | None:
+        """Pokus o nastavení stavu vzduchovače s možností opakování.
+
+        Vrací True při potvrzení, False pokud spa příkaz nepřijala (opakování
+        má smysl) a None, pokud ho přijala, ale stav se nepotvrdil do
+        COMMAND_CONFIRM_TIMEOUT; opakování by pak jen znovu čekalo.
+        """
         self._is_processing = True  # Zneplatnění tlačítka
         self.async_write_ha_state()
 
@@ -217,10 +223,7 @@ class SpaBlowerSwitch(SpaSwitchBase):
             if response_data is None:
                 _LOGGER.warning("Function setBlowerState, parameter %s is not supported", target_state)
                 return False
-            blower = next(
-                (comp for comp in response_data["components"] if comp["componentType"] == "BLOWER" and comp["port"] == self._blower_data["port"]),
-                None
-            )
+            blower = find_component(response_data, "BLOWER", self._blower_data["port"])
             new_state = blower["value"] if blower else None
 
             # Převést stavy na boolean hodnoty
@@ -247,51 +250,47 @@ class SpaBlowerSwitch(SpaSwitchBase):
                     actual_is_on,
                     " (2nd attempt)" if is_retry else ""
                 )
-                return False
+                return None
         finally:
             self._is_processing = False  # Obnovení tlačítka
             self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs):
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._blower_data["port"])
-
-            # První pokus
-            success = await self._try_set_blower_state(device_number, self._on_value)
-
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to turn on blower %s", self._blower_data["port"])
-                success = await self._try_set_blower_state(device_number, self._on_value, True)
-
-            await self._shared_data.async_force_update()
-        except ValueError:
-            _LOGGER.error("Invalid port value for blower: %s", self._blower_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error turning on blower (port %s): %s", self._blower_data["port"], str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._blower_data["port"])
+
+                # První pokus
+                success = await self._try_set_blower_state(device_number, self._on_value)
+
+                # Druhý pokus pokud první selhal
+                if success is False:
+                    _LOGGER.info("Retrying to turn on blower %s", self._blower_data["port"])
+                    success = await self._try_set_blower_state(device_number, self._on_value, True)
+
+                await self._shared_data.async_force_update()
+            except ValueError:
+                _LOGGER.error("Invalid port value for blower: %s", self._blower_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error turning on blower (port %s): %s", self._blower_data["port"], str(e))
+                raise
 
     async def async_turn_off(self, **kwargs):
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._blower_data["port"])
-
-            # První pokus
-            success = await self._try_set_blower_state(device_number, self._off_value)
-
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to turn off blower %s", self._blower_data["port"])
-                success = await self._try_set_blower_state(device_number, self._off_value, True)
-
-            await self._shared_data.async_force_update()
-        except ValueError:
-            _LOGGER.error("Invalid port value for blower: %s", self._blower_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error turning off blower (port %s): %s", self._blower_data["port"], str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._blower_data["port"])
+
+                # První pokus
+                success = await self._try_set_blower_state(device_number, self._off_value)
+
+                # Druhý pokus pokud první selhal
+                if success is False:
+                    _LOGGER.info("Retrying to turn off blower %s", self._blower_data["port"])
+                    success = await self._try_set_blower_state(device_number, self._off_value, True)
+
+                await self._shared_data.async_force_update()
+            except ValueError:
+                _LOGGER.error("Invalid port value for blower: %s", self._blower_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error turning off blower (port %s): %s", self._blower_data["port"], str(e))
+                raise
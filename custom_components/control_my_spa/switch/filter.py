@@ -1,7 +1,9 @@
 """Filter-related switch entities."""
 
 from homeassistant.const import EntityCategory
+from homeassistant.core import callback
 from .base import SpaSwitchBase
+from ..helpers import find_component
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -13,6 +15,7 @@ class SpaFilter2Switch(SpaSwitchBase):
     def __init__(self, shared_data, device_info, unique_id_suffix, client):
         """Inicializace přepínače druhého filtru."""
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "FILTER", "1")}
         self._attr_device_info = device_info
         self._attr_entity_category = EntityCategory.CONFIG  # sekce Nastavení na kartě zařízení
         self._client = client
@@ -35,28 +38,27 @@ class SpaFilter2Switch(SpaSwitchBase):
         if not data:
             return False
         # Najít druhý filtr (port "1")
-        filter_comp = next(
-            (
-                comp
-                for comp in data["components"]
-                if comp["componentType"] == "FILTER" and comp["port"] == "1"
-            ),
-            None,
-        )
+        filter_comp = find_component(data, "FILTER", "1")
         if filter_comp:
             # Pokud je stav "DISABLED", switch je vypnutý, jinak zapnutý
             return filter_comp["value"] != "DISABLED"
         return False
 
-    async def async_update(self):
+    @callback
+    def handle_spa_state(self, state):
         """Aktualizace stavu přepínače."""
-        data = self._shared_data.data
+        data = state
         if data:
             self._attr_is_on = self._get_filter2_state(data)
             _LOGGER.debug("Updated Filter 2: %s", self._attr_is_on)
 
-    async def _try_set_filter2_state(self, state: str, is_retry: bool = False) -> bool:
-        """Pokus o nastavení stavu druhého filtru s možností opakování."""
+    async def _try_set_filter2_state(self, state: str, is_retry: bool = False) -> bool | None:
+        """Pokus o nastavení stavu druhého filtru s možností opakování.
+
+        Vrací True při potvrzení, False pokud spa příkaz nepřijala (opakování
+        má smysl) a None, pokud ho přijala, ale stav se nepotvrdil do
+        COMMAND_CONFIRM_TIMEOUT; opakování by pak jen znovu čekalo.
+        """
         self._is_processing = True  # Zneplatnění tlačítka
         self.async_write_ha_state()
 
@@ -85,45 +87,39 @@ class SpaFilter2Switch(SpaSwitchBase):
                     new_state,
                     " (2nd attempt)" if is_retry else ""
                 )
-                return False
+                return None
         finally:
             self._is_processing = False  # Obnovení tlačítka
             self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs):
         """Zapnutí druhého filtru."""
-        try:
-            self._shared_data.pause_updates()
+        async with self._shared_data.command_lease():
+            try:
+                # První pokus
+                success = await self._try_set_filter2_state("ON")
 
-            # První pokus
-            success = await self._try_set_filter2_state("ON")
+                # Druhý pokus pokud první selhal
+                if success is False:
+                    _LOGGER.info("Retrying to turn on filter 2")
+                    success = await self._try_set_filter2_state("ON", True)
 
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to turn on filter 2")
-                success = await self._try_set_filter2_state("ON", True)
-
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error turning on filter 2: %s", str(e))
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error turning on filter 2: %s", str(e))
 
     async def async_turn_off(self, **kwargs):
         """Vypnutí druhého filtru."""
-        try:
-            self._shared_data.pause_updates()
-
-            # První pokus
-            success = await self._try_set_filter2_state("OFF")
-
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to turn off filter 2")
-                success = await self._try_set_filter2_state("OFF", True)
-
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error turning off filter 2: %s", str(e))
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                # První pokus
+                success = await self._try_set_filter2_state("OFF")
+
+                # Druhý pokus pokud první selhal
+                if success is False:
+                    _LOGGER.info("Retrying to turn off filter 2")
+                    success = await self._try_set_filter2_state("OFF", True)
+
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error turning off filter 2: %s", str(e))
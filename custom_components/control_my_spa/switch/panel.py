@@ -1,5 +1,6 @@
 """Panel lock switch entity."""
 
+from homeassistant.core import callback
 from .base import SpaSwitchBase
 import logging
 
@@ -11,6 +12,7 @@ class SpaPanelLockSwitch(SpaSwitchBase):
 
     def __init__(self, shared_data, device_info, unique_id_suffix, client):
         self._shared_data = shared_data
+        self._spa_dependencies = {"panelLock"}
         self._attr_device_info = device_info
         self._client = client
         self._attr_unique_id = f"switch.spa_panel_lock{unique_id_suffix}"
@@ -40,14 +42,20 @@ class SpaPanelLockSwitch(SpaSwitchBase):
             return False
         return bool(data.get("panelLock", False))
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
             self._attr_is_on = self._get_panel_lock_state(data)
             _LOGGER.debug("Updated Panel Lock: %s", self._attr_is_on)
 
-    async def _try_set_panel_lock_state(self, locked: bool, is_retry: bool = False) -> bool:
-        """Pokus o nastavení zámku panelu s možností opakování."""
+    async def _try_set_panel_lock_state(self, locked: bool, is_retry: bool = False) -> bool | None:
+        """Pokus o nastavení zámku panelu s možností opakování.
+
+        Vrací True při potvrzení, False pokud spa příkaz nepřijala (opakování
+        má smysl) a None, pokud ho přijala, ale stav se nepotvrdil do
+        COMMAND_CONFIRM_TIMEOUT; opakování by pak jen znovu čekalo.
+        """
         self._is_processing = True
         self.async_write_ha_state()
 
@@ -77,35 +85,31 @@ class SpaPanelLockSwitch(SpaSwitchBase):
                 new_state,
                 " (2nd attempt)" if is_retry else "",
             )
-            return False
+            return None
         finally:
             self._is_processing = False
             self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs):
         """Zamkne panel."""
-        try:
-            self._shared_data.pause_updates()
-            success = await self._try_set_panel_lock_state(True)
-            if not success:
-                _LOGGER.info("Retrying to engage panel lock")
-                success = await self._try_set_panel_lock_state(True, True)
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error engaging panel lock: %s", str(e))
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                success = await self._try_set_panel_lock_state(True)
+                if success is False:
+                    _LOGGER.info("Retrying to engage panel lock")
+                    success = await self._try_set_panel_lock_state(True, True)
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error engaging panel lock: %s", str(e))
 
     async def async_turn_off(self, **kwargs):
         """Odemkne panel."""
-        try:
-            self._shared_data.pause_updates()
-            success = await self._try_set_panel_lock_state(False)
-            if not success:
-                _LOGGER.info("Retrying to release panel lock")
-                success = await self._try_set_panel_lock_state(False, True)
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error releasing panel lock: %s", str(e))
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                success = await self._try_set_panel_lock_state(False)
+                if success is False:
+                    _LOGGER.info("Retrying to release panel lock")
+                    success = await self._try_set_panel_lock_state(False, True)
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error releasing panel lock: %s", str(e))
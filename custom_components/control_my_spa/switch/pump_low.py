@@ -1,6 +1,8 @@
 """Low pump switch entity."""
 
+from homeassistant.core import callback
 from .base import SpaSwitchBase
+from ..helpers import find_component
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -9,6 +11,7 @@ _LOGGER = logging.getLogger(__name__)
 class SpaPumpLowSwitch(SpaSwitchBase):
     def __init__(self, shared_data, device_info, pump_data, pump_count, unique_id_suffix=""):
         self._shared_data = shared_data
+        self._spa_dependencies = {("component", "PUMP", pump_data["port"])}
         self._pump_data = pump_data
         self._attr_device_info = device_info
         self._attr_icon = "mdi:weather-windy"
@@ -57,21 +60,24 @@ class SpaPumpLowSwitch(SpaSwitchBase):
         # Pokud je hodnota rovna _on_value (HIGH nebo MED), pak je to ON
         return value == self._on_value
 
-    async def async_update(self):
-        data = self._shared_data.data
+    @callback
+    def handle_spa_state(self, state):
+        data = state
         if data:
-            pump = next(
-                (comp for comp in data["components"] if comp["componentType"] == "PUMP" and comp["port"] == self._pump_data["port"]),
-                None
-            )
+            pump = find_component(data, "PUMP", self._pump_data["port"])
             _LOGGER.debug("Updated Pump Low %s: %s", self._pump_data["port"], pump["value"] if pump else "None")
             if pump:
                 self._attr_is_on = self._calculate_is_on_state(pump["value"])
             else:
                 self._attr_is_on = False
 
-    async def _try_set_pump_state(self, device_number: int, target_state: str, is_retry: bool = False) -> bool:
-        """Pokus o nastavení stavu čerpadla s možností opakování."""
+    async def _try_set_pump_state(self, device_number: int, target_state: str, is_retry: bool = False) -> bool | None:
+        """Pokus o nastavení stavu čerpadla s možností opakování.
+
+        Vrací True při potvrzení, False pokud spa příkaz nepřijala (opakování
+        má smysl) a None, pokud ho přijala, ale stav se nepotvrdil do
+        COMMAND_CONFIRM_TIMEOUT; opakování by pak jen znovu čekalo.
+        """
         self._is_processing = True  # Zneplatnění tlačítka
         self.async_write_ha_state()
 
@@ -81,10 +87,7 @@ class SpaPumpLowSwitch(SpaSwitchBase):
                 _LOGGER.warning("Function setJetState, parameter %s is not supported", target_state)
                 return False
 
-            pump = next(
-                (comp for comp in response_data["components"] if comp["componentType"] == "PUMP" and comp["port"] == self._pump_data["port"]),
-                None
-            )
+            pump = find_component(response_data, "PUMP", self._pump_data["port"])
             new_state = pump["value"] if pump else None
 
             # Převést stavy na boolean hodnoty
@@ -111,49 +114,45 @@ class SpaPumpLowSwitch(SpaSwitchBase):
                     actual_is_on,
                     " (2nd attempt)" if is_retry else ""
                 )
-                return False
+                return None
         finally:
             self._is_processing = False  # Obnovení tlačítka
             self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs):
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._pump_data["port"])
-
-            # První pokus
-            success = await self._try_set_pump_state(device_number, self._on_value)
-
-            # Logování pokud první pokus selhal (bez druhého pokusu)
-            if not success:
-                _LOGGER.info("First attempt to turn on pump Low %s failed", self._pump_data["port"])
-
-            await self._shared_data.async_force_update()
-        except ValueError:
-            _LOGGER.error("Invalid port value for pump Low: %s", self._pump_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error turning on pump Low (port %s): %s", self._pump_data["port"], str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._pump_data["port"])
+
+                # První pokus
+                success = await self._try_set_pump_state(device_number, self._on_value)
+
+                # Logování pokud první pokus selhal (bez druhého pokusu)
+                if success is False:
+                    _LOGGER.info("First attempt to turn on pump Low %s failed", self._pump_data["port"])
+
+                await self._shared_data.async_force_update()
+            except ValueError:
+                _LOGGER.error("Invalid port value for pump Low: %s", self._pump_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error turning on pump Low (port %s): %s", self._pump_data["port"], str(e))
+                raise
 
     async def async_turn_off(self, **kwargs):
-        try:
-            self._shared_data.pause_updates()
-            device_number = int(self._pump_data["port"])
-
-            # První pokus
-            success = await self._try_set_pump_state(device_number, self._off_value)
-
-            # Logování pokud první pokus selhal (bez druhého pokusu)
-            if not success:
-                _LOGGER.info("First attempt to turn off pump Low %s failed", self._pump_data["port"])
-
-            await self._shared_data.async_force_update()
-        except ValueError:
-            _LOGGER.error("Invalid port value for pump Low: %s", self._pump_data["port"])
-        except Exception as e:
-            _LOGGER.error("Error turning off pump Low (port %s): %s", self._pump_data["port"], str(e))
-            raise
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                device_number = int(self._pump_data["port"])
+
+                # První pokus
+                success = await self._try_set_pump_state(device_number, self._off_value)
+
+                # Logování pokud první pokus selhal (bez druhého pokusu)
+                if success is False:
+                    _LOGGER.info("First attempt to turn off pump Low %s failed", self._pump_data["port"])
+
+                await self._shared_data.async_force_update()
+            except ValueError:
+                _LOGGER.error("Invalid port value for pump Low: %s", self._pump_data["port"])
+            except Exception as e:
+                _LOGGER.error("Error turning off pump Low (port %s): %s", self._pump_data["port"], str(e))
+                raise
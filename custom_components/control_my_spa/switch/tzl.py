@@ -1,5 +1,6 @@
 """TZL-related switch entities."""
 
+from homeassistant.core import callback
 from .base import SpaSwitchBase
 import logging
 
@@ -12,6 +13,7 @@ class SpaTzlPowerSwitch(SpaSwitchBase):
     def __init__(self, shared_data, device_info, unique_id_suffix, client):
         """Inicializace TZL přepínače."""
         self._shared_data = shared_data
+        self._spa_dependencies = {"tzlZones"}
         self._attr_device_info = device_info
         self._client = client
         self._attr_unique_id = f"switch.spa_tzl_power{unique_id_suffix}"
@@ -38,15 +40,21 @@ class SpaTzlPowerSwitch(SpaSwitchBase):
         # Přepínač je ON, pokud alespoň jedna zóna není ve stavu OFF
         return any(zone.get("state") != "OFF" for zone in tzl_zones)
 
-    async def async_update(self):
+    @callback
+    def handle_spa_state(self, state):
         """Aktualizace stavu přepínače."""
-        data = self._shared_data.data
+        data = state
         if data:
             self._attr_is_on = self._get_tzl_power_state(data)
             _LOGGER.debug("Updated TZL Power: %s", self._attr_is_on)
 
-    async def _try_set_tzl_power_state(self, power_state: str, is_retry: bool = False) -> bool:
-        """Pokus o nastavení stavu TZL světel s možností opakování."""
+    async def _try_set_tzl_power_state(self, power_state: str, is_retry: bool = False) -> bool | None:
+        """Pokus o nastavení stavu TZL světel s možností opakování.
+
+        Vrací True při potvrzení, False pokud spa příkaz nepřijala (opakování
+        má smysl) a None, pokud ho přijala, ale stav se nepotvrdil do
+        COMMAND_CONFIRM_TIMEOUT; opakování by pak jen znovu čekalo.
+        """
         self._is_processing = True  # Zneplatnění tlačítka
         self.async_write_ha_state()
 
@@ -75,45 +83,39 @@ class SpaTzlPowerSwitch(SpaSwitchBase):
                     new_state,
                     " (2nd attempt)" if is_retry else ""
                 )
-                return False
+                return None
         finally:
             self._is_processing = False  # Obnovení tlačítka
             self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs):
         """Zapnutí TZL světel."""
-        try:
-            self._shared_data.pause_updates()
+        async with self._shared_data.command_lease():
+            try:
+                # První pokus
+                success = await self._try_set_tzl_power_state("ON")
 
-            # První pokus
-            success = await self._try_set_tzl_power_state("ON")
+                # Druhý pokus pokud první selhal
+                if success is False:
+                    _LOGGER.info("Retrying to turn on TZL lights")
+                    success = await self._try_set_tzl_power_state("ON", True)
 
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to turn on TZL lights")
-                success = await self._try_set_tzl_power_state("ON", True)
-
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error turning on TZL lights: %s", str(e))
-        finally:
-            self._shared_data.resume_updates()
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error turning on TZL lights: %s", str(e))
 
     async def async_turn_off(self, **kwargs):
         """Vypnutí TZL světel."""
-        try:
-            self._shared_data.pause_updates()
-
-            # První pokus
-            success = await self._try_set_tzl_power_state("OFF")
-
-            # Druhý pokus pokud první selhal
-            if not success:
-                _LOGGER.info("Retrying to turn off TZL lights")
-                success = await self._try_set_tzl_power_state("OFF", True)
-
-            await self._shared_data.async_force_update()
-        except Exception as e:
-            _LOGGER.error("Error turning off TZL lights: %s", str(e))
-        finally:
-            self._shared_data.resume_updates()
+        async with self._shared_data.command_lease():
+            try:
+                # První pokus
+                success = await self._try_set_tzl_power_state("OFF")
+
+                # Druhý pokus pokud první selhal
+                if success is False:
+                    _LOGGER.info("Retrying to turn off TZL lights")
+                    success = await self._try_set_tzl_power_state("OFF", True)
+
+                await self._shared_data.async_force_update()
+            except Exception as e:
+                _LOGGER.error("Error turning off TZL lights: %s", str(e))
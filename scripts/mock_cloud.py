@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Lokální náhrada ControlMySpa cloudu pro benchmarky a dlouhodobé (soak) testy.
+
+Server implementuje endpointy, které integrace používá (/auth/login,
+/user-management/profile, /spas/owned, /spas/{id}/dashboard a všechny
+/spa-commands/*). Každá spa má vlastní měnitelný stav založený na fixture
+z custom_components/control_my_spa/testData. Příkazy se do stavu promítnou
+až po nastavitelné prodlevě (settle), jako u skutečné vany. Volitelně se
+přidává latence a chyby (HTTP 5xx, zaseknutý dotaz).
+
+Použití:
+    python scripts/mock_cloud.py --port 8080 --settle 1.5 --latency 0.2 --fault-rate 0.05
+
+Integrace (nebo ReadControlMySpaTest.py) se na server přesměruje takto:
+    ControlMySpa.BASE_URL = "http://127.0.0.1:8080"
+
+Ovládání za běhu (mimo latenci a chyby):
+    GET  /_mock/stats   - počty dotazů, injektovaných chyb a aplikovaných příkazů
+    POST /_mock/config  - změna latence, chyb a settle, např. {"fault_rate": 0.5}
+    POST /_mock/reset   - obnovení stavů spa z fixtures a vynulování statistik
+"""
+
+import argparse
+import asyncio
+import base64
+import copy
+import json
+import logging
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+try:
+    from aiohttp import web
+except ImportError:
+    print("Error: aiohttp library is required. Install it with: pip install aiohttp")
+    sys.exit(1)
+
+_LOGGER = logging.getLogger("mock_cloud")
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent.parent / "custom_components" / "control_my_spa" / "testData"
+# componentType z příkazu component-state -> componentType v dashboardu
+COMMAND_COMPONENT_TYPES = {"light": "LIGHT", "jet": "PUMP", "blower": "BLOWER"}
+
+
+def make_token(lifetime):
+    """Nepodepsaný JWT s claimem exp (integrace z něj čte jen životnost)."""
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode({'exp': int(time.time()) + lifetime})}.mock"
+
+
+def load_fixtures(directory, names=None):
+    """Stavy dashboardu z fixtures DataNN.json: {spa_id: data}. spa_id je název fixture."""
+    directory = Path(directory)
+    paths = [directory / f"{name}.json" for name in names] if names else sorted(directory.glob("Data[0-9]*.json"))
+    spas = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            spas[path.stem] = json.load(f)["data"]
+    if not spas:
+        raise ValueError(f"No dashboard fixtures found in {directory}")
+    return spas
+
+
+class MockSpa:
+    """Měnitelný stav jedné spa (formát části data odpovědi dashboardu)."""
+
+    def __init__(self, spa_id, fixture):
+        self.spa_id = spa_id
+        self._fixture = fixture
+        self.state = copy.deepcopy(fixture)
+        self.applied = 0  # Počet příkazů promítnutých do stavu
+
+    def reset(self):
+        self.state = copy.deepcopy(self._fixture)
+        self.applied = 0
+
+    def _component(self, component_type, port):
+        for component in self.state.get("components", []):
+            if component.get("componentType") == component_type and component.get("port") == port:
+                return component
+        raise ValueError(f"Unknown component {component_type} {port}")
+
+    def _zones(self):
+        return self.state.get("tzlState", {}).get("tzlLightStatus", {}).get("tzlZones", [])
+
+    def _zone(self, location):
+        for zone in self._zones():
+            if str(zone.get("zoneId")) == str(location):
+                return zone
+        raise ValueError(f"Unknown TZL zone {location}")
+
+    def validate(self, command, payload):
+        """Ověří příkaz před přijetím (neznámá komponenta/zóna = HTTP 400)."""
+        if command == "component-state":
+            component_type = COMMAND_COMPONENT_TYPES.get(payload["componentType"], payload["componentType"].upper())
+            self._component(component_type, str(payload["deviceNumber"]))
+        elif command == "filter-cycles/schedule":
+            self._component("FILTER", str(payload["deviceNumber"]))
+        elif command.startswith("chromozone/") and command != "chromozone/power":
+            self._zone(payload["location"])
+
+    def apply(self, command, payload):
+        """Promítne příkaz do stavu."""
+        state = self.state
+        if command == "temperature/value":
+            state["desiredTemp"] = f"{float(payload['value']):.2f}"
+        elif command == "temperature/range":
+            state["tempRange"] = payload["range"]
+        elif command == "temperature/heater-mode":
+            state["heaterMode"] = payload["mode"]
+        elif command == "time":
+            state["time"] = payload["time"]
+        elif command == "panel/state":
+            state["isPanelLocked"] = payload["state"] == "LOCK_PANEL"
+        elif command == "component-state":
+            component_type = COMMAND_COMPONENT_TYPES.get(payload["componentType"], payload["componentType"].upper())
+            self._component(component_type, str(payload["deviceNumber"]))["value"] = payload["state"]
+        elif command == "filter-cycles/schedule":
+            component = self._component("FILTER", str(payload["deviceNumber"]))
+            hour, minute = payload["time"].split(":")
+            component["hour"], component["minute"] = int(hour), int(minute)
+            component["durationMinutes"] = int(payload["numOfIntervals"]) * 15
+        elif command == "filter-cycles/toggle-filter2-state":
+            self._component("FILTER", "1")["value"] = "OFF" if payload["state"] == "ON" else "DISABLED"
+        elif command == "chromozone/power":
+            for zone in self._zones():
+                if payload["state"] == "OFF":
+                    zone["state"] = "OFF"
+                elif zone.get("state") == "OFF":
+                    zone["state"] = "NORMAL"
+        elif command == "chromozone/state":
+            self._zone(payload["location"])["state"] = payload["state"]
+        elif command == "chromozone/color":
+            colors = self.state.get("tzlState", {}).get("tzlColorSettings", {}).get("tzlColors", [])
+            color = next((c for c in colors if c.get("colorId") == int(payload["color"]) + 1), None)
+            if color is not None:
+                zone = self._zone(payload["location"])
+                zone["red"], zone["green"], zone["blue"] = color["red"], color["green"], color["blue"]
+        elif command == "chromozone/intensity":
+            self._zone(payload["location"])["intensity"] = payload["intensity"]
+        elif command == "chromozone/speed":
+            self._zone(payload["location"])["speed"] = payload["speed"]
+        elif command == "c8zone/state":
+            c8z = state.setdefault("c8zCurrentState", {})
+            for field, key in (("speedState", "c8zSpeed"), ("heaterState", "c8zHeater"), ("modeState", "c8zMode")):
+                if field in payload:
+                    c8z[key] = payload[field]
+        self.applied += 1
+
+
+# Všechny příkazy, které integrace posílá (cesta za /spa-commands/)
+COMMANDS = (
+    "temperature/value",
+    "temperature/range",
+    "temperature/heater-mode",
+    "time",
+    "panel/state",
+    "component-state",
+    "filter-cycles/schedule",
+    "filter-cycles/toggle-filter2-state",
+    "chromozone/power",
+    "chromozone/state",
+    "chromozone/color",
+    "chromozone/intensity",
+    "chromozone/speed",
+    "c8zone/state",
+)
+
+
+class MockCloud:
+    """aiohttp aplikace s fixtures, prodlevou příkazů a injektováním latence a chyb."""
+
+    def __init__(self, fixtures, settle=1.0, latency=0.0, jitter=0.0, fault_rate=0.0,
+                 fault_status=503, timeout_rate=0.0, hang=30.0, token_lifetime=3600, seed=None):
+        self.spas = {spa_id: MockSpa(spa_id, data) for spa_id, data in fixtures.items()}
+        self.settle = settle  # Prodleva (s), po které se příkaz promítne do stavu
+        self.latency = latency  # Základní latence každé odpovědi (s)
+        self.jitter = jitter  # Náhodná přidaná latence 0..jitter (s)
+        self.fault_rate = fault_rate  # Podíl dotazů odpovězených fault_status
+        self.fault_status = fault_status
+        self.timeout_rate = timeout_rate  # Podíl dotazů, které visí hang sekund (timeout klienta)
+        self.hang = hang
+        self.token_lifetime = token_lifetime
+        self._random = random.Random(seed)
+        self._tokens = set()
+        self._pending = set()  # Naplánované (ještě nepromítnuté) příkazy
+        self.stats = Counter()
+
+    def create_app(self):
+        app = web.Application(middlewares=[self._fault_middleware])
+        app.router.add_post("/auth/login", self._login)
+        app.router.add_get("/user-management/profile", self._profile)
+        app.router.add_get("/spas/owned", self._owned)
+        app.router.add_get("/spas/{spa_id}/dashboard", self._dashboard)
+        for command in COMMANDS:
+            app.router.add_post(f"/spa-commands/{command}", self._command)
+        app.router.add_get("/_mock/stats", self._stats)
+        app.router.add_post("/_mock/config", self._config)
+        app.router.add_post("/_mock/reset", self._reset)
+        app.on_shutdown.append(self._cancel_pending)
+        return app
+
+    @web.middleware
+    async def _fault_middleware(self, request, handler):
+        if request.path.startswith("/_mock/"):
+            return await handler(request)
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        self.stats[f"requests {route}"] += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        roll = self._random.random()
+        if roll < self.timeout_rate:
+            self.stats["faults timeout"] += 1
+            await asyncio.sleep(self.hang)
+        elif roll < self.timeout_rate + self.fault_rate:
+            self.stats[f"faults {self.fault_status}"] += 1
+            return web.json_response({"statusCode": self.fault_status, "message": "Injected fault"},
+                                     status=self.fault_status)
+        return await handler(request)
+
+    def _authorized(self, request):
+        header = request.headers.get("Authorization", "")
+        return header.startswith("Bearer ") and header[7:] in self._tokens
+
+    @staticmethod
+    def _unauthorized():
+        return web.json_response({"statusCode": 401, "message": "Unauthorized"}, status=401)
+
+    async def _login(self, request):
+        payload = await request.json()
+        if not payload.get("email") or not payload.get("password"):
+            return web.json_response({"statusCode": 400, "message": "Missing credentials"}, status=400)
+        token = make_token(self.token_lifetime)
+        self._tokens.add(token)
+        return web.json_response({"statusCode": 200, "data": {"accessToken": token}})
+
+    async def _profile(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        return web.json_response({"statusCode": 200, "data": {"user": {"_id": "mock-user", "email": "mock@example.com"}}})
+
+    async def _owned(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        spas = [
+            {"_id": spa.spa_id, "serialNumber": spa.state.get("serialNumber"), "alias": None,
+             "isDefault": index == 0, "businessLogoUrl": None}
+            for index, spa in enumerate(self.spas.values())
+        ]
+        return web.json_response({"statusCode": 200, "data": {"spas": spas}})
+
+    async def _dashboard(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        spa = self.spas.get(request.match_info["spa_id"])
+        if spa is None:
+            return web.json_response({"statusCode": 404, "message": "Spa not found"}, status=404)
+        return web.json_response({"statusCode": 200, "data": spa.state})
+
+    async def _command(self, request):
+        if not self._authorized(request):
+            return self._unauthorized()
+        command = request.path[len("/spa-commands/"):]
+        payload = await request.json()
+        spa = self.spas.get(payload.get("spaId"))
+        if spa is None:
+            return web.json_response({"statusCode": 404, "message": "Spa not found"}, status=404)
+        try:
+            spa.validate(command, payload)
+        except (KeyError, ValueError) as e:
+            return web.json_response({"statusCode": 400, "message": str(e)}, status=400)
+        self.stats[f"commands {command}"] += 1
+        # Vana příkaz provede až po prodlevě, dashboard do té doby vrací starý stav
+        task = asyncio.ensure_future(self._apply_later(spa, command, payload))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return web.json_response({"statusCode": 200, "message": "Command accepted"})
+
+    async def _apply_later(self, spa, command, payload):
+        await asyncio.sleep(self.settle)
+        try:
+            spa.apply(command, payload)
+            self.stats["commands applied"] += 1
+        except (KeyError, ValueError) as e:
+            _LOGGER.warning("Command %s for %s not applied: %s", command, spa.spa_id, e)
+
+    def _cancel_tasks(self):
+        for task in list(self._pending):
+            task.cancel()
+
+    async def _cancel_pending(self, app):
+        self._cancel_tasks()
+
+    async def _stats(self, request):
+        return web.json_response({
+            "counters": dict(self.stats),
+            "applied": {spa_id: spa.applied for spa_id, spa in self.spas.items()},
+            "config": self.config(),
+        })
+
+    def config(self):
+        return {
+            "settle": self.settle,
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "fault_rate": self.fault_rate,
+            "fault_status": self.fault_status,
+            "timeout_rate": self.timeout_rate,
+            "hang": self.hang,
+        }
+
+    async def _config(self, request):
+        changes = await request.json()
+        for key, value in changes.items():
+            if key not in self.config():
+                return web.json_response({"message": f"Unknown option {key}"}, status=400)
+            setattr(self, key, type(getattr(self, key))(value))
+        return web.json_response(self.config())
+
+    async def _reset(self, request):
+        self._cancel_tasks()
+        for spa in self.spas.values():
+            spa.reset()
+        self.stats.clear()
+        return web.json_response({"message": "Reset"})
+
+
+async def start_mock_cloud(cloud, host="127.0.0.1", port=0):
+    """Spustí server v běžící smyčce; vrací (runner, base_url). Ukončení: await runner.cleanup()."""
+    runner = web.AppRunner(cloud.create_app())
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock ControlMySpa cloud server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--fixtures", default=str(DEFAULT_FIXTURES), help="Directory with DataNN.json fixtures")
+    parser.add_argument("--spa", action="append", help="Fixture name to serve as a spa (repeatable, default all DataNN)")
+    parser.add_argument("--settle", type=float, default=1.0, help="Seconds before a command changes the state")
+    parser.add_argument("--latency", type=float, default=0.0, help="Base response latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency 0..jitter (s)")
+    parser.add_argument("--fault-rate", type=float, default=0.0, help="Share of requests answered with --fault-status")
+    parser.add_argument("--fault-status", type=int, default=503)
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Share of requests that hang for --hang seconds")
+    parser.add_argument("--hang", type=float, default=30.0)
+    parser.add_argument("--token-lifetime", type=int, default=3600, help="Access token lifetime (s)")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible faults")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    cloud = MockCloud(
+        load_fixtures(args.fixtures, args.spa),
+        settle=args.settle,
+        latency=args.latency,
+        jitter=args.jitter,
+        fault_rate=args.fault_rate,
+        fault_status=args.fault_status,
+        timeout_rate=args.timeout_rate,
+        hang=args.hang,
+        token_lifetime=args.token_lifetime,
+        seed=args.seed,
+    )
+    print(f"Serving spas {', '.join(cloud.spas)} on http://{args.host}:{args.port}")
+    web.run_app(cloud.create_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
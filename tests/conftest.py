@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Testy importují integraci jako balíček custom_components.control_my_spa
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
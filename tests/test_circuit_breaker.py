@@ -0,0 +1,190 @@
+"""Circuit breaker cloudu: přechody stavů a chování GET dotazů klienta."""
+
+import asyncio
+import time
+from pathlib import Path
+
+from custom_components.control_my_spa.ControlMySpa import ControlMySpa
+from custom_components.control_my_spa.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+)
+
+
+DASHBOARD = (
+    Path(__file__).parent.parent / "custom_components" / "control_my_spa" / "testData" / "Data02.json"
+).read_bytes()
+
+
+class FakeClock:
+    """Virtuální čas pro breaker (volání) i klienta (monotonic, sleep)."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status, body=DASHBOARD):
+        self.status = status
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self._body
+
+
+class FakeSession:
+    """Odpovídá postupně podle responses: HTTP status, nebo výjimka."""
+
+    closed = False
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return FakeResponse(response)
+
+
+def _breaker(clock):
+    # jitter 1.0 = plná prodleva (30 s, 60 s, ...)
+    return CircuitBreaker("dashboard", clock=clock, jitter=lambda: 1.0)
+
+
+def _client(clock, responses, logged_in=True):
+    client = ControlMySpa("user@example.com", "secret")
+    client.spaId = "spa"
+    client.clock = clock
+    client.account.breakers = CircuitBreakerRegistry(clock=clock, jitter=lambda: 1.0)
+    client.account.session = FakeSession(responses)
+    if logged_in:
+        client.tokenData = {"access_token": "token", "timestamp": int(time.time() * 1000), "expires_in": 3600}
+    return client
+
+
+def test_opens_after_threshold_and_closes_after_probe():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 30.0
+
+    clock.now = 30.0
+    assert breaker.allow()  # Jediný zkušební dotaz
+    assert breaker.state == STATE_HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_status(200)
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_with_longer_backoff():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 30.0
+    assert breaker.allow()
+    breaker.record_status(503)
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.retry_in() == 60.0
+
+
+def test_unfinished_probe_is_replaced_after_timeout():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 30.0
+    assert breaker.allow()
+    clock.now = 89.0
+    assert not breaker.allow()
+    clock.now = 91.0
+    assert breaker.allow()
+
+
+def test_client_errors_are_not_failures():
+    breaker = _breaker(FakeClock())
+    for _ in range(5):
+        breaker.record_status(404)
+    assert breaker.state == STATE_CLOSED
+
+
+def test_fetch_without_token_keeps_the_probe():
+    clock = FakeClock()
+    client = _client(clock, [], logged_in=False)
+    breaker = client.account.breakers.get("dashboard")
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 30.0
+
+    async def login():
+        return False
+
+    client.login = login
+    assert asyncio.run(client._fetchSpa()) is None
+
+    # Zkušební dotaz se nespotřeboval - příkazy ani další čtení nejsou blokované
+    assert client.account.session.requests == 0
+    assert breaker.state == STATE_OPEN
+    assert not breaker.is_open()
+
+
+def test_get_retries_transient_failure():
+    clock = FakeClock()
+    client = _client(clock, [503, 200])
+
+    state = asyncio.run(client._fetchSpa())
+
+    assert state is not None
+    assert client.account.session.requests == 2
+    assert len(clock.sleeps) == 1 and 0.25 <= clock.sleeps[0] <= 0.5
+    assert client.account.breakers.get("dashboard").state == STATE_CLOSED
+    assert client.metrics.find("dashboard").requests == 2
+
+
+def test_get_retries_are_bounded():
+    clock = FakeClock()
+    client = _client(clock, [503, 503, 503, 200])
+
+    assert asyncio.run(client._fetchSpa()) is None
+    assert client.account.session.requests == client.GET_RETRIES + 1
+    # Breaker započítá jen výsledek celého volání
+    assert client.account.breakers.get("dashboard").as_dict()["failures"] == 1
+
+
+def test_get_timeout_is_not_retried():
+    clock = FakeClock()
+    client = _client(clock, [asyncio.TimeoutError(), 200])
+
+    assert asyncio.run(client._fetchSpa()) is None
+    assert client.account.session.requests == 1
+    assert client.metrics.find("dashboard").timeouts == 1
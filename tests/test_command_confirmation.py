@@ -0,0 +1,150 @@
+"""Potvrzování příkazů: predikáty očekávaného stavu a čekání v _waitForState."""
+
+import asyncio
+
+from custom_components.control_my_spa.ControlMySpa import ControlMySpa
+
+
+class FakeClock:
+    """Virtuální čas: sleep jen posune monotonic."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+
+
+def _client(states):
+    """Klient bez sítě: příkazy projdou, getSpa vrací postupně states (poslední se opakuje)."""
+    client = ControlMySpa("user@example.com", "secret")
+    client.spaId = "spa"
+    client.clock = FakeClock()
+    client.reads = 0
+
+    async def post_command(endpoint, payload):
+        return True
+
+    async def get_spa(max_age=None):
+        state = states[min(client.reads, len(states) - 1)]
+        client.reads += 1
+        return state
+
+    client._postCommand = post_command
+    client.getSpa = get_spa
+    return client
+
+
+def _zone_state(**zone):
+    return {
+        "tzlZones": [{"zoneId": "1", "state": "NORMAL", **zone}],
+        "tzlColors": [
+            {"colorId": 1, "red": 255, "green": 255, "blue": 255},
+            {"colorId": 2, "red": 255, "green": 0, "blue": 0},
+        ],
+    }
+
+
+def test_color_confirmed_by_rgb():
+    client = _client([])
+    _, _, expected = client.chromazoneColorCommand(1, 1)
+    assert expected(_zone_state(red=255, green=0, blue=0))
+    assert not expected(_zone_state(red=0, green=255, blue=0))
+
+
+def test_color_confirmed_by_color_id():
+    client = _client([])
+    _, _, expected = client.chromazoneColorCommand(1, 1)
+    # RGB neodpovídá paletě (např. upravená barva), zóna ale hlásí zvolenou barvu
+    assert expected(_zone_state(colorId=2, red=250, green=10, blue=0))
+    assert not expected(_zone_state(colorId=3, red=0, green=0, blue=255))
+
+
+def test_c8z_confirmed_by_normalised_value():
+    client = _client([])
+    _, _, expected = client.c8zSpeedStateCommand("C8Z_SPEED_SMART")
+    assert expected({"c8zCurrentState": {"c8zSpeed": "C8Z_SPEED_SMART"}})
+    assert expected({"c8zCurrentState": {"c8zSpeed": "smart"}})
+    assert not expected({"c8zCurrentState": {"c8zSpeed": "C8Z_SPEED_ECO"}})
+    assert not expected({})
+
+
+def test_field_confirmed_by_normalised_value():
+    client = _client([])
+    _, _, expected = client.chromazoneBrightnessCommand(4, 1)
+    assert expected(_zone_state(intensity="4"))
+    assert not expected(_zone_state(intensity=5))
+
+
+def test_unconfirmed_command_gives_up_after_timeout():
+    stale = {"c8zCurrentState": {"c8zMode": "C8Z_MODE_HEAT"}}
+    client = _client([stale])
+
+    result = asyncio.run(client.setC8zModeState("C8Z_MODE_COOL"))
+
+    # Vrací poslední přečtený stav, čte jen do COMMAND_CONFIRM_TIMEOUT a příkaz dál nesleduje
+    assert result is stale
+    assert client.clock.now == client.COMMAND_CONFIRM_TIMEOUT
+    assert client.reads == 7  # 0.5 + 1 + 2 + 2 + 2 + 2 + zbytek 0.5 s
+    assert not client.hasPendingCommands()
+
+
+def test_unconfirmed_command_without_dashboard():
+    client = _client([None])
+
+    result = asyncio.run(client.setChromazoneColor(1, 1))
+
+    assert result is None
+    assert client.clock.now == client.COMMAND_CONFIRM_TIMEOUT
+
+
+def test_command_pending_while_confirming():
+    stale = {"panelLock": False}
+    client = _client([stale])
+    seen = []
+    get_spa = client.getSpa
+
+    async def recording_get_spa(max_age=None):
+        seen.append(client.hasPendingCommands())
+        return await get_spa(max_age)
+
+    client.getSpa = recording_get_spa
+    asyncio.run(client.setPanelLock(True))
+
+    assert seen and all(seen)
+    assert not client.hasPendingCommands()
+
+
+def test_command_confirmed_by_later_read():
+    before = _zone_state(state="OFF")
+    after = _zone_state(state="PARTY")
+    client = _client([before, before, after])
+
+    result = asyncio.run(client.setChromazoneFunction("PARTY", 1))
+
+    assert result is after
+    assert client.reads == 3
+    assert client.clock.now < client.COMMAND_CONFIRM_TIMEOUT
+
+
+def test_time_confirmed_when_minute_rolls_over():
+    # Hodiny spa během potvrzování přeskočí na další minutu, i přes půlnoc
+    client = _client([{"time": "23:59"}, {"time": "00:00"}])
+
+    result = asyncio.run(client.setTime("2026-10-17", "23:59"))
+    assert result == {"time": "23:59"}
+
+    client = _client([{"time": "00:00"}])
+    assert asyncio.run(client.setTime("2026-10-17", "23:59")) == {"time": "00:00"}
+    assert client.reads == 1
+
+
+def test_time_not_confirmed_outside_tolerance():
+    client = _client([{"time": "14:28"}])
+
+    asyncio.run(client.setTime("2026-10-17", "14:30"))
+
+    assert client.clock.now == client.COMMAND_CONFIRM_TIMEOUT
@@ -0,0 +1,51 @@
+"""Integrace energie: výpadek čtení a kanály registrované po prvním čtení."""
+
+import pytest
+
+from custom_components.control_my_spa.energy_integrator import ACTIVE_STATE, SpaEnergyIntegrator
+
+HEATER = ("HEATER", None)
+TABLE = {"OFF": 0, ACTIVE_STATE: 3600}  # 3.6 kW = 1 Wh za sekundu
+
+
+def _state(value):
+    return {"componentIndex": {HEATER: {"value": value}}}
+
+
+def test_outage_is_not_integrated():
+    energy = SpaEnergyIntegrator()
+    energy.add_channel(*HEATER, TABLE)
+    energy.observe(_state("ON"), now=0)
+    energy.observe(_state("ON"), now=60)
+
+    # Čtení v 120 s selže, cloud odpoví až po hodině
+    assert energy.reset_clock(now=120)
+    energy.observe(_state("ON"), now=3720)
+    energy.observe(_state("ON"), now=3780)
+
+    # 0-120 s a 3720-3780 s, doba výpadku se nepočítá
+    assert energy.energy_kwh(*HEATER) == pytest.approx(0.18)
+
+
+def test_reset_clock_without_observation():
+    energy = SpaEnergyIntegrator()
+    energy.add_channel(*HEATER, TABLE)
+
+    assert not energy.reset_clock(now=100)
+    energy.observe(_state("ON"), now=200)
+    energy.observe(_state("ON"), now=260)
+
+    # Počítá se až od prvního pozorování
+    assert energy.energy_kwh(*HEATER) == pytest.approx(0.06)
+
+
+def test_channel_added_after_first_observation():
+    energy = SpaEnergyIntegrator()
+    energy.observe(_state("ON"), now=0)
+    # Senzor se zaregistruje až po prvním čtení
+    energy.add_channel(*HEATER, TABLE)
+    energy.observe(_state("OFF"), now=60)
+
+    # Přechod v polovině prvního intervalu
+    assert energy.energy_kwh(*HEATER) == pytest.approx(0.03)
+    assert energy.state(*HEATER) == "OFF"
@@ -0,0 +1,112 @@
+"""Čtení stavu: souběžná volání getSpa sdílí jeden dotaz a čerstvý výsledek se cachuje."""
+
+import asyncio
+
+from custom_components.control_my_spa.ControlMySpa import ControlMySpa
+
+
+class FakeClock:
+    """Virtuální čas pro stáří cache."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+def _client():
+    """Klient bez sítě: _fetchSpa počítá dotazy a odpovídá až po uvolnění gate."""
+    client = ControlMySpa("user@example.com", "secret")
+    client.spaId = "spa"
+    client.clock = FakeClock()
+    client.fetches = 0
+    client.gate = None
+
+    async def fetch_spa():
+        client.fetches += 1
+        result = {"fetch": client.fetches}
+        if client.gate is not None:
+            await client.gate.wait()
+        return result
+
+    client._fetchSpa = fetch_spa
+    return client
+
+
+def test_concurrent_calls_share_one_fetch():
+    client = _client()
+
+    async def run():
+        client.gate = asyncio.Event()
+        calls = [asyncio.ensure_future(client.getSpa()) for _ in range(5)]
+        await asyncio.sleep(0)
+        client.gate.set()
+        return await asyncio.gather(*calls)
+
+    results = asyncio.run(run())
+
+    assert client.fetches == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_fresh_result_served_from_cache():
+    client = _client()
+
+    async def run():
+        first = await client.getSpa()
+        client.clock.now += client.SPA_FRESHNESS_SECONDS - 0.1
+        cached = await client.getSpa()
+        client.clock.now += 0.1
+        refreshed = await client.getSpa()
+        return first, cached, refreshed
+
+    first, cached, refreshed = asyncio.run(run())
+
+    assert cached is first
+    assert refreshed == {"fetch": 2}
+    assert client.fetches == 2
+
+
+def test_max_age_zero_bypasses_cache():
+    # I ve stejném tiku hodin (hrubé rozlišení monotonic) se čte znovu
+    client = _client()
+
+    async def run():
+        await client.getSpa()
+        return await client.getSpa(max_age=0)
+
+    assert asyncio.run(run()) == {"fetch": 2}
+
+
+def test_invalidate_forces_new_fetch():
+    client = _client()
+
+    async def run():
+        await client.getSpa()
+        client.invalidateSpaCache()
+        return await client.getSpa()
+
+    assert asyncio.run(run()) == {"fetch": 2}
+
+
+def test_invalidate_during_fetch_starts_new_one():
+    # Dotaz rozběhnutý před příkazem nesmí posloužit čtení po příkazu
+    client = _client()
+
+    async def run():
+        client.gate = asyncio.Event()
+        before = asyncio.ensure_future(client.getSpa())
+        await asyncio.sleep(0)
+        client.invalidateSpaCache()
+        after = asyncio.ensure_future(client.getSpa())
+        await asyncio.sleep(0)
+        client.gate.set()
+        return await before, await after
+
+    before, after = asyncio.run(run())
+
+    assert before == {"fetch": 1}
+    assert after == {"fetch": 2}
+    # Výsledek starší generace se do cache neuloží
+    assert client._spa_cache[2] is after
@@ -0,0 +1,28 @@
+"""Nejbližší barva palety TZL."""
+
+from custom_components.control_my_spa.palette import TzlPalette
+
+
+def _palette(*colors):
+    return TzlPalette([
+        {"colorId": index + 1, "red": red, "green": green, "blue": blue}
+        for index, (red, green, blue) in enumerate(colors)
+    ])
+
+
+def test_nearest_uses_requested_rgb():
+    palette = _palette((0, 0, 0), (16, 0, 0))
+    # (9, 0, 0) leží ve stejné 16úrovňové buňce jako (7, 0, 0), ale blíž je druhá barva
+    assert palette.nearest_color_id((9, 0, 0)) == 2
+    assert palette.nearest_color_id((7, 0, 0)) == 1
+    assert palette.nearest_color_id((9, 0, 0)) == 2  # z cache
+
+
+def test_nearest_tie_prefers_earlier_color():
+    palette = _palette((0, 0, 0), (16, 0, 0))
+    assert palette.nearest_color_id((8, 0, 0)) == 1
+
+
+def test_exact_and_empty_palette():
+    assert _palette((255, 0, 0)).nearest_color_id((255, 0, 0)) == 1
+    assert _palette().nearest_color_id((1, 2, 3)) is None
@@ -0,0 +1,111 @@
+"""Token účtu: životnost z JWT, obnova na pozadí před vypršením a sdílené přihlášení."""
+
+import asyncio
+import base64
+import json
+import time
+
+from custom_components.control_my_spa.ControlMySpa import (
+    DEFAULT_TOKEN_LIFETIME,
+    ControlMySpa,
+    SpaAccount,
+    _token_lifetime,
+)
+
+
+def _jwt(claims):
+    def part(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    return f"{part({'alg': 'HS256'})}.{part(claims)}.signature"
+
+
+def _token(valid_seconds):
+    return {
+        "access_token": "token",
+        "timestamp": int(time.time() * 1000),
+        "expires_in": valid_seconds,
+    }
+
+
+def _clients(account, count=1):
+    """Klienti sdíleného účtu bez sítě: _login počítá přihlášení a čeká na gate."""
+    account.logins = 0
+    account.gate = asyncio.Event()
+
+    async def login():
+        account.logins += 1
+        await account.gate.wait()
+        account.tokenData = _token(3600)
+        return True
+
+    clients = []
+    for _ in range(count):
+        client = ControlMySpa("user@example.com", "secret", account)
+        client._login = login
+        clients.append(client)
+    return clients
+
+
+def test_lifetime_from_jwt_exp():
+    token = _jwt({"exp": int(time.time()) + 1800})
+    assert 1790 <= _token_lifetime(token) <= 1800
+
+
+def test_lifetime_of_expired_jwt_is_zero():
+    assert _token_lifetime(_jwt({"exp": int(time.time()) - 60})) == 0
+
+
+def test_lifetime_fallback_without_exp():
+    assert _token_lifetime("not-a-jwt") == DEFAULT_TOKEN_LIFETIME
+    assert _token_lifetime(_jwt({"sub": "user"})) == DEFAULT_TOKEN_LIFETIME
+
+
+def test_valid_token_is_used_without_login():
+    account = SpaAccount("user@example.com", "secret")
+    account.restore(_token(3600), None)
+
+    async def run():
+        (client,) = _clients(account)
+        return await client.ensureToken()
+
+    assert asyncio.run(run())
+    assert account.logins == 0
+    assert account.refresh_task is None
+
+
+def test_token_near_expiry_refreshed_in_background():
+    account = SpaAccount("user@example.com", "secret")
+    account.restore(_token(60), None)
+
+    async def run():
+        (client,) = _clients(account)
+        # Token ještě platí - volání nečeká na přihlášení
+        assert await client.ensureToken()
+        refresh = account.refresh_task
+        assert refresh is not None and not refresh.done()
+        # Další volání během obnovy nespustí druhé přihlášení
+        assert await client.ensureToken()
+        assert account.refresh_task is refresh
+        account.gate.set()
+        await account.refresh_task
+
+    asyncio.run(run())
+
+    assert account.logins == 1
+    assert account.token_valid_seconds() > 3000
+
+
+def test_expired_token_shared_login():
+    account = SpaAccount("user@example.com", "secret")
+    account.restore(_token(0), None)
+
+    async def run():
+        clients = _clients(account, count=3)
+        calls = [asyncio.ensure_future(client.ensureToken()) for client in clients]
+        await asyncio.sleep(0)
+        account.gate.set()
+        return await asyncio.gather(*calls)
+
+    assert asyncio.run(run()) == [True, True, True]
+    assert account.logins == 1